@@ -0,0 +1,152 @@
+"""
+    Longboard drag benchmark.
+
+    Makes a synthetic designspace (or uses an existing one), opens a
+    LongboardEditorView on the stand-ins and drags through the designspace.
+    Every frame goes through updateInstanceOutline, like a drag in RoboFont.
+    Reports the milliseconds per frame for each stage of the update.
+
+        python benchDrag.py --axes 3 --sources 12 --contours 20 --segments 40 --frames 200
+        python benchDrag.py --designspace my.designspace --glyph a --measurements 2 --vectors
+        python benchDrag.py --json results.json
+
+    Runs on plain Linux, no RoboFont needed.
+    Layer updates are counted on the merz stand-in, so the "layers"
+    stage measures the Longboard side of the drawing, not CoreAnimation.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+
+import harness
+harness.installStandins()
+
+import merz
+from syntheticDesignspace import makeDesignspace, addDesignspaceArguments, glyphName, compositeName
+from longboardTiming import FrameTimer, percentile
+
+
+def makeDragLocations(operator, startLocation, frames):
+    # a lissajous path through the continuous axes,
+    # the discrete axes stay where they are.
+    locations = []
+    axes = operator.getOrderedContinuousAxes()
+    for frame in range(frames):
+        t = frame / max(1, frames - 1)
+        location = dict(startLocation)
+        for axisIndex, axis in enumerate(axes):
+            minimum = axis.map_forward(axis.minimum)
+            maximum = axis.map_forward(axis.maximum)
+            factor = 0.5 + 0.5 * math.sin(2 * math.pi * (axisIndex + 1) * t + axisIndex)
+            location[axis.name] = minimum + factor * (maximum - minimum)
+        locations.append(location)
+    return locations
+
+
+def runDrag(editor, locations, warmup=0):
+    # drag through the locations, return the timing of each frame
+    frames = []
+    harness.mouseDown(editor)
+    startLocation = dict(editor.previewLocation_dragging)
+    for frameIndex, location in enumerate(locations):
+        editor.previewLocation_dragging = dict(startLocation, **location)
+        layerCallsBefore = merz.layerCalls
+        editor.updateInstanceOutline(rebuild=False)
+        frame = dict(editor.frameTimer.lastFrame)
+        frame["layerCalls"] = merz.layerCalls - layerCallsBefore
+        if frameIndex >= warmup:
+            frames.append(frame)
+    harness.mouseUp(editor)
+    return frames
+
+
+def summarize(frames):
+    summary = {}
+    for stageName in FrameTimer.stageNames + ("frame",):
+        values = sorted(frame.get(stageName, 0) * 1000 for frame in frames)
+        summary[stageName] = dict(
+            mean=sum(values) / len(values) if values else 0,
+            p50=percentile(values, 0.5),
+            p95=percentile(values, 0.95),
+            max=max(values) if values else 0,
+            )
+    layerCalls = [frame["layerCalls"] for frame in frames]
+    summary["layerCalls"] = dict(mean=sum(layerCalls) / len(layerCalls) if layerCalls else 0, max=max(layerCalls) if layerCalls else 0)
+    return summary
+
+
+def printSummary(summary, title):
+    print(title)
+    print(f"{'stage':<16}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}   ms")
+    for stageName, values in summary.items():
+        if stageName == "layerCalls":
+            continue
+        print(f"{stageName:<16}{values['mean']:>10.3f}{values['p50']:>10.3f}{values['p95']:>10.3f}{values['max']:>10.3f}")
+    print(f"layer calls per frame: {summary['layerCalls']['mean']:.1f} (max {summary['layerCalls']['max']})")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Time the Longboard preview update while dragging.")
+    parser.add_argument("--designspace", help="use this designspace instead of a synthetic one")
+    parser.add_argument("--glyph", help="the glyph to drag")
+    parser.add_argument("--source", type=int, default=0, help="index of the source the editor glyph comes from")
+    parser.add_argument("--composite", action="store_true", help="drag the synthetic composite glyph")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5, help="frames that are not counted")
+    parser.add_argument("--varlib", action="store_true", help="use the varLib model")
+    parser.add_argument("--vectors", action="store_true", help="Show Vectors")
+    parser.add_argument("--show-sources", action="store_true", help="Show Sources")
+    parser.add_argument("--no-stats", action="store_true")
+    parser.add_argument("--no-kinks", action="store_true")
+    parser.add_argument("--rounded", action="store_true")
+    parser.add_argument("--measurements", type=int, default=0, help="number of measurement beams")
+    parser.add_argument("--select", type=int, default=0, help="number of selected points")
+    parser.add_argument("--json", help="write the results to this file")
+    addDesignspaceArguments(parser)
+    args = parser.parse_args(args)
+
+    if args.designspace:
+        designspacePath = args.designspace
+        benchGlyphName = args.glyph
+    else:
+        folder = tempfile.mkdtemp(prefix="longboardBench_")
+        designspacePath = makeDesignspace(folder, args.axes, args.sources, args.contours, args.segments, args.discrete, args.instances, args.seed)
+        benchGlyphName = compositeName if args.composite else glyphName
+    if benchGlyphName is None:
+        parser.error("--glyph is needed with --designspace")
+
+    operator = harness.openDesignspace(designspacePath)
+    editor = harness.openGlyphEditor(
+        operator, benchGlyphName, sourceIndex=args.source,
+        wantsVarLib=args.varlib,
+        showVectors=args.vectors,
+        showSources=args.show_sources,
+        showStats=not args.no_stats,
+        showKinks=not args.no_kinks,
+        showRounded=args.rounded,
+        showMeasurements=args.measurements > 0,
+        )
+    editorGlyph = editor.getGlyphEditor().getGlyph()
+    if args.measurements:
+        harness.addMeasurements(editorGlyph, args.measurements)
+    if args.select:
+        harness.selectPoints(editorGlyph, args.select)
+
+    locations = makeDragLocations(operator, operator.getPreviewLocation(), args.frames + args.warmup)
+    frames = runDrag(editor, locations, warmup=args.warmup)
+    summary = summarize(frames)
+    pointCount = sum(len(contour.points) for contour in editorGlyph.contours)
+    title = f"{os.path.basename(designspacePath)} {benchGlyphName}: {len(operator.sources)} sources, {pointCount} points, {len(frames)} frames"
+    printSummary(summary, title)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(dict(title=title, arguments=vars(args), summary=summary), f, indent=4)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
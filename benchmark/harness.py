@@ -0,0 +1,329 @@
+"""
+    Run the Longboard glyph editor subscriber outside RoboFont.
+
+    installStandins() puts the stand-ins for mojo, merz, ezui and AppKit
+    on the path, with the RoboFont builtins Longboard asks for.
+    After that longboard.py can be imported as it is.
+
+        import harness
+        harness.installStandins()
+        operator = harness.openDesignspace(path)
+        editor = harness.openGlyphEditor(operator, "bench")
+        harness.mouseDown(editor)
+        editor.previewLocation_dragging = {...}
+        editor.updateInstanceOutline(rebuild=False)
+        harness.mouseUp(editor)
+
+    For drags that go through the mouse events, as in RoboFont,
+    start the navigator controller first. It sends the navigator
+    location changes to LongBoardUIController.navigatorLocationChanged,
+    with stand-ins for the window items that method reads.
+
+        controller = harness.startNavigatorController(operator)
+        harness.mouseDown(editor)
+        harness.mouseDrag(editor, (10, 0), timestamp=0.01)
+        harness.mouseUp(editor)
+
+    The operator stands in for the one DesignspaceEditor2 makes:
+    a ufoProcessor UFOOperator with a preview location.
+"""
+
+import builtins
+import os
+import sys
+
+here = os.path.dirname(os.path.abspath(__file__))
+standinsFolder = os.path.join(here, "standins")
+libFolder = os.path.join(os.path.dirname(here), "source", "lib")
+
+from ufoProcessor.ufoOperator import UFOOperator
+
+# the designspaces that are "open"
+openDesignspaces = []
+_currentGlyph = None
+
+
+class DesignspaceEditorOperator(UFOOperator):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._previewLocation = None
+
+    def getPreviewLocation(self):
+        if self._previewLocation is None:
+            return self.newDefaultLocation(bend=True)
+        return dict(self._previewLocation)
+
+    def setPreviewLocation(self, location):
+        self._previewLocation = dict(location)
+
+
+def AllDesignspaces(usingFont=None):
+    if usingFont is None:
+        return list(openDesignspaces)
+    return [operator for operator in openDesignspaces if usingFont.path in [source.path for source in operator.sources]]
+
+
+def CurrentGlyph():
+    return _currentGlyph
+
+
+def CurrentFont():
+    if _currentGlyph is None:
+        return None
+    return _currentGlyph.font
+
+
+def installStandins():
+    for folder in (libFolder, standinsFolder):
+        if folder not in sys.path:
+            sys.path.insert(0, folder)
+    builtins.AllDesignspaces = AllDesignspaces
+    builtins.CurrentGlyph = CurrentGlyph
+    builtins.CurrentFont = CurrentFont
+
+
+def openDesignspace(path, extrapolate=True):
+    operator = DesignspaceEditorOperator(path, extrapolate=extrapolate)
+    operator.loadFonts()
+    import longboard
+    if longboard.interactionSourcesLibKey not in operator.lib:
+        # the first axis follows the mouse horizontally, the second vertically
+        directions = ["horizontal", "vertical"]
+        operator.lib[longboard.interactionSourcesLibKey] = [
+            (axis.name, directions[index] if index < len(directions) else "ignore")
+            for index, axis in enumerate(operator.getOrderedContinuousAxes())
+            ]
+    openDesignspaces.append(operator)
+    longboard.designspaceIndex.invalidate()
+    return operator
+
+
+def closeDesignspace(operator):
+    if operator in openDesignspaces:
+        openDesignspaces.remove(operator)
+    import longboard
+    longboard.designspaceIndex.invalidate()
+
+
+class GlyphEditorStandin:
+
+    def __init__(self, glyph):
+        import merz
+        self._merz = merz
+        self.glyph = glyph
+        self.containers = {}
+
+    def extensionContainer(self, identifier, location="foreground", clear=False):
+        key = identifier, location
+        if key not in self.containers:
+            self.containers[key] = self._merz.Layer(name=identifier)
+        container = self.containers[key]
+        if clear:
+            container.clearSublayers()
+        return container
+
+    def getGlyph(self):
+        return self.glyph
+
+
+def defaultSettings(operator, **overrides):
+    # the settings the UI controller would send
+    from longboard import interactionSourcesLibKey
+    settings = dict(
+        allowExtrapolation=False,
+        allowAnisotropy=False,
+        showSources=False,
+        showVectors=False,
+        showSelection=True,
+        wantsVarLib=False,
+        showMeasurements=True,
+        showKinks=True,
+        showStats=True,
+        showRounded=False,
+        alignPreview="center",
+        alignStats="center",
+        hazeSlider=0.5,
+        _discreteAxisNames=[axis.name for axis in operator.getOrderedDiscreteAxes()],
+        _continuousAxisNames=[axis.name for axis in operator.getOrderedContinuousAxes()],
+        _dragDirections=list(operator.lib.get(interactionSourcesLibKey, [])),
+        )
+    settings.update(overrides)
+    return settings
+
+
+def getEditorGlyph(operator, glyphName, sourceIndex=0):
+    from mojo.roboFont import RGlyph
+    source = operator.sources[sourceIndex]
+    font = operator.fonts[source.name]
+    return RGlyph(font[glyphName])
+
+
+def openGlyphEditor(operator, glyphName, sourceIndex=0, **settings):
+    # make the editor subscriber for a glyph of one of the sources
+    global _currentGlyph
+    import longboard
+    glyph = getEditorGlyph(operator, glyphName, sourceIndex)
+    _currentGlyph = glyph
+    editor = longboard.LongboardEditorView(glyphEditor=GlyphEditorStandin(glyph))
+    editor.glyphEditorDidSetGlyph(dict(glyph=glyph))
+    applySettings(editor, defaultSettings(operator, **settings))
+    return editor
+
+
+def applySettings(editor, settings):
+    editor.showSettingsChanged(dict(lowLevelEvents=[dict(settings=settings)]))
+
+
+def navigatorToolInfo(**deviceState):
+    import longboard
+    state = dict(shiftDown=0, optionDown=0, commandDown=0, controlDown=0, capLockDown=0)
+    state.update(deviceState)
+    return dict(lowLevelEvents=[dict(tool=longboard.LongboardNavigatorTool())], deviceState=state)
+
+
+class ViewStandin:
+
+    def __init__(self, scale=1):
+        self._scale = scale
+
+    def scale(self):
+        return self._scale
+
+    def offset(self):
+        return (0, 0)
+
+
+class PointStandin:
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class EventStandin:
+
+    def __init__(self, timestamp=0, keyCode=None):
+        self._timestamp = timestamp
+        self._keyCode = keyCode
+
+    def timestamp(self):
+        return self._timestamp
+
+    def keyCode(self):
+        return self._keyCode
+
+
+def mouseDown(editor):
+    editor.glyphEditorDidMouseDown(navigatorToolInfo())
+
+
+def runTimers():
+    # the timers that would have fired in RoboFont's run loop by now
+    from PyObjCTools.AppHelper import runPendingCalls
+    runPendingCalls()
+
+
+def mouseUp(editor):
+    # the mouse stopped before it went up
+    runTimers()
+    editor.glyphEditorDidMouseUp(navigatorToolInfo())
+
+
+def mouseDrag(editor, point, timestamp, viewScale=1, **deviceState):
+    # point: the mouse in glyph coordinates, timestamp in seconds
+    info = navigatorToolInfo(**deviceState)
+    info["lowLevelEvents"][-1].update(
+        view=ViewStandin(viewScale),
+        point=PointStandin(*point),
+        event=EventStandin(timestamp=timestamp),
+        )
+    editor.glyphEditorDidMouseDrag(info)
+
+
+def keyDown(editor, key):
+    # key: "up", "down", "left" or "right"
+    keyCodes = {name: code for code, name in editor._eventKeyCodes.items()}
+    info = navigatorToolInfo()
+    info["lowLevelEvents"][-1].update(event=EventStandin(keyCode=keyCodes[key]))
+    editor.glyphEditorDidKeyDown(info)
+
+
+class ItemStandin:
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class WindowStandin:
+    # the items of the Longboard window the controller reads
+
+    def __init__(self, **items):
+        self.items = {name: ItemStandin(value) for name, value in items.items()}
+
+    def getItem(self, name):
+        return self.items[name]
+
+
+def getAxesTableItems(operator):
+    # the axes table as the controller fills it, with the directions from the operator lib
+    import longboard
+    popUpValues = dict(horizontal=0, vertical=1)
+    return [
+        dict(textValue=axisName, popUpValue=popUpValues.get(direction, 2))
+        for axisName, direction in operator.lib.get(longboard.interactionSourcesLibKey, [])
+        ]
+
+
+def startNavigatorController(operator, allowAnisotropy=False, allowExtrapolation=False):
+    # A LongBoardUIController without its window. The location changes
+    # go through the navigatorLocationChanged of the controller itself,
+    # replayed drags bring their own directions and settings.
+    import longboard
+    from mojo.subscriber import Subscriber
+
+    class NavigatorControllerStandin(Subscriber):
+
+        def build(self):
+            self.operator = operator
+            self.allowAnisotropy = allowAnisotropy
+            self.w = WindowStandin(
+                axesTable=getAxesTableItems(operator),
+                allowExtrapolation=int(allowExtrapolation),
+                )
+
+        def navigatorLocationChanged(self, info):
+            # RoboFont sends the view of the glyph editor with the event
+            info["lowLevelEvents"][-1].setdefault("view", ViewStandin())
+            longboard.LongBoardUIController.navigatorLocationChanged(self, info)
+
+    return NavigatorControllerStandin()
+
+
+def addMeasurements(glyph, count):
+    # horizontal measurement beams through the glyph
+    from mojo.roboFont import Measurement
+    bounds = glyph.bounds
+    if bounds is None:
+        return
+    xMin, yMin, xMax, yMax = bounds
+    measurements = []
+    for i in range(count):
+        y = yMin + (i + 1) * (yMax - yMin) / (count + 1)
+        measurements.append(Measurement((xMin - 50, y), (xMax + 50, y)))
+    glyph.measurements = measurements
+
+
+def selectPoints(glyph, count):
+    # select the first count on curve points
+    selected = 0
+    for contour in glyph.contours:
+        for point in contour.points:
+            if selected >= count:
+                return
+            if point.type != "offcurve":
+                point.selected = True
+                selected += 1
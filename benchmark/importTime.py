@@ -0,0 +1,98 @@
+"""
+    How long Longboard takes to import, against a budget.
+
+    Two moments count: RoboFont starting, when run.py imports
+    longboardEvents, and the first time Longboard is opened, when
+    longboard.py is imported. Each runs in a fresh Python with
+    -X importtime, after the stand-ins are imported, so only the
+    modules Longboard pulls in are counted.
+
+        python importTime.py
+        python importTime.py --startup-budget 20 --first-use-budget 800 --top 15
+
+    Exits with 1 when a budget is exceeded. In RoboFont mojo, merz, ezui
+    and AppKit are loaded already, here their stand-ins are. The Python
+    packages Longboard needs, ufoProcessor, fontTools, fontMath, numpy,
+    are counted, although RoboFont and DesignspaceEditor2 may have
+    loaded some of them before.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+here = os.path.dirname(os.path.abspath(__file__))
+standinsFolder = os.path.join(here, "standins")
+libFolder = os.path.join(os.path.dirname(here), "source", "lib")
+
+# RoboFont has these before any extension starts
+preloaded = ["mojo.subscriber", "mojo.events", "mojo.extensions", "mojo.UI", "mojo.roboFont", "merz", "ezui", "AppKit"]
+
+# what each moment imports
+moments = dict(
+    startup="longboardEvents",
+    firstUse="longboard",
+    )
+
+
+def measureImport(moduleName):
+    # returns (total ms, [(self ms, module name), ...] the slowest modules first)
+    code = "; ".join([
+        "import sys",
+        f"sys.path[:0] = [{libFolder!r}, {standinsFolder!r}]",
+        f"import {', '.join(preloaded)}",
+        "print('--longboard--', file=sys.stderr, flush=True)",
+        f"import {moduleName}",
+        ])
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=here, capture_output=True, text=True,
+        )
+    if process.returncode != 0:
+        raise RuntimeError(f"import {moduleName} failed:\n{process.stderr}")
+    lines = process.stderr.split("--longboard--", 1)[1].splitlines()
+    modules = []
+    allModules = []
+    for line in lines:
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        selfTime, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        allModules.append((int(selfTime) / 1000, name.strip()))
+        if depth == 0:
+            modules.append((int(cumulative) / 1000, name.strip()))
+    total = sum(milliseconds for milliseconds, name in modules)
+    return total, sorted(allModules, reverse=True)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Measure the Longboard import time against a budget.")
+    parser.add_argument("--startup-budget", type=float, default=25, help="milliseconds for the startup import")
+    parser.add_argument("--first-use-budget", type=float, default=500, help="milliseconds for the first use import")
+    parser.add_argument("--repeat", type=int, default=3, help="measure this many times, keep the fastest")
+    parser.add_argument("--top", type=int, default=10, help="show the slowest modules")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(args)
+
+    budgets = dict(startup=args.startup_budget, firstUse=args.first_use_budget)
+    results = {}
+    overBudget = False
+    for moment, moduleName in moments.items():
+        total, slowest = min((measureImport(moduleName) for i in range(args.repeat)), key=lambda result: result[0])
+        budget = budgets[moment]
+        status = "ok" if total <= budget else "OVER BUDGET"
+        overBudget = overBudget or total > budget
+        print(f"{moment:>10}: import {moduleName:<16} {total:8.1f} ms, budget {budget:.0f} ms, {status}")
+        for milliseconds, name in slowest[:args.top]:
+            print(f"{'':>12}{milliseconds:8.1f} ms  {name}")
+        results[moment] = dict(module=moduleName, milliseconds=round(total, 2), budget=budget, slowest=slowest[:args.top])
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+    return 1 if overBudget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
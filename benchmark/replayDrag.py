@@ -0,0 +1,134 @@
+"""
+    Replay a Longboard drag recording without RoboFont.
+
+    The recordings are made with "Record drags" in the Longboard
+    contextual menu of the glyph editor, and saved in the "recordings"
+    folder next to the designspace. The replay opens the designspace and
+    the glyph from the recording and sends the same frames through
+    navigatorLocationChanged and updateInstanceOutline.
+    Reports the milliseconds per frame for each stage, like benchDrag.py.
+
+        python replayDrag.py recordings/Drag_MyFamily_a_2024-11-01-12-00-00.longboardDrag
+        python replayDrag.py my.longboardDrag --designspace moved/MyFamily.designspace --repeat 5
+        python replayDrag.py --make /tmp/synthetic.longboardDrag --axes 3 --sources 8
+
+    With --make it records a synthetic drag through the mouse events first,
+    then replays that.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+
+import harness
+harness.installStandins()
+
+import merz
+from longboardRecorder import readRecording, writeRecording, iterReplaySteps
+from syntheticDesignspace import makeDesignspace, addDesignspaceArguments, glyphName
+from benchDrag import summarize, printSummary
+
+
+def replayFrames(editor, recording):
+    # replay the recording, return the timing of each frame
+    frames = []
+    settings = recording["header"].get("settings", {})
+    for step in iterReplaySteps(recording):
+        layerCallsBefore = merz.layerCalls
+        editor.frameTimer.lastFrame = None
+        editor.replayStep(step, settings)
+        if step[0] in ("frame", "nudge") and editor.frameTimer.lastFrame is not None:
+            frame = dict(editor.frameTimer.lastFrame)
+            frame["layerCalls"] = merz.layerCalls - layerCallsBefore
+            frames.append(frame)
+    return frames
+
+
+def makeSyntheticRecording(path, args):
+    # drag a synthetic glyph with the mouse events, record it.
+    folder = tempfile.mkdtemp(prefix="longboardReplay_")
+    designspacePath = makeDesignspace(folder, args.axes, args.sources, args.contours, args.segments, args.discrete, args.instances, args.seed)
+    operator = harness.openDesignspace(designspacePath)
+    controller = harness.startNavigatorController(operator, allowAnisotropy=args.anisotropic)
+    editor = harness.openGlyphEditor(operator, glyphName, allowAnisotropy=args.anisotropic)
+    editor.dragRecorder.start(editor.collectRecordingSettings())
+    # the mouse events come at 120 per second, the scheduler
+    # gets the same clock, so it makes a frame for every other drag.
+    timestamp = 0
+    editor.dragScheduler.clock = lambda: timestamp
+    harness.mouseDown(editor)
+    for i in range(args.frames):
+        timestamp += 1 / 120
+        x = 200 * math.sin(i / 20)
+        y = 100 * math.sin(i / 13)
+        harness.mouseDrag(editor, (x, y), timestamp, shiftDown=131072 if i % 50 > 40 else 0, optionDown=524288 if args.anisotropic else 0)
+    harness.mouseUp(editor)
+    for key in ("right", "right", "up"):
+        harness.keyDown(editor, key)
+    recording = editor.dragRecorder.stop()
+    writeRecording(path, recording)
+    controller.terminate()
+    editor.terminate()
+    harness.closeDesignspace(operator)
+    return path
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Replay a Longboard drag recording and time the preview updates.")
+    parser.add_argument("recording", nargs="?", help="the .longboardDrag file")
+    parser.add_argument("--designspace", help="use this designspace instead of the one in the recording")
+    parser.add_argument("--glyph", help="use this glyph instead of the one in the recording")
+    parser.add_argument("--source", type=int, default=0, help="index of the source the editor glyph comes from")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the recording this many times")
+    parser.add_argument("--make", help="record a synthetic drag to this file and replay it")
+    parser.add_argument("--frames", type=int, default=200, help="mouse drags in the synthetic recording")
+    parser.add_argument("--anisotropic", action="store_true", help="make the synthetic drag anisotropic, with the option key")
+    parser.add_argument("--json", help="write the results to this file")
+    addDesignspaceArguments(parser)
+    args = parser.parse_args(args)
+
+    recordingPath = args.recording
+    if args.make:
+        recordingPath = makeSyntheticRecording(args.make, args)
+    if recordingPath is None:
+        parser.error("a recording or --make is needed")
+    recording = readRecording(recordingPath)
+
+    downs = [step for step in iterReplaySteps(recording) if step[0] == "down"]
+    designspacePath = args.designspace or (downs[0][1] if downs else None)
+    replayGlyphName = args.glyph or (downs[0][2] if downs else None)
+    if designspacePath is None or replayGlyphName is None:
+        parser.error("the recording has no mouse down, use --designspace and --glyph")
+
+    settings = recording["header"].get("settings", {})
+    operator = harness.openDesignspace(designspacePath)
+    controller = harness.startNavigatorController(
+        operator,
+        allowAnisotropy=settings.get("allowAnisotropy", False),
+        allowExtrapolation=settings.get("allowExtrapolation", False),
+        )
+    editor = harness.openGlyphEditor(
+        operator, replayGlyphName, sourceIndex=args.source,
+        allowAnisotropy=settings.get("allowAnisotropy", False),
+        allowExtrapolation=settings.get("allowExtrapolation", False),
+        wantsVarLib=settings.get("wantsVarLib", False),
+        showRounded=settings.get("showRounded", False),
+        alignPreview=settings.get("alignPreview", "center"),
+        )
+    frames = []
+    for repeat in range(args.repeat):
+        frames.extend(replayFrames(editor, recording))
+    summary = summarize(frames)
+    title = f"{os.path.basename(recordingPath)}: {os.path.basename(designspacePath)} {replayGlyphName}, {len(recording['events'])} events, {len(frames)} frames"
+    printSummary(summary, title)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(dict(title=title, arguments=vars(args), summary=summary), f, indent=4)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
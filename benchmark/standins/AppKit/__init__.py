@@ -0,0 +1,31 @@
+"""
+    Stand-in for AppKit: a pasteboard that keeps its text in memory.
+"""
+
+NSPasteboardTypeString = "public.utf8-plain-text"
+
+
+class NSPasteboard:
+
+    _general = None
+
+    def __init__(self):
+        self.contents = {}
+
+    @classmethod
+    def generalPasteboard(cls):
+        if cls._general is None:
+            cls._general = cls()
+        return cls._general
+
+    def clearContents(self):
+        self.contents = {}
+
+    def declareTypes_owner_(self, types, owner):
+        pass
+
+    def setString_forType_(self, text, pasteboardType):
+        self.contents[pasteboardType] = text
+
+    def stringForType_(self, pasteboardType):
+        return self.contents.get(pasteboardType)
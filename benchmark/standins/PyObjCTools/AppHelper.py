@@ -0,0 +1,19 @@
+"""
+    Stand-in for PyObjCTools.AppHelper: there is no run loop,
+    callLater keeps the calls until runPendingCalls() is called.
+"""
+
+pendingCalls = []
+
+
+def callLater(delay, func, *args, **kwargs):
+    pendingCalls.append((delay, func, args, kwargs))
+
+
+def runPendingCalls():
+    # run the calls that are waiting now, in order of their delay.
+    # the calls they make go in the next round.
+    calls = sorted(pendingCalls, key=lambda call: call[0])
+    del pendingCalls[:]
+    for delay, func, args, kwargs in calls:
+        func(*args, **kwargs)
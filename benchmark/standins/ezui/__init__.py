@@ -0,0 +1,14 @@
+"""
+    Stand-in for ezui. The Longboard window is not made in the benchmark,
+    these only need to exist.
+"""
+
+
+class WindowController:
+    pass
+
+
+class EZWindow:
+
+    def __init__(self, *args, **kwargs):
+        pass
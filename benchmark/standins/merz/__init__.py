@@ -0,0 +1,78 @@
+"""
+    Stand-in for merz. Layers remember what was set on them and
+    count the calls, pens record their drawing like a RecordingPen.
+"""
+
+from fontTools.pens.recordingPen import RecordingPen
+
+# number of calls that changed a layer, for the benchmark
+layerCalls = 0
+
+
+class MerzPen(RecordingPen):
+
+    @property
+    def path(self):
+        return tuple(self.value)
+
+
+class Layer:
+
+    def __init__(self, name=None, **attributes):
+        global layerCalls
+        layerCalls += 1
+        self.name = name
+        self.attributes = attributes
+        self.sublayers = []
+        self.visible = True
+
+    def _append(self, **kwargs):
+        layer = Layer(**kwargs)
+        self.sublayers.append(layer)
+        return layer
+
+    appendBaseSublayer = _append
+    appendPathSublayer = _append
+    appendSymbolSublayer = _append
+    appendTextLineSublayer = _append
+
+    def getSublayer(self, name):
+        for layer in self.sublayers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def removeSublayer(self, layer):
+        global layerCalls
+        layerCalls += 1
+        self.sublayers.remove(layer)
+
+    def clearSublayers(self):
+        global layerCalls
+        layerCalls += 1
+        self.sublayers = []
+
+    def getPen(self, clear=True):
+        pen = MerzPen()
+        self.setPath(pen)
+        return pen
+
+    def setVisible(self, value):
+        self._set("visible", value)
+        self.visible = value
+
+    def __getattr__(self, name):
+        # setPath, setPosition, setText, setStrokeColor, ...
+        if name.startswith("set"):
+            attribute = name[3].lower() + name[4:]
+            return lambda value: self._set(attribute, value)
+        raise AttributeError(name)
+
+    def _set(self, attribute, value):
+        global layerCalls
+        layerCalls += 1
+        self.attributes[attribute] = value
+
+
+def countLayers(layer):
+    return len(layer.sublayers) + sum(countLayers(sublayer) for sublayer in layer.sublayers)
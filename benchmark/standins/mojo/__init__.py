@@ -0,0 +1,4 @@
+"""
+    Stand-in for the RoboFont mojo package, so longboard.py can be
+    imported and driven outside RoboFont. Only the parts Longboard uses.
+"""
@@ -0,0 +1,42 @@
+# stand-in for mojo.events
+# events are delivered right away to the subscribers that registered for them.
+
+from mojo import subscriber
+
+
+def publishEvent(eventName, **kwargs):
+    subscriber.dispatchEvent(eventName, kwargs)
+
+
+def postEvent(eventName, **kwargs):
+    subscriber.dispatchEvent(eventName, kwargs)
+
+
+class BaseEventTool:
+
+    def __init__(self):
+        self._zooming = False
+        self.setup()
+
+    def setup(self):
+        pass
+
+
+_activeTool = None
+
+
+def installTool(tool):
+    pass
+
+
+def uninstallTool(tool):
+    pass
+
+
+def setActiveEventTool(tool):
+    global _activeTool
+    _activeTool = tool
+
+
+def getActiveEventTool():
+    return _activeTool
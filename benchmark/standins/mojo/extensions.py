@@ -0,0 +1,20 @@
+# stand-in for mojo.extensions
+
+_defaults = {}
+
+
+class ExtensionBundle:
+
+    def __init__(self, name=None, path=None):
+        self.name = name
+
+    def getResourceImage(self, name, ext="png"):
+        return None
+
+
+def getExtensionDefault(key, fallback=None):
+    return _defaults.get(key, fallback)
+
+
+def setExtensionDefault(key, value):
+    _defaults[key] = value
@@ -0,0 +1,99 @@
+# stand-in for mojo.roboFont
+# RGlyph is the fontParts fontshell glyph, with the few RoboFont
+# additions Longboard uses: asDefcon, asFontParts, point selection,
+# measurements and the doodle.Beam representation.
+
+from fontParts import fontshell
+from fontTools.pens.basePen import BasePen
+from fontTools.misc.bezierTools import segmentSegmentIntersections
+
+_selectedPoints = set()
+
+
+class RPoint(fontshell.RPoint):
+
+    def _get_selected(self):
+        return id(self.naked()) in _selectedPoints
+
+    def _set_selected(self, value):
+        if value:
+            _selectedPoints.add(id(self.naked()))
+        else:
+            _selectedPoints.discard(id(self.naked()))
+
+
+class RContour(fontshell.RContour):
+    pointClass = RPoint
+
+
+class Measurement:
+
+    def __init__(self, startPoint, endPoint):
+        self.startPoint = startPoint
+        self.endPoint = endPoint
+
+
+class _SegmentCollector(BasePen):
+
+    def __init__(self):
+        super().__init__(None)
+        self.segments = []
+
+    def _moveTo(self, pt):
+        self._current = self._start = pt
+
+    def _lineTo(self, pt):
+        self.segments.append((self._current, pt))
+        self._current = pt
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        self.segments.append((self._current, pt1, pt2, pt3))
+        self._current = pt3
+
+    def _closePath(self):
+        if self._current != self._start:
+            self.segments.append((self._current, self._start))
+
+
+class BeamRepresentation:
+
+    def __init__(self, glyph, beam):
+        collector = _SegmentCollector()
+        glyph.draw(collector)
+        self.intersects = []
+        for segment in collector.segments:
+            for intersection in segmentSegmentIntersections(segment, beam):
+                self.intersects.append(tuple(intersection.pt))
+
+
+class RGlyph(fontshell.RGlyph):
+
+    contourClass = RContour
+    measurements = []
+
+    def _get_layer(self):
+        # a glyph wrapped on its own still knows its font
+        if self._layer is None and self.naked().layer is not None:
+            self._layer = fontshell.RLayer(self.naked().layer)
+        return self._layer
+
+    def _get_font(self):
+        layer = self._get_layer()
+        if layer is None or self.naked().font is None:
+            return None
+        return fontshell.RFont(self.naked().font)
+
+    def asDefcon(self):
+        return self.naked()
+
+    def asFontParts(self):
+        return self
+
+    def getRepresentation(self, name, **kwargs):
+        if name == "doodle.Beam":
+            return BeamRepresentation(self, kwargs["beam"])
+        return self.naked().getRepresentation(name, **kwargs)
+
+
+def OpenWindow(cls, *args, **kwargs):
+    return cls(*args, **kwargs)
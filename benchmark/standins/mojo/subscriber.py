@@ -0,0 +1,50 @@
+# stand-in for mojo.subscriber
+# Subscribers that are started are sent the events registered
+# with registerSubscriberEvent. There is no delay and no coalescing.
+
+_subscriberEvents = {}    # low level event name: [(subscriber event name, method name)]
+_subscribers = []
+
+
+class Subscriber:
+
+    def __init__(self, glyphEditor=None):
+        self._glyphEditor = glyphEditor
+        self.build()
+        _subscribers.append(self)
+
+    def build(self):
+        pass
+
+    def destroy(self):
+        pass
+
+    def terminate(self):
+        self.destroy()
+        if self in _subscribers:
+            _subscribers.remove(self)
+
+    def getGlyphEditor(self):
+        return self._glyphEditor
+
+
+def registerSubscriberEvent(subscriberEventName, methodName, lowLevelEventNames, **kwargs):
+    for lowLevelEventName in lowLevelEventNames:
+        _subscriberEvents.setdefault(lowLevelEventName, []).append((subscriberEventName, methodName))
+
+
+def registerGlyphEditorSubscriber(cls):
+    pass
+
+
+def unregisterGlyphEditorSubscriber(cls):
+    pass
+
+
+def dispatchEvent(eventName, data):
+    for subscriberEventName, methodName in _subscriberEvents.get(eventName, []):
+        info = dict(subscriberEventName=subscriberEventName, lowLevelEvents=[data])
+        for subscriber in list(_subscribers):
+            method = getattr(subscriber, methodName, None)
+            if method is not None:
+                method(info)
@@ -0,0 +1,184 @@
+"""
+    Make a designspace with synthetic sources for the benchmarks.
+
+    The sources are UFOs with one glyph, "bench", made of ring shaped
+    contours of cubic curves. Each axis changes the shape in its own way,
+    so the interpolation has real work to do. All the sources have the
+    same point structure.
+
+        python syntheticDesignspace.py /tmp/bench --axes 3 --sources 12 --contours 4 --segments 16 --discrete 2
+"""
+
+import argparse
+import math
+import os
+import random
+import shutil
+
+from fontParts.fontshell import RFont
+from fontTools.designspaceLib import (
+    DesignSpaceDocument,
+    AxisDescriptor,
+    DiscreteAxisDescriptor,
+    SourceDescriptor,
+    InstanceDescriptor,
+)
+
+glyphName = "bench"
+compositeName = "benchComposite"
+axisMaximum = 1000
+
+# the tangent length for a quarter circle, per segment angle
+def handleLength(angle):
+    return 4 / 3 * math.tan(angle / 4)
+
+
+def makeSourceLocations(axisCount, sourceCount, seed=0):
+    # The default first, then the extremes of each axis,
+    # then random locations in the space, corners before the rest.
+    randomizer = random.Random(seed)
+    default = [0] * axisCount
+    locations = [default]
+    for axisIndex in range(axisCount):
+        location = list(default)
+        location[axisIndex] = axisMaximum
+        locations.append(location)
+    attempts = 0
+    while len(locations) < sourceCount and attempts < 1000 * sourceCount:
+        attempts += 1
+        if randomizer.random() < 0.5:
+            location = [randomizer.choice([0, axisMaximum]) for i in range(axisCount)]
+        else:
+            location = [randomizer.choice([0, 250, 500, 750, axisMaximum]) for i in range(axisCount)]
+        if location not in locations:
+            locations.append(location)
+    return locations[:sourceCount]
+
+
+def drawRing(pen, centerX, centerY, radiusX, radiusY, segments, wobble, phase):
+    # a closed contour of smooth cubic curves
+    step = 2 * math.pi / segments
+    handle = handleLength(step)
+    points = []
+    for i in range(segments):
+        angle = i * step
+        radiusFactor = 1 + wobble * math.sin(3 * angle + phase)
+        x = centerX + math.cos(angle) * radiusX * radiusFactor
+        y = centerY + math.sin(angle) * radiusY * radiusFactor
+        # tangent
+        tx = -math.sin(angle) * radiusX * radiusFactor * handle
+        ty = math.cos(angle) * radiusY * radiusFactor * handle
+        points.append(((x, y), (tx, ty)))
+    pen.moveTo(points[0][0])
+    for i in range(segments):
+        (x0, y0), (tx0, ty0) = points[i]
+        (x1, y1), (tx1, ty1) = points[(i + 1) % segments]
+        pen.curveTo((x0 + tx0, y0 + ty0), (x1 - tx1, y1 - ty1), (x1, y1))
+    pen.closePath()
+
+
+def drawBenchGlyph(glyph, axisValues, contours, segments, slant=0):
+    # axisValues: 0..1 for each axis
+    weight = axisValues[0] if axisValues else 0
+    width = axisValues[1] if len(axisValues) > 1 else 0
+    # the other axes wobble the outlines, each with their own phase
+    wobble = sum(0.02 * (i + 1) * value for i, value in enumerate(axisValues[2:]))
+    phase = sum(value * (i + 1) for i, value in enumerate(axisValues[2:]))
+    columns = max(1, int(math.ceil(math.sqrt(contours))))
+    cell = 300 + 200 * width
+    radius = 100 + 30 * weight
+    pen = glyph.getPen()
+    for contourIndex in range(contours):
+        column = contourIndex % columns
+        row = contourIndex // columns
+        centerX = 50 + cell * (column + 0.5)
+        centerY = 300 * (row + 0.5)
+        drawRing(pen, centerX + slant * centerY, centerY, radius + 20 * width, radius, segments, wobble, phase + contourIndex)
+    glyph.width = 100 + cell * columns
+    for contour in glyph.contours:
+        for point in contour.points:
+            if point.type != "offcurve":
+                point.smooth = True
+
+
+def makeDesignspace(folder, axes=2, sources=4, contours=2, segments=8, discrete=0, instances=0, seed=0):
+    # Write the sources and the designspace in folder.
+    # Returns the path to the designspace.
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+    os.makedirs(folder)
+    doc = DesignSpaceDocument()
+    axisNames = []
+    for axisIndex in range(axes):
+        axis = AxisDescriptor()
+        axis.name = f"axis{axisIndex}"
+        axis.tag = f"ax{axisIndex:02d}"
+        axis.minimum = 0
+        axis.default = 0
+        axis.maximum = axisMaximum
+        doc.addAxis(axis)
+        axisNames.append(axis.name)
+    discreteValues = [None]
+    if discrete:
+        axis = DiscreteAxisDescriptor()
+        axis.name = "slant"
+        axis.tag = "slnt"
+        axis.values = list(range(discrete))
+        axis.default = 0
+        doc.addAxis(axis)
+        discreteValues = axis.values
+    locations = makeSourceLocations(axes, sources, seed=seed)
+    for discreteValue in discreteValues:
+        for sourceIndex, location in enumerate(locations):
+            font = RFont()
+            font.info.familyName = "Bench"
+            font.info.styleName = f"Source {sourceIndex} {discreteValue}"
+            font.info.unitsPerEm = 1000
+            font.info.italicAngle = 0
+            glyph = font.newGlyph(glyphName)
+            slant = 0.1 * (discreteValue or 0)
+            drawBenchGlyph(glyph, [value / axisMaximum for value in location], contours, segments, slant=slant)
+            composite = font.newGlyph(compositeName)
+            composite.appendComponent(glyphName, offset=(20, 0))
+            composite.width = glyph.width + 40
+            fileName = f"source_{sourceIndex}_{discreteValue}.ufo"
+            path = os.path.join(folder, fileName)
+            font.save(path)
+            descriptor = SourceDescriptor()
+            descriptor.path = path
+            descriptor.filename = fileName
+            descriptor.name = f"source{sourceIndex}_{discreteValue}"
+            descriptor.location = dict(zip(axisNames, location))
+            if discreteValue is not None:
+                descriptor.location["slant"] = discreteValue
+            doc.addSource(descriptor)
+    randomizer = random.Random(seed + 1)
+    for instanceIndex in range(instances):
+        instance = InstanceDescriptor()
+        instance.familyName = "Bench"
+        instance.styleName = f"Instance {instanceIndex}"
+        instance.location = {name: randomizer.uniform(0, axisMaximum) for name in axisNames}
+        if discrete:
+            instance.location["slant"] = randomizer.choice(discreteValues)
+        doc.addInstance(instance)
+    path = os.path.join(folder, "bench.designspace")
+    doc.write(path)
+    return path
+
+
+def addDesignspaceArguments(parser):
+    parser.add_argument("--axes", type=int, default=2, help="number of continuous axes")
+    parser.add_argument("--sources", type=int, default=4, help="number of sources per discrete location")
+    parser.add_argument("--contours", type=int, default=2, help="number of contours in the glyph")
+    parser.add_argument("--segments", type=int, default=8, help="number of curve segments per contour")
+    parser.add_argument("--discrete", type=int, default=0, help="number of values on a discrete axis, 0 for none")
+    parser.add_argument("--instances", type=int, default=0, help="number of instances")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Make a synthetic designspace for the Longboard benchmarks.")
+    parser.add_argument("folder")
+    addDesignspaceArguments(parser)
+    args = parser.parse_args()
+    print(makeDesignspace(args.folder, args.axes, args.sources, args.contours, args.segments, args.discrete, args.instances, args.seed))
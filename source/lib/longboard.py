@@ -10,13 +10,10 @@
     
 """
 
-import importlib
-import ufoProcessor.ufoOperator
-importlib.reload(ufoProcessor.ufoOperator)
 import ezui
-import math, time, os, traceback
+import math, time, os, traceback, copy
+import weakref
 import AppKit
-import webbrowser
 
 from random import randint, choice, random
 
@@ -38,25 +35,42 @@ from mojo.subscriber import (
     Subscriber,
     registerGlyphEditorSubscriber,
     unregisterGlyphEditorSubscriber,
-    registerSubscriberEvent
 )
 
 from mojo.roboFont import OpenWindow, RGlyph
+from PyObjCTools.AppHelper import callLater
 
 from fontTools.pens.basePen import BasePen
+from fontTools.pens.transformPen import TransformPen
 from fontTools.ufoLib.glifLib import writeGlyphToString
 from fontTools.designspaceLib import InstanceDescriptor
 
 from datetime import datetime
 
+from longboardKernel import interpolationKernels, sourceOutlines, previewOutlines, InstanceOutline, findKinks, calcOutlineArea, makeInstanceOutline
+from longboardScheduler import DragScheduler
+from longboardLayers import SublayerPool
+from longboardTiming import FrameTimer
+from longboardTrace import traceRecorder, traced, writeTrace, makeTracePath
+from longboardProfile import DragProfiler, writeProfile, makeProfilePath
+from longboardPrefetch import PreviewPrefetcher, predictDragOffsets
+from longboardPreviewService import previewService
+from longboardWarmup import kernelWarmup
+from longboardRecorder import DragRecorder, writeRecording, readRecording, makeRecordingPath, findRecordings, findRecordingMismatches, iterReplaySteps
+
+
+# the events are registered at startup, in longboardEvents
+from longboardEvents import (
+    navigatorLocationChangedEventKey,
+    navigatorUnitChangedEventKey,
+    navigatorActiveEventKey,
+    navigatorInactiveEventKey,
+    toolID,
+    settingsChangedEventKey,
+    operatorChangedEventKey,
+    previewChangedEventKey,
+)
 
-eventID = "com.letterror.longboardNavigator"
-navigatorLocationChangedEventKey = eventID + "navigatorLocationChanged.event"
-navigatorUnitChangedEventKey = eventID + "navigatorUnitChanged.event"
-navigatorActiveEventKey = eventID + "navigatorActive.event"
-navigatorInactiveEventKey = eventID + "navigatorInctive.event"
-
-toolID = "com.letterror.longboard"
 containerKey = toolID + ".layer"
 previewContainerKey = toolID + ".preview.layer"
 statsContainerKey = toolID + ".stats.layer"
@@ -64,8 +78,6 @@ selectionContainerKey = toolID + ".selectionItems.layer"
 selectionTextContainerKey = toolID + ".selectionText.layer"
 copiedGlyphLocationLibKey = toolID + ".location"
 
-settingsChangedEventKey = toolID + ".settingsChanged.event"
-operatorChangedEventKey = toolID + ".operatorChanged.event"
 interactionSourcesLibKey = toolID + ".interactionSources"
 
 previewAlignOptions = ['leftOutside', 'left', 'center', 'right', 'rightOutside']
@@ -99,45 +111,85 @@ def getAxisScales(operator):
     return scales
 
 
+def applyNavigatorOffsets(operator, location, directions, horizontal, vertical, nudge=None, allowAnisotropy=False, allowExtrapolation=True):
+    # Shared
+    # move the location by the navigator offsets, along the axes that
+    # follow the horizontal or the vertical direction.
+    # directions: {axisName: "horizontal" | "vertical" | "ignore"}
+    # Returns the new location.
+    unit = {}
+    for name, direction in directions.items():
+        if direction == "horizontal":
+            if nudge:
+                # nudges come from arrow keys in the navigator tool
+                # so, a single unit along the axis
+                unit[name] = nudge[0]
+            else:
+                unit[name] = horizontal
+        elif direction == "vertical":
+            if nudge:
+                unit[name] = nudge[1]
+            else:
+                unit[name] = vertical
+        # and for ignore we don't pass anything
+    axisScales = getAxisScales(operator)
+    location = dict(location)
+    for axisName, offset in unit.items():
+        if axisName not in location:
+            continue
+        if isinstance(offset, tuple):
+            offsetx, offsety = offset
+        else:
+            offsetx = offsety = offset
+        value = location[axisName]
+        if isinstance(value, tuple):
+            valuex, valuey = value
+        else:
+            valuex = valuey = value
+        if nudge:
+            valuex += offsetx
+            valuey += offsety
+        else:
+            # @@ how to  handle anisotropy here?
+            valuex += (offsetx/1000) * axisScales[axisName]/25 # slightly less subjective
+            valuey += (offsety/1000) * axisScales[axisName]/25 # slightly less subjective
+            # Explanation: the 1000 is a value that relates to the screen and the number
+            # of pixels we want to move in order to travel along the whole axis.
+            # The axisScales[axisName] value is the span of the min axis / max axis value.
+        if allowAnisotropy:
+            location[axisName] = (valuex, valuey)
+        else:
+            location[axisName] = valuex
+    # check for clipping here
+    if not allowExtrapolation:
+        # AttributeError: 'NoneType' object has no attribute 'map_forward'
+        try:
+            location = operator.clipDesignLocation(location)
+        except AttributeError:
+            pass
+    return location
+
+
+def shiftStats(stats, shift):
+    # the preview stats for an outline moved by shift:
+    # the left margin grows, the right margin shrinks, the rest stays.
+    if not shift:
+        return stats
+    shifted = Location(**stats)
+    shifted['leftMargin'] = stats['leftMargin'] + shift
+    shifted['rightMargin'] = stats['rightMargin'] - shift
+    return shifted
+
+
 def glyphEditorIsInZoom():
     # detect if we're zooming at the moment
     tool = getActiveEventTool()
     return bool(tool._zooming)
 
-# kink analysis
-def pt(*p):
-    return [(q.x, q.y) for q in p]
+def callOnMainThread(callback, *args):
+    # background jobs report here, the UI wants the main thread
+    AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(lambda: callback(*args))
 
-def dotProduct(v1, v2):
-    return sum(x*y for x, y in zip(v1, v2))
-    
-def norm(v):
-    l = math.sqrt(v[0]**2+v[1]**2)
-    return v[0]/l, v[1]/l
-
-def findKinks(glyph, res=3):
-    results = []
-    contours = glyph.contours
-    for ci, c in enumerate(contours):
-        points = c.points
-        lp = len(points)
-        for pi, pt2 in enumerate(points):
-            if not pt2.smooth: continue
-            pt1 = points[pi-1]
-            pt3 = points[(pi+1)%lp]
-            if pt3.type == "offcurve" or pt1.type == "offcurve":
-                p1, p2, p3 = pt(pt1, pt2, pt3) #unpack them from RF points
-                # v1 is p1 / p2
-                # v2 is p2 / p3 ?
-                # endpoint - startpoint
-                v1 = norm((p2[0]-p1[0], p2[1]-p1[1]))
-                v2 = norm((p3[0]-p2[0], p3[1]-p2[1]))
-                dp = round(dotProduct(v1, v2), res)
-                if dp < 1:
-                    results.append((ci, p1, p2, p3, (1-dp)*100))
-    return results
-    
-    
 class LongboardNavigatorTool(BaseEventTool):
     def setup(self):
         pass
@@ -179,18 +231,87 @@ class CollectorPen(BasePen):
     def _closePath(self):
         pass
         
-def getLocationsForFont(font, doc):
-    # theoretically, a single UFO can be a source in different discrete locations
-    discreteLocations = []
-    continuousLocations = []
-    for s in doc.sources:
-        if s.path == font.path:
-            cl, dl = doc.splitLocation(s.location)
+class DesignspaceIndex:
+    # Shared
+    # Which open designspaces use which font, by font path.
+    # Rebuilt when a designspace opens or closes, or when its sources change,
+    # so finding the designspace for a glyph editor is a dictionary lookup.
+    def __init__(self):
+        self.operatorsForPath = None
+        self.relevantOperators = weakref.WeakKeyDictionary()    # editor: the operator it uses
+    
+    def invalidate(self):
+        self.operatorsForPath = None
+        self.relevantOperators = weakref.WeakKeyDictionary()
+    
+    def build(self):
+        self.operatorsForPath = {}
+        for operator in AllDesignspaces():
+            for source in operator.sources:
+                if source.path is None:
+                    continue
+                operators = self.operatorsForPath.setdefault(source.path, [])
+                if operator not in operators:
+                    operators.append(operator)
+    
+    def getOperators(self, font):
+        if font is None:
+            return []
+        if font.path is None:
+            # an unsaved font is not in the index, ask around
+            return AllDesignspaces(usingFont=font)
+        if self.operatorsForPath is None:
+            self.build()
+        return self.operatorsForPath.get(font.path, [])
+    
+    def setRelevantOperator(self, editor, operator):
+        # return True if this is a different operator than last time, for this editor
+        changed = operator is not self.relevantOperators.get(editor)
+        self.relevantOperators[editor] = operator
+        return changed
+
+designspaceIndex = DesignspaceIndex()
+
+class SourceLocationIndex:
+    # Shared
+    # The split locations of the sources of an operator, by font path.
+    # Made once for each revision of the operator: operatorChanged drops it,
+    # and a different number of sources also means it is out of date.
+    # Used by the editors and by the UI, every frame, so this should be quick.
+    def __init__(self):
+        self.indexes = weakref.WeakKeyDictionary()
+    
+    def operatorChanged(self, operator):
+        self.indexes.pop(operator, None)
+    
+    def getIndex(self, operator):
+        index = self.indexes.get(operator)
+        if index is None or index['sourceCount'] != len(operator.sources):
+            index = self.buildIndex(operator)
+            self.indexes[operator] = index
+        return index
+    
+    def buildIndex(self, operator):
+        # theoretically, a single UFO can be a source in different discrete locations
+        locationsForPath = {}
+        for s in operator.sources:
+            continuousLocations, discreteLocations = locationsForPath.setdefault(s.path, ([], []))
+            cl, dl = operator.splitLocation(s.location)
             if dl is not None:
                 discreteLocations.append(dl)
             if cl is not None:
                 continuousLocations.append(cl)
-    return continuousLocations, discreteLocations
+        return dict(sourceCount=len(operator.sources), locationsForPath=locationsForPath)
+    
+    def getLocationsForFont(self, font, operator):
+        # the lists are shared, do not change them
+        return self.getIndex(operator)['locationsForPath'].get(font.path, ([], []))
+
+sourceLocations = SourceLocationIndex()
+
+def getLocationsForFont(font, doc):
+    # continuous and discrete locations of the sources that use this font
+    return sourceLocations.getLocationsForFont(font, doc)
 
 def copyPreviewToClipboard(operator, useVarlib=True, roundResult=True):
     # copy the text of the current preview to the clipboard
@@ -390,6 +511,7 @@ class LongBoardUIController(Subscriber, ezui.WindowController):
         self.wantsVarLib = False
         self.allowAnisotropy = False
         self.previewAlign = "center"
+        self.previewJob = None    # the Make Preview UFO in the background
             
     def enableActionButtons(self, state):
         # enable or disable the action buttons
@@ -530,16 +652,30 @@ class LongBoardUIController(Subscriber, ezui.WindowController):
             t.append(f"{name}_{location[name]:3.2f}")
         return "_".join(t)
     
+    @traced("designspaceEditorDidCloseDesignspace", "controller")
     def designspaceEditorDidCloseDesignspace(self, info):
+        designspaceIndex.invalidate()
+        if self.previewJob is not None:
+            self.previewJob.cancel()
         self.w.getItem("axesTable").set([])
         self.w.setTitle(extensionName)
         self.enableActionButtons(False)
     
+    @traced("designspaceEditorDidOpenDesignspace", "controller")
     def designspaceEditorDidOpenDesignspace(self, info):
+        designspaceIndex.invalidate()
         self.enableActionButtons(True)
+        # the kernels of the current glyph at every discrete location,
+        # so switching between upright and italic sources is quick.
+        glyph = CurrentGlyph()
+        if glyph is not None:
+            wantsVarLib = self.w.getItem("mathModelButton").get() == 1
+            for operator in designspaceIndex.getOperators(glyph.font):
+                kernelWarmup.warm(operator, glyph.name, useVarlib=wantsVarLib)
     
     def linksButtonCallback(self, sender):
         links = ["https://letterror.com", "https://superpolator.com", "https://github.com/sponsors/letterror"]
+        import webbrowser
         webbrowser.open(links[sender.get()])
 
     def makePreviewUFOCallback(self, sender):
@@ -550,6 +686,8 @@ class LongBoardUIController(Subscriber, ezui.WindowController):
             
         if self.operator is None: return
         if self.operator.path is None: return
+        if self.previewJob is not None and self.previewJob.running: return
+        from longboardInstance import PreviewInstanceJob
         self.operator.loadFonts()
         ufoNameMathTag = "MM"
         currentPreviewLocation = self.operator.getPreviewLocation()
@@ -573,28 +711,45 @@ class LongBoardUIController(Subscriber, ezui.WindowController):
         if not os.path.exists(previewFolder):
             os.makedirs(previewFolder)
         ufoPath = os.path.join(previewFolder, ufoName)
-        useVarlibState = self.operator.useVarlib
-        extrapolateState = self.operator.extrapolate
-        self.operator.useVarlib = False
-        self.operator.extrapolate = True
-        try:
-            font = self.operator.makeInstance(instanceDescriptor, decomposeComponents=False)
-        except:
+        # The job makes the glyphs with its own copy of the operator,
+        # with MutatorMath and extrapolation: on a pool of processes when
+        # the sources are saved, from a snapshot of the sources if not.
+        # RoboFont keeps going, the UFO opens when it is done.
+        note = f"Preview UFO generated by LongBoard, using MutatorMath, from designspace {operatorFileName} at coordinates {locationString}, on date {date}."
+        self.previewJob = PreviewInstanceJob(
+            self.operator,
+            instanceDescriptor,
+            ufoPath,
+            note=note,
+            progress=lambda count, total: callOnMainThread(self.previewUFOProgress, count, total),
+            done=lambda path, report: callOnMainThread(self.previewUFODone, path, report),
+            )
+        self.w.getItem("makePreviewUFO").enable(False)
+        self.previewJob.start()
+
+    def previewUFOProgress(self, count, total):
+        # LongBoardUIController
+        if self.previewJob is None: return
+        self.w.getItem("makePreviewUFO").setTitle(f"Making Preview UFO {round(100 * count / total)}%")
+
+    def previewUFODone(self, path, report):
+        # LongBoardUIController
+        self.previewJob = None
+        button = self.w.getItem("makePreviewUFO")
+        button.setTitle("Make Preview UFO")
+        button.enable(self.operator is not None)
+        if report["error"] is not None:
             self.showMessage("LongBoard can not make the preview UFO.", informativeText="I'm printing the traceback in the Output.")
             print(f"LongBoard reports: (A)")
-            print(traceback.format_exc())
+            print(report["error"])
             return
-        self.operator.useVarlib = useVarlibState
-        self.operator.extrapolate = extrapolateState
-        
-        if self.operator.useVarlib:
-            model = "VarLib"
-        else:
-            model = "MutatorMath"
-        font.info.note = f"Preview UFO generated by LongBoard, using {model}, from designspace {operatorFileName} at coordinates {locationString}, on date {date}."
-        font.save(ufoPath)
-        font.close()
-        OpenFont(ufoPath, showInterface=True)
+        if report["cancelled"]:
+            print(f"LongBoard reports: preview UFO cancelled.")
+            return
+        if report["failed"]:
+            print(f"LongBoard reports: preview UFO could not interpolate {len(report['failed'])} glyphs: {' '.join(report['failed'])}")
+        print(f"LongBoard reports: preview UFO with {report['glyphs']} glyphs in {report['seconds']} seconds.")
+        OpenFont(path, showInterface=True)
 
     def alignPreviewButtonCallback(self, sender):
         postEvent(settingsChangedEventKey, settings=self.collectSettingsState())
@@ -723,15 +878,21 @@ class LongBoardUIController(Subscriber, ezui.WindowController):
         # store the settings as extension defaults
         setExtensionDefault(extensionDefaultKey, self.collectSettingsState(save=True))
         unregisterGlyphEditorSubscriber(LongboardEditorView)
+        if self.previewJob is not None:
+            self.previewJob.cancel()
+            self.previewJob = None
+        kernelWarmup.shutdown()
         if self._navigatorTool is not None:
             uninstallTool(self._navigatorTool)
         self._navigatorTool = None
     
+    @traced("glyphEditorDidSetGlyph", "controller")
     def glyphEditorDidSetGlyph(self, info):
         # LongBoardUIController
         # send the settings info to the subscriber
         postEvent(settingsChangedEventKey, settings=self.collectSettingsState())
         
+    @traced("navigatorLocationChanged", "controller")
     def navigatorLocationChanged(self, info):
         # LongBoardUIController
         # receive notifications about the navigator location changing.
@@ -744,71 +905,40 @@ class LongBoardUIController(Subscriber, ezui.WindowController):
         # or post the filter table when it changes
         # and handle everything in glypheditor?
         lastEvent = info["lowLevelEvents"][-1]
-        view = lastEvent.get('view')
-        offset = view.offset()
-        viewScale = view.scale()
-        popOptions = ['horizontal', 'vertical', None]
-        data = info["lowLevelEvents"][-1].get('data')
-        nav = data['horizontal'], data['vertical']
+        data = lastEvent.get('data')
+        traceRecorder.flowEnd("navigatorLocationChanged", data.get('traceID'))
         nudge = data.get('nudge', None)
-
-        unit = {}
-        for axis in self.w.getItem("axesTable").get():
-            name = axis['textValue']
-            if axis['popUpValue'] == 0:     # horizontal
-                if nudge:
-                    # nudges come from arrow keys in the navigator tool
-                    # so, a single unit along the axis
-                    unit[name] = nudge[0]
-                else:
-                    unit[name] = data['horizontal']
-            elif axis['popUpValue'] == 1:     # vertical
-                if nudge:
-                    unit[name] = nudge[1]
-                else:
-                    unit[name] = data['vertical']
-            # and for ignore we don't pass anything
-        axisScales = getAxisScales(self.operator)
-        # @@_mouse_drag_updating_data
         editorObject = data['editor']
-        extreme = []
-        for axisName, offset in unit.items():
-            #print("--->", self.allowAnisotropy, axisName, offset)
-            if axisName in editorObject.previewLocation_dragging:
-                data = editorObject.previewLocation_dragging[axisName]
-                if isinstance(offset, tuple):
-                    offsetx, offsety = offset
-                else:
-                    offsetx = offsety = offset
-                if isinstance(data, tuple):                
-                    valuex, valuey = editorObject.previewLocation_dragging[axisName]
-                else:
-                    valuex = valuey = editorObject.previewLocation_dragging[axisName]
-                if nudge:
-                    valuex += offsetx
-                    valuey += offsety
-                else:
-                    # @@ how to  handle anisotropy here?
-                    valuex += (offsetx/1000) * axisScales[axisName]/25 # slightly less subjective
-                    valuey += (offsety/1000) * axisScales[axisName]/25 # slightly less subjective
-                    # Explanation: the 1000 is a value that relates to the screen and the number
-                    # of pixels we want to move in order to travel along the whole axis.
-                    # The axisScales[axisName] value is the span of the min axis / max axis value.
-                if self.allowAnisotropy:
-                    value = (valuex, valuey)
-                else:
-                    value = valuex
-                editorObject.previewLocation_dragging[axisName] = value
-        # check for clipping here
-        if self.w.getItem("allowExtrapolation").get() == 0:
-            # AttributeError: 'NoneType' object has no attribute 'map_forward'
-            try:
-                clipped = self.operator.clipDesignLocation(editorObject.previewLocation_dragging)
-            except AttributeError:
-                clipped = editorObject.previewLocation_dragging
-            editorObject.previewLocation_dragging = clipped
-        # update the instance outline, but not a rebuild, just move the points
-        editorObject.updateInstanceOutline(rebuild=False)
+        try:
+            view = lastEvent.get('view')
+            offset = view.offset()
+            viewScale = view.scale()
+            # a replayed drag brings the directions and settings it was recorded with
+            directions = data.get('directions')
+            if directions is None:
+                directions = {}
+                for axis in self.w.getItem("axesTable").get():
+                    directions[axis['textValue']] = ['horizontal', 'vertical', 'ignore'][axis['popUpValue']]
+            allowAnisotropy = data.get('allowAnisotropy', self.allowAnisotropy)
+            allowExtrapolation = data.get('allowExtrapolation', self.w.getItem("allowExtrapolation").get() == 1)
+            # @@_mouse_drag_updating_data
+            editorObject.previewLocation_dragging = applyNavigatorOffsets(
+                self.operator,
+                editorObject.previewLocation_dragging,
+                directions,
+                data['horizontal'],
+                data['vertical'],
+                nudge=nudge,
+                allowAnisotropy=allowAnisotropy,
+                allowExtrapolation=allowExtrapolation,
+                )
+            # update the instance outline, but not a rebuild, just move the points
+            editorObject.updateInstanceOutline(rebuild=False)
+        finally:
+            if not nudge:
+                # let the editor know it can send the next drag,
+                # also when something above went wrong
+                editorObject.dragScheduler.frameDone()
     
     def getOperatorFileName(self, operator):
         if operator.path is None:
@@ -817,20 +947,66 @@ class LongBoardUIController(Subscriber, ezui.WindowController):
         fileName = os.path.splitext(fileName)[0]
         return fileName
 
+    def getTraceArgs(self):
+        # LongBoardUIController
+        # the arguments for the trace events of the traced methods
+        if self.operator is None:
+            return dict(designspace=None)
+        return dict(designspace=self.getOperatorFileName(self.operator), location=self.operator.getPreviewLocation())
+
+    @traced("relevantOperatorChanged", "controller")
     def relevantOperatorChanged(self, info):
         # LongBoardUIController
         # @@ from https://robofont.com/documentation/reference/api/mojo/mojo-subscriber/#mojo.subscriber.registerSubscriberEvent
         self.operator = info["lowLevelEvents"][0].get('operator')
+        traceRecorder.flowEnd("relevantOperatorChanged", info["lowLevelEvents"][0].get('traceID'))
         operatorFileName = self.getOperatorFileName(self.operator)
         glyph = info["lowLevelEvents"][0].get('glyph')
         if self.operator is None:
             self.showMessage("No designspace?", informativeText=f'Open a designspace in DesignspaceEdit', alertStyle='informational', )
             self.enableActionButtons(False)
             return
+        # the editors and the UI share the source locations,
+        # start with a fresh index for this operator.
+        sourceLocations.operatorChanged(self.operator)
         glyphName = None
         if glyph is not None:
             self.enableActionButtons(True)
             glyphName = glyph.name
+        #collect interesting locations here
+        currentIndex = 0
+        itemIndex = 0
+        interestingLocations = [(None, f"Interesting Locations in {operatorFileName}…")]
+        itemIndex += 1
+        # add source and instance locations, the batch previews use the same list
+        from longboardBatch import collectInterestingLocations
+        markers = dict(source=locationListSourceMarker, instance=locationListInstanceMarker)
+        for location, kind, label in collectInterestingLocations(self.operator):
+            interestingLocations.append((location, f"{markers[kind]} {label}"))
+            itemIndex += 1
+        self.interestingLocations = interestingLocations
+        self.w.getItem("interestingLocationsPopup").setItems([b for a, b in interestingLocations])
+        self.refreshLocationViews(glyphName)
+
+    def relevantPreviewChanged(self, info):
+        # LongBoardUIController
+        # the glyph editor has a new preview location or glyph for the same operator,
+        # only the values in the axes table and the selected location change.
+        operator = info["lowLevelEvents"][-1].get('operator')
+        if operator is not self.operator:
+            # we missed the operator change
+            self.relevantOperatorChanged(info)
+            return
+        if self.operator is None:
+            return
+        glyph = info["lowLevelEvents"][-1].get('glyph')
+        self.refreshLocationViews(glyph.name if glyph is not None else None)
+
+    def refreshLocationViews(self, glyphName=None):
+        # LongBoardUIController
+        # the axes table, the interesting locations selection and the title
+        # for the current preview location. Cheap, no operator rebuild.
+        operatorFileName = self.getOperatorFileName(self.operator)
         currentLocation = self.operator.getPreviewLocation()
         if not currentLocation:
             # the operator can return an empty location.
@@ -893,30 +1069,7 @@ class LongBoardUIController(Subscriber, ezui.WindowController):
             self.operator.lib[interactionSourcesLibKey] = prefs
             self.operator.changed()
         self.w.getItem("axesTable").set(items)
-        #collect interesting locations here
-        currentIndex = 0
-        itemIndex = 0
-        interestingLocations = [(None, f"Interesting Locations in {operatorFileName}…")]
-        itemIndex += 1
-        # add source locations
-        for src in self.operator.sources:
-            if src.location is not None:
-                if src.layerName is not None:
-                    layerName = f", layer {src.layerName}"
-                else:
-                    layerName = ""
-                interestingLocations.append((src.location, f"{locationListSourceMarker} {os.path.basename(src.path)}{layerName}"))
-            itemIndex += 1
-        # add instance locations
-        for instance in self.operator.instances:
-            dsloc = instance.getFullDesignLocation(self.operator) # converted
-            dsLoc, dsLocDiscrete = self.operator.splitLocation(dsloc)
-            if dsloc is not None:
-                interestingLocations.append((dsloc, f'{locationListInstanceMarker} Instance {instance.familyName} {instance.styleName}'))
-            itemIndex += 1
-        self.interestingLocations = interestingLocations
-        self.w.getItem("interestingLocationsPopup").setItems([b for a, b in interestingLocations])
-        for itemIndex, item in enumerate(interestingLocations):
+        for itemIndex, item in enumerate(self.interestingLocations):
             itemLocation, itemLabel = item
             if currentLocation == itemLocation:
                 self.w.getItem("interestingLocationsPopup").set(itemIndex)
@@ -1021,6 +1174,32 @@ class LongboardEditorView(Subscriber):
     longBoardHazeFactor = 0.5    # check this is the same as the default slider setting
     italicSlantOffsetKey = 'com.typemytype.robofont.italicSlantOffset'
     _eventKeyCodes = {126:'up', 123:'left', 125:'down', 124:'right'}
+    recordingsFolderName = "recordings"
+    usePrefetch = True
+    profilesFolderName = "profiles"
+    profileTopCount = 40
+    tracesFolderName = "traces"
+    kinksFolderName = "kinks"    # where longboardKinkScan.py puts the reports
+    # the settings each part of the drawing depends on.
+    # showSettingsChanged compares the settings with the previous ones
+    # and only updates the parts that depend on a changed setting.
+    #   colors: recolor the layers, nothing is interpolated
+    #   sources: the source outlines
+    #   kinks: the kink layer, with the preview outline we have
+    #   instance: the preview outline and everything drawn with it
+    #   prefetch: the prefetched outlines
+    # settings that are not listed here, the closed boxes in the window, change nothing.
+    settingsDependencies = dict(
+        colors=("hazeSlider",),
+        sources=("showSources", "alignPreview"),
+        kinks=("showKinks",),
+        instance=(
+            "showVectors", "showSelection", "showMeasurements", "showStats", "showRounded",
+            "wantsVarLib", "allowAnisotropy", "alignPreview", "alignStats",
+            "_discreteAxisNames", "_continuousAxisNames", "_dragDirections",
+            ),
+        prefetch=("wantsVarLib", "allowExtrapolation", "allowAnisotropy", "_dragDirections"),
+        )
 
     def setColors(self, active=False):
         # dark mode / light mode
@@ -1084,6 +1263,7 @@ class LongboardEditorView(Subscriber):
         self.operator = None
         self.currentOperator = None
         self.currentPreviewGlyph = None
+        self.currentPreviewOutline = None
         self.allowExtrapolation = False    # should we show extrapolation
         self.allowAnisotropy = False    # should we show anisotropy
         self.extrapolating = False    # but are we extrapolating?
@@ -1096,7 +1276,8 @@ class LongboardEditorView(Subscriber):
         self.wantsVarLib = False
         self.showSources = False
         self.sourcePens = []
-        self.sourceGlyphs = []
+        self.sourceOutlines = []
+        self.sourceShifts = []
         #self.centerAllGlyphs = True
         self.centerFactor = 0    # -1: left, 0: center, 1: right
         self.showMeasurements = True
@@ -1115,6 +1296,23 @@ class LongboardEditorView(Subscriber):
         self.lastMeasurementRatio = None    # last calculated ratio from the measurements
         self.lastMeasurementStats = {}        # all the stats collection, maybe for copy,
         self._lastEventTime = None
+        self._dragViewScale = 1
+        self.dragScheduler = DragScheduler()    # merges the drags into frames
+        self._dragFlushScheduled = False    # a timer will send the drags that were held back
+        self._replay = None    # the steps still to replay, and the settings of the recording
+        self.frameTimer = FrameTimer()    # how long the stages of the last update took
+        self.dragRecorder = DragRecorder()    # keeps the drags when asked
+        self.showTiming = False    # add the stage timing to the stats text
+        self.dragProfiler = DragProfiler()    # cProfile for the next drag, when asked
+        self.prefetcher = PreviewPrefetcher()    # outlines for the predicted locations
+        self._lastDragVelocity = None    # the offsets of the last mouse drag
+        self._previousDragVelocity = None
+        self._prefetching = False
+        self._prefetchOperator = None    # the copy of the operator for the prefetch thread
+        self._dragAxisScales = {}
+        self._dragDirections = {}
+        self._kinkReportPositions = {}    # (report path, glyph name): the last kink shown
+        self.frameTimer.trace = traceRecorder    # the stages go in the trace too
         self.previewLocation_dragging = None    # local editing copy of the DSE2 preview location
         self._bar = "-" * 22
         self._dots = len(self._bar)*"."
@@ -1124,6 +1322,8 @@ class LongboardEditorView(Subscriber):
         self.discreteAxisNames = []
         self.continuousAxisNames = []
         self.dragDirections = {}
+        self._lastSettings = None    # the settings of the previous showSettingsChanged
+        self._lastSettingsDarkMode = None
 
 
         glyphEditor = self.getGlyphEditor()
@@ -1188,28 +1388,96 @@ class LongboardEditorView(Subscriber):
         )
         #self.sourcesMarkerLayer = self.editorContainer.appendBaseSublayer()
         
-        self.instanceMarkerLayer = self.editorContainer.appendBaseSublayer()
+        # all the point markers of the instance in one path
+        self.instanceMarkerLayer = self.editorContainer.appendPathSublayer(
+            strokeColor=self.instanceStrokeColor,
+            strokeWidth=self.instanceMarkerSize,
+            fillColor = None,
+            strokeCap="round",
+        )
         self.measurementsIntersectionsLayer = self.measurementContainer.appendBaseSublayer()
         self.measurementMarkerLayer = self.measurementContainer.appendBaseSublayer()
         self.measurementTextLayer = self.measurementContainer.appendBaseSublayer()
         self.selectionTextLayer = self.selectionContainer.appendBaseSublayer()
 
+        # the markers and labels are kept between frames,
+        # only moved, added or hidden.
+        self.selectionMarkerPool = SublayerPool(self.selectionLayer, self.makeSelectionMarkerLayer)
+        self.selectionTextPool = SublayerPool(self.selectionTextLayer, self.makeSelectionTextLayer)
+        self.measurementJumperPool = SublayerPool(self.measurementsIntersectionsLayer, self.makeMeasurementJumperLayer)
+        self.measurementMarkerPool = SublayerPool(self.measurementMarkerLayer, self.makeMeasurementMarkerLayer)
+        self.measurementTextPool = SublayerPool(self.measurementTextLayer, self.makeMeasurementTextLayer)
+        self.markerPools = [
+            self.selectionMarkerPool,
+            self.selectionTextPool,
+            self.measurementJumperPool,
+            self.measurementMarkerPool,
+            self.measurementTextPool,
+            ]
+
+    def makeSelectionMarkerLayer(self, container, key):
+        return container.appendSymbolSublayer(
+            imageSettings = dict(
+                name="oval",
+                size=(self.selectionMarkerSize, self.selectionMarkerSize),
+                fillColor=self.selectionFillColor
+                ),
+            )
+
+    def makeSelectionTextLayer(self, container, key):
+        return container.appendTextLineSublayer(
+            pointSize=9,
+            fillColor=self.selectionFillColor,
+            horizontalAlignment="center",
+            )
+
+    def makeMeasurementJumperLayer(self, container, key):
+        return container.appendPathSublayer(
+            strokeWidth=self.measurementStrokeWidth,
+            strokeColor=self.measurementStrokeColor,
+            strokeDash = self.measurementStrokeDash,
+            fillColor=None,
+            )
+
+    def makeMeasurementMarkerLayer(self, container, key):
+        return container.appendSymbolSublayer(
+            imageSettings = dict(
+                name="oval",
+                size=(self.measurementMarkerSize, self.measurementMarkerSize),
+                fillColor=self.measurementFillColor
+                ),
+            )
+
+    def makeMeasurementTextLayer(self, container, key):
+        return container.appendTextLineSublayer(
+            pointSize=11,
+            fillColor=self.measurementFillColor,
+            horizontalAlignment="center",
+            )
+
     def shouldShowSelection(self, *something):
         # this work?
         return True
         
+    @traced("glyphEditorWillShowPreview", "editor")
     def glyphEditorWillShowPreview(self, info):
         self.preparePreview = True
         self.updateInstanceOutline()
     
+    @traced("glyphEditorWillHidePreview", "editor")
     def glyphEditorWillHidePreview(self, info):
         self.preparePreview = False
         self.updateInstanceOutline()
         
+    @traced("glyphEditorDidMouseDown", "editor")
     def glyphEditorDidMouseDown(self, info):
         # LongboardEditorView
         # starting drag
         if info["lowLevelEvents"][-1]["tool"].__class__.__name__ != "LongboardNavigatorTool": return
+        # a real drag stops the replay
+        self.stopReplay()
+        # profile this drag if asked
+        self.dragProfiler.begin()
         self.dragging = True
         self.startInstanceStats = None
         self.setColors(active=True)
@@ -1218,21 +1486,32 @@ class LongboardEditorView(Subscriber):
         # then update the local copy while we're dragging
         self.previewLocation_dragging = self.operator.getPreviewLocation()
         self._lastEventTime = None
+        self.dragScheduler.reset()
+        self.startPrefetch()
+        self.dragRecorder.mouseDown(self.operator.path, self.getGlyphEditor().getGlyph().name, self.previewLocation_dragging)
         self.updateSourcesOutlines(rebuild=True)
         self.updateInstanceOutline(rebuild=True)
     
+    @traced("glyphEditorDidMouseUp", "editor")
     def glyphEditorDidMouseUp(self, info):
         # LongboardEditorView
         # ending drag
         if info["lowLevelEvents"][-1]["tool"].__class__.__name__ != "LongboardNavigatorTool": return
+        if self.operator is not None and self.dragScheduler.hasPending():
+            # the last drags that did not make it into a frame
+            self.publishDrag()
         self.dragging = False
         self.setColors(active=False)
         self.navigatorToolPosition = None
         self._lastEventTime = None
+        self.stopPrefetch()
         if self.operator is not None:
+            self.dragRecorder.mouseUp(self.previewLocation_dragging)
             self.updateInstanceOutline()
             self.operator.setPreviewLocation(self.previewLocation_dragging)
+        self.saveDragProfile(self.dragProfiler.end())
         
+    @traced("glyphEditorDidMouseDrag", "editor")
     def glyphEditorDidMouseDrag(self, info):
         # LongboardEditorView
         # get the mouse drag from the navigator tool
@@ -1286,15 +1565,79 @@ class LongboardEditorView(Subscriber):
             # so this is *not* related to a vertical move in the drag.
             dx = (0, dx)
             dy = (0, dy)
-            
+        
+        # the scheduler adds up the drags and decides
+        # if there is time for a new frame.
+        self._dragViewScale = viewScale
+        self.dragRecorder.drag(t, self.navigatorToolProgress, viewScale, info.get("deviceState"), dx, dy)
+        self._previousDragVelocity = self._lastDragVelocity
+        self._lastDragVelocity = dx, dy
+        if self.dragScheduler.addDrag(dx, dy):
+            self.publishDrag()
+        else:
+            # if the mouse stops here, this drag still needs a frame
+            self.scheduleDragFlush()
+
+    def scheduleDragFlush(self):
+        # LongboardEditorView
+        if self._dragFlushScheduled:
+            return
+        self._dragFlushScheduled = True
+        callLater(self.dragScheduler.getFrameDelay(), self.flushDrag)
+
+    def flushDrag(self):
+        # LongboardEditorView
+        # the timer from scheduleDragFlush: send the drags that were held back
+        self._dragFlushScheduled = False
+        if not self.dragging or self.operator is None or not self.dragScheduler.hasPending():
+            return
+        if self.dragScheduler.isReady():
+            self.publishDrag()
+        else:
+            self.scheduleDragFlush()
+    
+    def startPrefetch(self):
+        # LongboardEditorView
+        # a new drag, nothing is predicted yet
+        self.prefetcher.clear()
+        self.releasePrefetchOperator()
+        self._lastDragVelocity = None
+        self._previousDragVelocity = None
+        self._prefetching = False
+        self._dragAxisScales = getAxisScales(self.operator)
+        self._dragDirections = dict(self.dragDirections)
+
+    def stopPrefetch(self):
+        # LongboardEditorView
+        self.prefetcher.clear()
+        self.releasePrefetchOperator()
+        self._lastDragVelocity = None
+        self._previousDragVelocity = None
+        self._prefetching = False
+
+    def releasePrefetchOperator(self):
+        # LongboardEditorView
+        # the copy of the operator for this drag leaves the ufoProcessor cache,
+        # on the prefetch thread, after the computations that still use it.
+        if self._prefetchOperator is not None:
+            self.prefetcher.release(self._prefetchOperator.changed)
+            self._prefetchOperator = None
+
+    def publishDrag(self):
+        # LongboardEditorView
+        # send all the drags collected since the last frame
+        # to the UI as a single location change.
+        dx, dy = self.dragScheduler.take()
+        self.dragRecorder.frame(dx, dy)
         data = {
                 'editor': self, 
                 'previewLocation': self.previewLocation_dragging,
                 'horizontal': dx,
                 'vertical': dy,
-                'viewScale': viewScale,
+                'viewScale': self._dragViewScale,
                 }
         
+        data['traceID'] = traceRecorder.flowStart("navigatorLocationChanged")
         publishEvent(navigatorLocationChangedEventKey, data=data)
     
     def glyphEditorWantsContextualMenuItems(self, info):
@@ -1302,6 +1645,22 @@ class LongboardEditorView(Subscriber):
         # Put all the items in a Longboard > submemu
         # https://robofont.com/documentation/how-tos/subscriber/custom-font-overview-contextual-menu/
 
+        if self.dragRecorder.recording:
+            recordMenuTitle = f"Stop recording drags"
+        else:
+            recordMenuTitle = f"Record drags"
+        if self.showTiming:
+            timingMenuTitle = f"Hide timing in stats"
+        else:
+            timingMenuTitle = f"Show timing in stats"
+        if self.dragProfiler.armed:
+            profileMenuTitle = f"Cancel profile of next drag"
+        else:
+            profileMenuTitle = f"Profile next drag"
+        if traceRecorder.enabled:
+            traceMenuTitle = f"Stop trace"
+        else:
+            traceMenuTitle = f"Start trace"
         myMenuItems = [
             (extensionName,
                 [
@@ -1309,8 +1668,15 @@ class LongboardEditorView(Subscriber):
                     (f"Copy rounded preview", self.copyRoundedPreviewMenuCallback),
                     (f"Guideline through selection", self.guideThroughSelectionMenuCallback),
                     (f"Copy stats", self.copyStatsInfoTextMenuCallback),
+                    (f"Copy timing", self.copyTimingMenuCallback),
+                    (timingMenuTitle, self.showTimingMenuCallback),
+                    (traceMenuTitle, self.traceMenuCallback),
                     "----",
                     (f"Clear operator cache", self.clearOperatorCacheMenuCallback),
+                    (profileMenuTitle, self.profileDragMenuCallback),
+                    (recordMenuTitle, self.recordDragsMenuCallback),
+                    (f"Replay last drag recording", self.replayDragsMenuCallback),
+                    (f"Show next kink from report", self.nextKinkMenuCallback),
                     (f"Show random location", self.randomLocationMenuCallback),            #("submenu", [("option 3", self.option3Callback)])    # keep for later
                 ],
             )
@@ -1325,7 +1691,7 @@ class LongboardEditorView(Subscriber):
         #    as they are in the preview
         #    and remove any existing guides with the same name
 
-        if self.currentPreviewGlyph is None:
+        if self.currentPreviewOutline is None:
             return
 
         editorGlyph = self.getGlyphEditor().getGlyph()
@@ -1337,8 +1703,8 @@ class LongboardEditorView(Subscriber):
             for pi, p in enumerate(c.points):
                 if p.selected:
                     #selection.append((ci, pi))
-                    previewPoint = self.currentPreviewGlyph.contours[ci].points[pi]
-                    selectedPoints.append((ci, pi, previewPoint.x, previewPoint.y))
+                    previewX, previewY = self.currentPreviewOutline.getPoint(ci, pi)
+                    selectedPoints.append((ci, pi, previewX, previewY))
         if len(selectedPoints)==2:
             p0 = selectedPoints[0]
             p1 = selectedPoints[1]
@@ -1375,10 +1741,42 @@ class LongboardEditorView(Subscriber):
         self.operator.setPreviewLocation(randomLocation)
         self.operator.changed()
     
+    def nextKinkMenuCallback(self, sender):
+        # callback for the glypheditor contextual menu
+        # move the preview to the next kink for this glyph
+        # in the newest report of longboardKinkScan.py, worst first.
+        if self.operator is None or self.operator.path is None:
+            return
+        from longboardKinkScan import readKinkReport, findKinkReports, getGlyphKinks
+        reports = findKinkReports(os.path.join(os.path.dirname(self.operator.path), self.kinksFolderName))
+        if not reports:
+            print(f"LongBoard reports: no kink reports for this designspace, run longboardKinkScan.py first.")
+            return
+        glyphName = self.getGlyphEditor().getGlyph().name
+        kinks = getGlyphKinks(readKinkReport(reports[-1]), glyphName)
+        if not kinks:
+            print(f"LongBoard reports: no kinks in {glyphName} in {os.path.basename(reports[-1])}")
+            return
+        key = reports[-1], glyphName
+        position = (self._kinkReportPositions.get(key, -1) + 1) % len(kinks)
+        self._kinkReportPositions[key] = position
+        kink = kinks[position]
+        print(f"LongBoard reports: kink {position + 1} of {len(kinks)} in {glyphName}, contour {kink['contour']}, severity {kink['severity']:3.2f} at {kink['point']}, {kink['location']}")
+        location = self.operator.getPreviewLocation()
+        location.update(kink["location"])
+        self.operator.setPreviewLocation(location)
+        self.operator.changed()
+
     def clearOperatorCacheMenuCallback(self, sender):
         # callback for the glypheditor contextual menu
         # call changed on the operator, this should clear the cache
         self.operator.changed()
+        interpolationKernels.operatorChanged(self.operator)
+        sourceOutlines.operatorChanged(self.operator)
+        sourceLocations.operatorChanged(self.operator)
+        previewOutlines.operatorChanged(self.operator)
+        previewService.operatorChanged(self.operator)
+        self.prefetcher.clear()
         self.updateInstanceOutline(rebuild=True)
     
     def copyStatsInfoTextMenuCallback(self, sender):
@@ -1390,8 +1788,227 @@ class LongboardEditorView(Subscriber):
         t = []
         for key, value in self.lastMeasurementStats.items():
             t.append(f"{key}\t{value}")
+        # how did the last drag keep up
+        for key, value in self.dragScheduler.getCounters().items():
+            t.append(f"{key}\t{value}")
+        # and how often the prefetch had the outline ready
+        for key, value in self.prefetcher.getCounters().items():
+            t.append(f"prefetch {key}\t{value}")
+        # and how often a location was visited before
+        for key, value in previewOutlines.getCounters().items():
+            t.append(f"preview cache {key}\t{value}")
+        # and how often another editor had made it already
+        for key, value in previewService.getCounters().items():
+            t.append(f"preview service {key}\t{value}")
         self._toPasteBoard("\n".join(t))
         #@@ 
+
+    def copyTimingMenuCallback(self, sender):
+        # callback for the glypheditor contextual menu
+        # copy the rolling stage timing to clipboard
+        lines = self.frameTimer.formatRollingStats()
+        if not lines:
+            return
+        self._toPasteBoard("\n".join(lines))
+
+    def showTimingMenuCallback(self, sender):
+        # callback for the glypheditor contextual menu
+        self.showTiming = not self.showTiming
+        self.updateInstanceOutline(rebuild=False)
+
+    def profileDragMenuCallback(self, sender):
+        # callback for the glypheditor contextual menu
+        # profile the next drag, from mouse down to mouse up
+        if self.dragProfiler.armed:
+            self.dragProfiler.disarm()
+        else:
+            self.dragProfiler.arm()
+
+    def saveDragProfile(self, profile):
+        # write the profile of a drag in a folder next to the designspace
+        if profile is None:
+            return
+        if self.operator is None or self.operator.path is None:
+            print(f"LongBoard reports: the drag profile is not saved, the designspace has no path.")
+            return
+        glyphName = self.getGlyphEditor().getGlyph().name
+        basePath = makeProfilePath(self.operator.path, self.profilesFolderName, glyphName)
+        statsPath, textPath = writeProfile(profile, basePath, top=self.profileTopCount)
+        print(f"LongBoard reports: drag profile saved to {statsPath}\n{textPath}")
+
+    def traceMenuCallback(self, sender):
+        # callback for the glypheditor contextual menu
+        # start the trace, or stop and save the trace
+        if not traceRecorder.enabled:
+            traceRecorder.start()
+            return
+        trace = traceRecorder.stop()
+        if trace is None:
+            return
+        if self.operator is None or self.operator.path is None:
+            print(f"LongBoard reports: the trace is not saved, the designspace has no path.")
+            return
+        path = makeTracePath(self.operator.path, self.tracesFolderName)
+        writeTrace(path, trace)
+        print(f"LongBoard reports: trace saved to {path}, open it in https://ui.perfetto.dev or chrome://tracing")
+
+    def getTraceArgs(self):
+        # LongboardEditorView
+        # the arguments for the trace events of the traced methods
+        glyphName = None
+        glyphEditor = self.getGlyphEditor()
+        if glyphEditor is not None and glyphEditor.getGlyph() is not None:
+            glyphName = glyphEditor.getGlyph().name
+        return dict(glyph=glyphName, location=self.previewLocation_dragging, dragging=self.dragging)
+
+    def getTimingText(self):
+        # the rolling stage timing for the stats text
+        stats = self.frameTimer.getRollingStats()
+        if not stats:
+            return ""
+        text = f"\n{'p50':>13} {'p95':>7} {'max':>7}  ms, {len(self.frameTimer.history)} frames"
+        for stageName, values in stats.items():
+            text += f"\n{values['p50']:>13.2f} {values['p95']:>7.2f} {values['max']:>7.2f}  {stageName}"
+        return text
+
+    def getRecordingsFolder(self):
+        # the drag recordings go in a folder next to the designspace
+        if self.operator is None or self.operator.path is None:
+            return None
+        return os.path.join(os.path.dirname(self.operator.path), self.recordingsFolderName)
+
+    def collectRecordingSettings(self):
+        # the settings that change what a drag does to the location
+        directions = {}
+        if self.operator is not None:
+            for axisName, interaction in self.operator.lib.get(interactionSourcesLibKey, []):
+                directions[axisName] = interaction
+        return dict(
+            directions=directions,
+            allowAnisotropy=self.allowAnisotropy,
+            allowExtrapolation=self.allowExtrapolation,
+            wantsVarLib=self.wantsVarLib,
+            showRounded=self.showRounded,
+            alignPreview=self.previewAlign,
+            )
+
+    def recordDragsMenuCallback(self, sender):
+        # callback for the glypheditor contextual menu
+        # start recording, or stop and save the recording
+        if not self.dragRecorder.recording:
+            self.dragRecorder.start(self.collectRecordingSettings())
+            return
+        recording = self.dragRecorder.stop()
+        if recording is None:
+            return
+        if self.operator is None or self.operator.path is None:
+            print(f"LongBoard reports: the drag recording is not saved, the designspace has no path.")
+            return
+        glyphName = self.getGlyphEditor().getGlyph().name
+        path = makeRecordingPath(self.operator.path, self.recordingsFolderName, glyphName)
+        writeRecording(path, recording)
+        print(f"LongBoard reports: drag recording saved to {path}")
+
+    def replayDragsMenuCallback(self, sender):
+        # callback for the glypheditor contextual menu
+        # replay the newest recording for this designspace
+        recordings = findRecordings(self.getRecordingsFolder())
+        if not recordings:
+            print(f"LongBoard reports: no drag recordings for this designspace.")
+            return
+        self.replayDragRecording(readRecording(recordings[-1]))
+
+    def replayDragRecording(self, recording):
+        # LongboardEditorView
+        # Replay the drags in this editor, with the glyph in this editor.
+        # The frames go through navigatorLocationChanged and updateInstanceOutline
+        # as they did while recording, one step per timer so the events
+        # of each step are handled before the next one. The preview
+        # location of the operator is not changed.
+        if self.operator is None or self._replay is not None:
+            return
+        glyphName = self.getGlyphEditor().getGlyph().name
+        mismatches = findRecordingMismatches(recording, self.operator.path, glyphName)
+        if mismatches:
+            print(f"LongBoard reports: the drag recording is not replayed, it was {', '.join(mismatches)}.")
+            return
+        settings = recording["header"].get("settings", {})
+        self._replay = list(iterReplaySteps(recording)), settings
+        callLater(0, self.replayNextStep)
+
+    def replayNextStep(self):
+        # LongboardEditorView
+        # the timer from replayDragRecording: one step, then wait for the next
+        if self._replay is None:
+            return
+        steps, settings = self._replay
+        if not steps or self.operator is None:
+            self.stopReplay()
+            return
+        step = steps.pop(0)
+        try:
+            self.replayStep(step, settings)
+        except Exception:
+            self.stopReplay()
+            raise
+        delay = 0
+        if step[0] in ("frame", "nudge"):
+            delay = self.dragScheduler.frameInterval
+        callLater(delay, self.replayNextStep)
+
+    def stopReplay(self):
+        # LongboardEditorView
+        # after the last step, or when the replay is interrupted
+        if self._replay is None:
+            return
+        self._replay = None
+        self.dragging = False
+        self.setColors(active=False)
+        self.stopPrefetch()
+        if self.operator is not None:
+            self.previewLocation_dragging = self.operator.getPreviewLocation()
+            self.updateInstanceOutline(rebuild=True)
+
+    def replayStep(self, step, settings):
+        # LongboardEditorView
+        # one step from longboardRecorder.iterReplaySteps
+        kind = step[0]
+        if kind == "down":
+            self.dragging = True
+            self.startInstanceStats = None
+            self.setColors(active=True)
+            self.previewLocation_dragging = dict(step[3])
+            self.dragScheduler.reset()
+            self.startPrefetch()
+            if 'directions' in settings:
+                self._dragDirections = dict(settings['directions'])
+            self.updateSourcesOutlines(rebuild=True)
+            self.updateInstanceOutline(rebuild=True)
+        elif kind == "drag":
+            # the mouse drag, as glyphEditorDidMouseDrag saw it
+            self._previousDragVelocity = self._lastDragVelocity
+            self._lastDragVelocity = step[1:3]
+        elif kind in ("frame", "nudge"):
+            horizontal, vertical = step[1:3]
+            data = {
+                    'editor': self, 
+                    'previewLocation': self.previewLocation_dragging,
+                    'horizontal': horizontal,
+                    'vertical': vertical,
+                    'viewScale': 1,
+                    }
+            if kind == "nudge":
+                data['nudge'] = (horizontal, vertical)
+            for key in ('directions', 'allowAnisotropy', 'allowExtrapolation'):
+                if key in settings:
+                    data[key] = settings[key]
+            data['traceID'] = traceRecorder.flowStart("navigatorLocationChanged")
+            publishEvent(navigatorLocationChangedEventKey, data=data)
+        elif kind == "up":
+            self.dragging = False
+            self.setColors(active=False)
+            self.stopPrefetch()
+            self.updateInstanceOutline()
         
     def _toPasteBoard(self, text):
         pb = AppKit.NSPasteboard.generalPasteboard()
@@ -1404,8 +2021,8 @@ class LongboardEditorView(Subscriber):
     def relevantForThisEditor(self, info=None):
         # LongboardEditorView
         # check if the current font belongs to the current designspace.
-        # this call is a bit costly.
-        # we can store which designspace object 
+        # designspaceIndex knows which designspaces use which fonts.
+        # only tell the UI about the operator when it is a different one.
         #    glyphEditorDidSetGlyph {'subscriberEventName': 'glyphEditorDidSetGlyph', 'lowLevelEvents': [{'view': <DoodleGlyphView: 0x7fa11b4f8c20>, 'glyph': <RGlyph 'O' ('foreground') at 140332211638384>, 'notificationName': 'viewDidChangeGlyph', 'tool': <lib.eventTools.editingTool.EditingTool object at 0x7fa1a0940fd0>}], 'iterations': [{'glyph': <RGlyph 'O' ('foreground') at 140332211638384>, 'glyphEditor': <lib.doodleGlyphWindow.DoodleGlyphWindow object at 0x7fa1a1f7a3d0>, 'locationInGlyph': None, 'deviceState': None, 'NSEvent': None}], 'glyph': <RGlyph 'O' ('foreground') at 140332211638384>, 'glyphEditor': <lib.doodleGlyphWindow.DoodleGlyphWindow object at 0x7fa1a1f7a3d0>, 'locationInGlyph': None, 'deviceState': None, 'NSEvent': None}
         font = None
         ds = None
@@ -1414,19 +2031,25 @@ class LongboardEditorView(Subscriber):
             glyphFromNotification = info.get('glyph')
             if glyphFromNotification is not None:
                 font = glyphFromNotification.font
-                allSpaces = AllDesignspaces(usingFont=font)
+                allSpaces = designspaceIndex.getOperators(font)
                 if len(allSpaces)>=1:
                     # assumption
                     self.operator = allSpaces[0]
-                    postEvent(operatorChangedEventKey, operator=self.operator)
+                    previewService.subscribe(self.operator, self)
+                    if designspaceIndex.setRelevantOperator(self, self.operator):
+                        postEvent(operatorChangedEventKey, operator=self.operator, traceID=traceRecorder.flowStart("relevantOperatorChanged"))
+                    else:
+                        # the same operator, the UI only needs the new values
+                        postEvent(previewChangedEventKey, operator=self.operator)
                     return True, font, allSpaces[0]
         # try to find it from the currentfont
         font = CurrentFont()
         if font.path == None:
             return False, font, None        
-        allSpaces = AllDesignspaces(usingFont=font)
+        allSpaces = designspaceIndex.getOperators(font)
         if len(allSpaces)>=1:
             self.operator = allSpaces[0]
+            previewService.subscribe(self.operator, self)
             return True, font, allSpaces[0]
         return False, font, None
     
@@ -1439,7 +2062,12 @@ class LongboardEditorView(Subscriber):
         self.selectionContainer.clearSublayers()
         self.selectionTextContainer.clearSublayers()
         self.currentOperator = None
+        self._replay = None
+        self.releasePrefetchOperator()
+        self.prefetcher.shutdown()
+        previewService.unsubscribe(self)
         
+    @traced("glyphEditorDidSetGlyph", "editor")
     def glyphEditorDidSetGlyph(self, info):
         # LongboardEditorView
         # when the glyph in the editor has changed
@@ -1468,6 +2096,8 @@ class LongboardEditorView(Subscriber):
             ds.setPreviewLocation(previewContinuous)
         self.updateSourcesOutlines(rebuild=True)
         self.updateInstanceOutline(rebuild=True)
+        # then the kernels for the other discrete locations, in the background
+        kernelWarmup.warm(ds, editorGlyph.name, useVarlib=self.wantsVarLib)
     
     def glyphEditorWillClose(self, info):
         # https://robofont.com/documentation/reference/api/mojo/mojo-subscriber/
@@ -1482,15 +2112,51 @@ class LongboardEditorView(Subscriber):
         # LongBoardUIController @@
         self.updateInstanceOutline(rebuild=True)
     
+    @traced("designspaceEditorSourceGlyphDidChange", "editor")
     def designspaceEditorSourceGlyphDidChange(self, info):
         # LongboardEditorView
         # rebuild all the layers
         relevant, font, ds = self.relevantForThisEditor(info)
         if not relevant:
             return
+        # the compiled kernels for this glyph are out of date,
+        # and those of the glyphs that use it as a component.
+        changedGlyph = info.get('glyph')
+        if changedGlyph is not None:
+            interpolationKernels.glyphChanged(self.operator, changedGlyph.name)
+            sourceOutlines.glyphChanged(self.operator, changedGlyph.name)
+            previewOutlines.glyphChanged(self.operator, changedGlyph.name)
+        else:
+            # we don't know which glyph, so none of them can be trusted
+            interpolationKernels.operatorChanged(self.operator)
+            sourceOutlines.operatorChanged(self.operator)
+            previewOutlines.operatorChanged(self.operator)
+        previewService.operatorChanged(self.operator)
+        self.prefetcher.clear()
+        self.updateSourcesOutlines(rebuild=True)
+        self.updateInstanceOutline(rebuild=True)
+
+    @traced("designspaceEditorSourcesDidChange", "editor")
+    def designspaceEditorSourcesDidChange(self, info):
+        # LongboardEditorView
+        # sources were added, removed or moved: all kernels are out of date
+        # and the fonts may belong to other designspaces now.
+        designspaceIndex.invalidate()
+        relevant, font, ds = self.relevantForThisEditor(info)
+        if not relevant:
+            return
+        interpolationKernels.operatorChanged(self.operator)
+        sourceOutlines.operatorChanged(self.operator)
+        sourceLocations.operatorChanged(self.operator)
+        previewOutlines.operatorChanged(self.operator)
+        previewService.operatorChanged(self.operator)
+        self.prefetcher.clear()
         self.updateSourcesOutlines(rebuild=True)
         self.updateInstanceOutline(rebuild=True)
 
+    designspaceEditorAxesDidChange = designspaceEditorSourcesDidChange
+
+    @traced("glyphEditorDidKeyDown", "editor")
     def glyphEditorDidKeyDown(self, info):
         # see if we can capture the arrow keys here.
         if info["lowLevelEvents"][-1]["tool"].__class__.__name__ != "LongboardNavigatorTool": return
@@ -1518,6 +2184,7 @@ class LongboardEditorView(Subscriber):
         # are mapped to this direction.
         axisScales = getAxisScales(self.operator)
         factor = 1
+        self.dragRecorder.nudge(dx, dy)
         data = {
                 'editor': self, 
                 'previewLocation': self.previewLocation_dragging,
@@ -1526,6 +2193,7 @@ class LongboardEditorView(Subscriber):
                 'nudge': (dx, dy),
                 'viewScale': 1,
                 }
+        data['traceID'] = traceRecorder.flowStart("navigatorLocationChanged")
         publishEvent(navigatorLocationChangedEventKey, data=data)
             
             
@@ -1550,6 +2218,7 @@ class LongboardEditorView(Subscriber):
                     return True
         return False
         
+    @traced("designspaceEditorPreviewLocationDidChange", "editor")
     def designspaceEditorPreviewLocationDidChange(self, info):
         # LongboardEditorView
         # only update the layers
@@ -1561,7 +2230,10 @@ class LongboardEditorView(Subscriber):
         currentPreviewContinuous, currentPreviewDiscrete = self.operator.splitLocation(loc)
         self.extrapolating = self.checkExtrapolation(currentPreviewContinuous)
         self.updateInstanceOutline(rebuild=False)
+        # the values in the axes table follow the new location
+        postEvent(previewChangedEventKey, operator=self.operator)
     
+    @traced("glyphDidChangeMeasurements", "editor")
     def glyphDidChangeMeasurements(self, info):
         # LongboardEditorView
         # only update the layers
@@ -1570,12 +2242,12 @@ class LongboardEditorView(Subscriber):
             return
         self.updateInstanceOutline(rebuild=True)
         
-    def findKinks(self, editorGlyph, previewShift, previewGlyph):
+    def findKinks(self, editorGlyph, previewShift, previewOutline):
         # LongboardEditorView
         # analyse and draw lines for possible kinks
         # for speed we might want to draw them all in 1 layer
         # but that means we can't show any quantification
-        results = findKinks(previewGlyph)
+        results = findKinks(previewOutline)
         kinkPen = merz.MerzPen()
         for contourIndex, p1, p2, p3, df in results:
             kinkPen.moveTo(p1)
@@ -1584,10 +2256,10 @@ class LongboardEditorView(Subscriber):
             kinkPen.endPath()
         self.kinkPathLayer.setPath(kinkPen.path)
     
-    def drawSelection(self, editorGlyph, previewShift, previewGlyph):
+    def drawSelection(self, editorGlyph, previewShift, previewOutline):
         # LongboardEditorView
         # draw the points that are selected in the editorglyph
-        # in the previewGlyph.
+        # in the previewOutline.
         selection = []
         markers = []
         pfp = editorGlyph.asFontParts()
@@ -1596,42 +2268,22 @@ class LongboardEditorView(Subscriber):
                 if p.selected:
                     try:
                         selection.append((ci, pi))
-                        previewPoint = previewGlyph.contours[ci].points[pi]
-                        markers.append((ci, pi, previewPoint.x, previewPoint.y))
+                        previewX, previewY = previewOutline.getPoint(ci, pi)
+                        markers.append((ci, pi, previewX, previewY))
                     except IndexError:
                         print(f"LongBoard reports: (B)")
                         print(traceback.format_exc())
         for ci, pi, px, py in markers:
             textPos = (px, py+self.selectionTextOffset)    #!
-            selectionLayerName = f"selectionMarker_{editorGlyph.name}_{ci}_{pi}"
-            selectionLayer = self.selectionLayer.getSublayer(selectionLayerName)
-            if selectionLayer is None:
-               selectionLayer = self.selectionLayer.appendSymbolSublayer(
-                   position=(px, py),
-                   imageSettings = dict(
-                       name="oval",
-                       size=(self.selectionMarkerSize, self.selectionMarkerSize),
-                       fillColor=self.selectionFillColor
-                       ),
-                   )
-            selectionTextLayerName = f"selectionText_{editorGlyph.name}_{ci}_{pi}"
-            selectionTextLayer = self.selectionTextLayer.getSublayer(selectionLayerName)
-            if selectionTextLayer is None:
-               selectionTextLayer = self.selectionTextLayer.appendTextLineSublayer(
-                    name=selectionTextLayerName,
-                    position=textPos,
-                    pointSize=9,
-                    fillColor=self.selectionFillColor,
-                    horizontalAlignment="center",
-                    )
+            self.selectionMarkerPool.setPosition((ci, pi), (px, py))
             if self.showRounded:
                 caption = f"{int(px)}, {int(py)}"
             else:
                 caption = f"{px:3.1f}, {py:3.1f}"
-            selectionTextLayer.setText(caption)
-            selectionTextLayer.setPosition(textPos)
+            self.selectionTextPool.setText((ci, pi), caption)
+            self.selectionTextPool.setPosition((ci, pi), textPos)
         
-    def drawMeasurements(self, editorGlyph, previewShift, previewGlyph):
+    def drawMeasurements(self, editorGlyph, previewShift, previewOutline):
         # LongboardEditorView
         # draw intersections for the current measuring beam and the current preview
         # only update the layers
@@ -1645,7 +2297,8 @@ class LongboardEditorView(Subscriber):
             x1, y1 = m.startPoint
             x2, y2 = m.endPoint
             beamData = ((x1,y1),(x2,y2))
-            r = previewGlyph.getRepresentation("doodle.Beam", 
+            # the beam representation needs a real glyph
+            r = self.getPreviewGlyph().getRepresentation("doodle.Beam", 
                 beam=beamData, 
                 canHaveComponent=False, 
                 italicAngle=editorGlyph.font.info.italicAngle)
@@ -1658,17 +2311,7 @@ class LongboardEditorView(Subscriber):
                 measureLineAngle = math.atan2(mp1[1]-mp2[1], mp1[0]-mp2[0]) - .5*math.pi
                 # draw the jumper curve
                 bcp1 = mp1[0]
-                # layer append or update? 1
-                jumperLayerName = f"measurementJumperLine_{editorGlyph.name}_{measurementIndex}_{i}"
-                jumperLayer = self.measurementsIntersectionsLayer.getSublayer(jumperLayerName)
-                if jumperLayer is None:
-                    jumperLayer = self.measurementsIntersectionsLayer.appendPathSublayer(
-                        name=jumperLayerName,
-                        strokeWidth=self.measurementStrokeWidth,
-                        strokeColor=self.measurementStrokeColor,
-                        strokeDash = self.measurementStrokeDash,
-                        fillColor=None,
-                    )
+                jumperLayer = self.measurementJumperPool.get((measurementIndex, i))
                 needlex = math.cos(measureLineAngle) * self.measureLineCurveOffset
                 needley = math.sin(measureLineAngle) * self.measureLineCurveOffset
                 jumperPen = jumperLayer.getPen(clear=True)
@@ -1677,50 +2320,16 @@ class LongboardEditorView(Subscriber):
                 jumperPen.endPath()
                 
                 # draw the end markers
-                # layer append or update? 2
-                measurementMarkerLayerName = f"measurementMarker_{editorGlyph.name}_{measurementIndex}_{i}_start"
-                measurementMarkerLayer = self.measurementMarkerLayer.getSublayer(measurementMarkerLayerName)
-                if measurementMarkerLayer is None:
-                    measurementMarkerLayer = self.measurementMarkerLayer.appendSymbolSublayer(
-                        position=mp1,
-                        imageSettings = dict(
-                            name="oval",
-                            size=(self.measurementMarkerSize, self.measurementMarkerSize),
-                            fillColor=self.measurementFillColor
-                            ),
-                        )
-                measurementMarkerLayer.setPosition(mp1)
-                # layer append or update? 3
-                measurementMarkerLayerName = f"measurementMarker_{editorGlyph.name}_{measurementIndex}_{i}_end"
-                measurementMarkerLayer = self.measurementMarkerLayer.getSublayer(measurementMarkerLayerName)
-                if measurementMarkerLayer is None:
-                    measurementMarkerLayer = self.measurementMarkerLayer.appendSymbolSublayer(
-                        position=mp2,
-                        imageSettings = dict(
-                            name="oval",
-                            size=(self.measurementMarkerSize, self.measurementMarkerSize),
-                            fillColor=self.measurementFillColor
-                        ),
-                    )
-                measurementMarkerLayer.setPosition(mp2)
+                self.measurementMarkerPool.setPosition((measurementIndex, i, "start"), mp1)
+                self.measurementMarkerPool.setPosition((measurementIndex, i, "end"), mp2)
                 # draw the measurement distance text
                 # .5 = halfway and that causes overlaps with the normal ruler values
                 textOffsetFactor = 0.52    # slightly further out, subjective value.
                 textPos = textOffsetFactor*(mp1[0]+mp2[0])+needlex, textOffsetFactor*(mp1[1]+mp2[1])+needley
                 dist = math.hypot(mp1[0]-mp2[0], mp1[1]-mp2[1])
                 self.ratioMeasurements.append(dist)
-                measurementTextLayerName = f"measurementText_{editorGlyph.name}_{measurementIndex}_{i}"
-                measurementTextLayer = self.measurementTextLayer.getSublayer(measurementTextLayerName)
-                if measurementTextLayer is None:
-                    measurementTextLayer= self.measurementTextLayer.appendTextLineSublayer(
-                        name=measurementTextLayerName,
-                        position=textPos,
-                        pointSize=11,
-                        fillColor=self.measurementFillColor,
-                        horizontalAlignment="center",
-                        )
-                measurementTextLayer.setText(f"{dist:3.1f}")
-                measurementTextLayer.setPosition(textPos)
+                self.measurementTextPool.setText((measurementIndex, i), f"{dist:3.1f}")
+                self.measurementTextPool.setPosition((measurementIndex, i), textPos)
     
     def prepareSourcesOutlines(self, rebuild=True):
         if self.operator is None:
@@ -1729,7 +2338,8 @@ class LongboardEditorView(Subscriber):
         editorGlyph = self.getGlyphEditor().getGlyph()
         #self.currentCollectorPen = CollectorPen(glyphSet=editorGlyph.font)
         self.sourcePens = []
-        self.sourceGlyphs = []
+        self.sourceOutlines = []
+        self.sourceShifts = []
         cl, dl = getLocationsForFont(editorGlyph.font, ds)
         continuousLocationForCurrentSource = {}
         discreteLocationForCurrentSource = {}
@@ -1739,22 +2349,17 @@ class LongboardEditorView(Subscriber):
         if dl:
             if dl[0] is not None:
                 discreteLocationForCurrentSource = dl[0]
-        # draw the source glyphs
-        items, unicodes = ds.collectSourcesForGlyph(glyphName=editorGlyph.name, decomposeComponents=True, discreteLocation=discreteLocationForCurrentSource)
-        for item in items:
-            loc, srcMath, thing = item
+        # the source outlines are cached until one of the source glyphs changes.
+        # the alignment is only a shift, applied when they are drawn.
+        items = sourceOutlines.getSourceOutlines(ds, editorGlyph.name, discreteLocation=discreteLocationForCurrentSource)
+        for loc, sourceOutline, sourceInfo in items:
+            shift = self.getPreviewOffsetForAlignOption(sourceOutline.width, editorGlyph.width, self.previewAlign)
             sourcePen = CollectorPen(glyphSet={})
-            # do not draw the master we're drawing in
-            # 
-            sourceGlyph = RGlyph()
-            srcMath.extractGlyph(sourceGlyph.asDefcon()) # mathglyph to sourceGlyph
-
-            shift = self.getPreviewOffsetForAlignOption(sourceGlyph.width, editorGlyph.width, self.previewAlign)
-            sourceGlyph.moveBy((shift, 0))
-                
-            sourceGlyph.draw(sourcePen)
+            sourcePen.setOffset(shift, 0)
+            sourceOutline.draw(sourcePen)
             self.sourcePens.append(sourcePen)
-            self.sourceGlyphs.append(sourceGlyph)
+            self.sourceOutlines.append(sourceOutline)
+            self.sourceShifts.append(shift)
     
     def getPreviewOffsetForAlignOption(self, sampleWidth, editorWidth, alignOption):
         # based on align option, return an offset that will position the preview in the editor
@@ -1773,6 +2378,7 @@ class LongboardEditorView(Subscriber):
         # because that is the default position of the preview glyph
         return shift
         
+    @traced("updateSourcesOutlines", "editor")
     def updateSourcesOutlines(self, rebuild=True):
         # draw the previously collected source outlines to a single merz path
         if self.operator is None:
@@ -1785,8 +2391,8 @@ class LongboardEditorView(Subscriber):
         # merzpen
         sourcePen = merz.MerzPen()
         if self.showSources:
-            for sourceGlyphIndex, sourceGlyph in enumerate(self.sourceGlyphs):
-                sourceGlyph.draw(sourcePen)
+            for sourceOutline, shift in zip(self.sourceOutlines, self.sourceShifts):
+                sourceOutline.draw(TransformPen(sourcePen, (1, 0, 0, 1, shift, 0)))
             self.sourcesPathLayer.setPath(sourcePen.path)
     
     def collectGlyphStats(self, glyph):
@@ -1800,8 +2406,127 @@ class LongboardEditorView(Subscriber):
                 rightMargin= temp.rightMargin,
                 area= temp.area,
             )
+
+    def collectOutlineStats(self, outline):
+        # the same dimensions as collectGlyphStats, fast enough for every frame.
+        # the area comes from the outline arrays, but overlaps are not removed.
+        # so these are estimates, use collectGlyphStats for the real thing.
+        bounds = outline.bounds
+        if bounds is None:
+            xMin = xMax = 0
+        else:
+            xMin, yMin, xMax, yMax = bounds
+        return Location(
+                width= outline.width,
+                leftMargin= xMin,
+                rightMargin= outline.width - xMax,
+                area= abs(calcOutlineArea(outline)),
+            )
         
+    def makePreviewOutline(self, glyphName, location):
+        # LongboardEditorView
+        # while dragging the outline may have been prefetched already
+        if self.dragging and self._prefetching:
+            outline = self.prefetcher.take(glyphName, self.wantsVarLib, location, self._dragAxisScales)
+            if outline is not None:
+                return outline
+        # other editors on this designspace may want the same outline
+        return previewService.getOutline(self.operator, glyphName, location, useVarlib=self.wantsVarLib)
+
+    def getSharedStats(self, flavor, glyphName, previewOutline, shift):
+        # LongboardEditorView
+        # the stats of the preview, made once for all the editors with
+        # this glyph at this location. The preview outline is moved by
+        # shift for the alignment in this editor, and the margins move
+        # with it. So the shared stats are those of the outline before
+        # the shift, and each editor adds its own shift to the margins.
+        if flavor == "estimate":
+            make = lambda: shiftStats(self.collectOutlineStats(previewOutline), -shift)
+        else:
+            make = lambda: shiftStats(self.collectGlyphStats(self.getPreviewGlyph()), -shift)
+        key = (flavor, glyphName, self.showRounded, self.statsRemoveOverlap)
+        stats = previewService.getResult(self.operator, self.previewLocation_dragging, self.wantsVarLib, key, make)
+        return shiftStats(stats, shift)
+
+    def prefetchNextLocations(self):
+        # LongboardEditorView
+        # Predict the next locations of the drag: the offsets of a mouse drag
+        # are the mouse velocity, the distance over timeSinceLastEvent.
+        # The next frame will likely merge one or a few more drags like
+        # the last one. Compute those outlines on the prefetch thread.
+        # Only for the glyphs without a kernel, the glyphs with incompatible
+        # sources. Compatible glyphs, the common case, are not prefetched:
+        # their kernel is faster than a handover from the prefetch thread.
+        if not self.usePrefetch or not self.dragging or self._lastDragVelocity is None or self.operator is None:
+            return
+        editorGlyph = self.getGlyphEditor().getGlyph()
+        if editorGlyph is None or self.previewLocation_dragging is None:
+            return
+        kernel, continuousLocation = interpolationKernels.getKernelForLocation(self.operator, editorGlyph.name, self.previewLocation_dragging, useVarlib=self.wantsVarLib)
+        if kernel is not None:
+            # the kernel makes the outline faster than a handover from another thread
+            return
+        locations = []
+        location = self.previewLocation_dragging
+        for horizontal, vertical in predictDragOffsets(self._lastDragVelocity, self._previousDragVelocity, self.prefetcher.depth):
+            location = applyNavigatorOffsets(
+                self.operator,
+                location,
+                self._dragDirections,
+                horizontal,
+                vertical,
+                allowAnisotropy=self.allowAnisotropy,
+                allowExtrapolation=self.allowExtrapolation,
+                )
+            locations.append(location)
+        if self._prefetchOperator is None:
+            # makeOneGlyph changes the operator and the ufoProcessor cache while
+            # it works, so the prefetch thread gets its own copy of the operator.
+            from longboardInstance import makeJobOperator
+            self._prefetchOperator = makeJobOperator(self.operator, useVarlib=self.wantsVarLib, extrapolate=self.operator.extrapolate)
+        operator = self._prefetchOperator
+        glyphName = editorGlyph.name
+        useVarlib = self.wantsVarLib
+        def compute(location):
+            mathGlyph = operator.makeOneGlyph(glyphName, location=location, useVarlib=useVarlib)
+            if mathGlyph is None:
+                return None
+            return InstanceOutline.fromMathGlyph(mathGlyph)
+        self.prefetcher.schedule(glyphName, useVarlib, locations, compute)
+        self._prefetching = True
+
+    def getPreviewGlyph(self):
+        # LongboardEditorView
+        # A real glyph of the current preview, for the things that need one.
+        # Only made when asked, not on every frame.
+        if self.currentPreviewGlyph is None and self.currentPreviewOutline is not None:
+            self.frameTimer.start("extraction")
+            previewGlyph = RGlyph()
+            self.currentPreviewOutline.extractGlyph(previewGlyph.asDefcon())
+            previewGlyph.name = self.currentPreviewOutline.name
+            self.currentPreviewGlyph = previewGlyph
+            self.frameTimer.stop()
+        return self.currentPreviewGlyph
+
+    @traced("updateInstanceOutline", "editor")
     def updateInstanceOutline(self, rebuild=True):
+        # LongboardEditorView
+        # the markers that are not drawn in this update are hidden afterwards
+        self.frameTimer.beginFrame()
+        for pool in self.markerPools:
+            pool.begin()
+        try:
+            self.drawInstanceOutline(rebuild=rebuild)
+            if not rebuild:
+                self.prefetchNextLocations()
+        finally:
+            self.frameTimer.start("layers")
+            for pool in self.markerPools:
+                pool.end()
+            self.frameTimer.stop()
+            self.frameTimer.endFrame()
+
+    def drawInstanceOutline(self, rebuild=True):
         # LongboardEditorView
         # everything necessary to update the preview, time sensitive
         if self.darkMode != inDarkMode():
@@ -1813,16 +2538,14 @@ class LongboardEditorView(Subscriber):
             self.previewPathLayer.clearSublayers()
             self.statsContainer.clearSublayers()
             #self.statsTextLayer.clearSublayers()
-            self.instanceMarkerLayer.clearSublayers()
+            self.instanceMarkerLayer.setPath(None)
+            self.instanceMarkerLayer.setStrokeColor(self.instanceStrokeColor)
             self.kinkPathLayer.setPath(None)
             self.marginsPathLayer.setPath(None)
             self.pointsPathLayer.setPath(None)
-
-        self.measurementMarkerLayer.clearSublayers()
-        self.measurementsIntersectionsLayer.clearSublayers()
-        self.measurementTextLayer.clearSublayers()
-        self.selectionLayer.clearSublayers()
-        self.selectionTextLayer.clearSublayers()
+            # the colors may have changed
+            for pool in self.markerPools:
+                pool.clear()
         
         if self.operator is None:
             return
@@ -1836,6 +2559,7 @@ class LongboardEditorView(Subscriber):
         sourcePens = []
         
         self.currentPreviewGlyph = None
+        self.currentPreviewOutline = None
         
         # # boldly assume a font is only in a single discrete location
         cl, dl = getLocationsForFont(editorGlyph.font, ds)
@@ -1849,40 +2573,55 @@ class LongboardEditorView(Subscriber):
                 discreteLocationForCurrentSource = dl[0]
 
         if self.previewLocation_dragging is not None:
-            mathGlyph = ds.makeOneGlyph(editorGlyph.name, location=self.previewLocation_dragging, useVarlib=self.wantsVarLib)
-            if editorGlyph is None or mathGlyph is None:
+            self.frameTimer.start("interpolation")
+            previewOutline = self.makePreviewOutline(editorGlyph.name, self.previewLocation_dragging)
+            self.frameTimer.stop()
+            if editorGlyph is None or previewOutline is None:
                 path = None
                 return
             
-            previewGlyph = RGlyph()
-            mathGlyph.extractGlyph(previewGlyph.asDefcon())
-
+            # rounding and alignment are array operations on the outline
+            self.frameTimer.start("extraction")
             if self.showRounded:
-                previewGlyph.round()
+                previewOutline.round()
                 
-            xMin, yMin, xMax, yMax = previewGlyph.bounds
-
-            shift = self.getPreviewOffsetForAlignOption(previewGlyph.width, editorGlyph.width, self.previewAlign)
-            previewGlyph.moveBy((shift, 0))
-            self.currentPreviewGlyph = previewGlyph
+            bounds = previewOutline.bounds
+            if bounds is None:
+                # an empty glyph
+                bounds = 0, 0, 0, 0
+            xMin, yMin, xMax, yMax = bounds
+
+            shift = self.getPreviewOffsetForAlignOption(previewOutline.width, editorGlyph.width, self.previewAlign)
+            previewOutline.moveBy((shift, 0))
+            self.currentPreviewOutline = previewOutline
+            self.frameTimer.stop()
             
+            self.frameTimer.start("stats")
             if self.showStats:
                 self.lastMeasurementStats = {}
+                # while dragging the stats are estimated from the outline,
+                # the exact numbers, with removeOverlap, wait for the mouse up.
+                statsFlavor = "estimate" if self.dragging else "exact"
                 if self.startInstanceStats == None:
-                    self.startInstanceStats = self.collectGlyphStats(previewGlyph)
+                    self.startInstanceStats = dict(
+                        estimate=self.getSharedStats("estimate", editorGlyph.name, previewOutline, shift),
+                        exact=self.getSharedStats("exact", editorGlyph.name, previewOutline, shift),
+                        )
                 else:
                     statsText = ""
-                    currentStats = self.collectGlyphStats(previewGlyph)
-                    diff = currentStats - self.startInstanceStats
+                    startStats = self.startInstanceStats[statsFlavor]
+                    currentStats = self.getSharedStats(statsFlavor, editorGlyph.name, previewOutline, shift)
+                    self.lastMeasurementStats['stats'] = statsFlavor
+                    diff = currentStats - startStats
                     if currentStats['area'] != 0:
-                        wghtPercent = 100 - (100 * self.startInstanceStats['area']) / currentStats['area']
+                        wghtPercent = 100 - (100 * startStats['area']) / currentStats['area']
                     else:
                         wghtPercent = 0
                     if currentStats['width'] != 0:
-                        wdthPercent = 100 - (100 * self.startInstanceStats['width']) / currentStats['width']
+                        wdthPercent = 100 - (100 * startStats['width']) / currentStats['width']
                     else:
                         wdthPercent = 0
-                    wdthAbs = currentStats['width'] - self.startInstanceStats['width']
+                    wdthAbs = currentStats['width'] - startStats['width']
                     #statsText += f"\n\n{self._bar}"
                     continousAxesText = ""
                     discreteAxesText = ""
@@ -1913,6 +2652,10 @@ class LongboardEditorView(Subscriber):
                     statsText += discreteAxesText
                     #statsText += f"\n{self._bar}"
                     statsText += f"\n{wghtPercent:>13.2f} %  Δ area \n{wdthPercent:>13.2f} %  Δ width \n{wdthAbs:>13} u  abs width"
+                    if statsFlavor == "estimate":
+                        statsText += f"\n{'~':>13}    estimate while dragging"
+                    else:
+                        statsText += f"\n{'=':>13}    exact"
                     if len(self.ratioMeasurements)==2:
                         a, b = self.ratioMeasurements
                         if a != 0 and b != 0:
@@ -1926,6 +2669,8 @@ class LongboardEditorView(Subscriber):
                             statsText += f"\n{self.lastMeasurementRatio:>13.3f} measurement ratio"
                     else:
                         self.lastMeasurementRatio = None
+                    if self.showTiming:
+                        statsText += self.getTimingText()
 
                     statsTextLayerName = f'statsText_{editorGlyph.name}'
                     statsTextLayer = self.statsContainer.getSublayer(statsTextLayerName)
@@ -1934,9 +2679,9 @@ class LongboardEditorView(Subscriber):
                     if self.statsAlign == "left":
                         textPos = (shift, yMin)
                     elif self.statsAlign == "right":
-                        textPos = (previewGlyph.width + shift, yMin)
+                        textPos = (previewOutline.width + shift, yMin)
                     elif self.statsAlign == "center":
-                        textPos = (0.5 * previewGlyph.width + shift, yMin)
+                        textPos = (0.5 * previewOutline.width + shift, yMin)
                     if statsTextLayer is None:
                         statsTextLayer= self.statsContainer.appendTextLineSublayer(
                             name=statsTextLayerName,
@@ -1952,25 +2697,40 @@ class LongboardEditorView(Subscriber):
             else:
                 self.startInstanceStats = None
                 self.lastMeasurementStats = {}
+            self.frameTimer.stop()
 
             # @@
-            self.updateSourceVectors(previewGlyph)
+            self.frameTimer.start("layers")
+            cpPreview = None
+            if self.showVectors:
+                cpPreview = CollectorPen(glyphSet={})
+                previewOutline.draw(cpPreview)
+                self.updateSourceVectors(cpPreview)
+            self.frameTimer.stop()
 
-            cpPreview = CollectorPen(glyphSet={})
-            previewGlyph.draw(cpPreview)
             if self.showMeasurements:
-                self.drawMeasurements(editorGlyph,  shift, previewGlyph)
+                self.frameTimer.start("measurements")
+                self.drawMeasurements(editorGlyph,  shift, previewOutline)
+                self.frameTimer.stop()
             if self.showKinks:
-                self.findKinks(editorGlyph,  shift, previewGlyph)
+                self.frameTimer.start("kinks")
+                self.findKinks(editorGlyph,  shift, previewOutline)
+                self.frameTimer.stop()
 
             # draw selected points
             if self.showSelection:
-                self.drawSelection(editorGlyph, shift, previewGlyph)
+                self.frameTimer.start("selection")
+                self.drawSelection(editorGlyph, shift, previewOutline)
+                self.frameTimer.stop()
 
+            self.frameTimer.start("layers")
             if self.showPreview:
                 # 01 stroke instance path in the editor layer
                 # layer append or update? 12
-                path = previewGlyph.getRepresentation("merz.CGPath")
+                # the outline draws straight into the merz path
+                pathPen = merz.MerzPen()
+                previewOutline.draw(pathPen)
+                path = pathPen.path
                 instanceLayerName = f'instance_outline_{editorGlyph.name}'
                 instanceLayer = self.instancePathLayer.getSublayer(instanceLayerName)
                 instanceStrokeDash = self.instanceStrokeDash
@@ -2008,37 +2768,8 @@ class LongboardEditorView(Subscriber):
                 previewLayer.setPath(path)
                 
             if self.showVectors:
-                # 03 on curve markers on instance outline
-                for im, m in enumerate(cpPreview.onCurves):
-                    # layer append or update? 14 @@
-                    onCurveSymbolLayerName = f'preview_onCurve_{editorGlyph.name}_marker_{im}'
-                    onCurveSymbolLayer = self.instanceMarkerLayer.getSublayer(onCurveSymbolLayerName)
-                    if onCurveSymbolLayer is None:
-                        onCurveSymbolLayer = self.instanceMarkerLayer.appendSymbolSublayer(
-                            name=onCurveSymbolLayerName,
-                            #layer = self.instancePathLayer.getSublayer(layerName),
-                            imageSettings = dict(
-                                name="oval", # name of the factory
-                                size=(self.instanceMarkerSize, self.instanceMarkerSize),
-                                fillColor=self.instanceStrokeColor
-                                ),
-                            )
-                    onCurveSymbolLayer.setPosition(m)
-                # 04 off curve markers on instance outline
-                for im, m in enumerate(cpPreview.offCurves):
-                    # layer append or update? 15
-                    offCurveSymbolLayerName = f'preview_offCurve_{editorGlyph.name}_marker_{im}'
-                    offCurveSymbolLayer = self.instanceMarkerLayer.getSublayer(offCurveSymbolLayerName)
-                    if offCurveSymbolLayer is None:
-                        offCurveSymbolLayer = self.instanceMarkerLayer.appendSymbolSublayer(
-                            name=offCurveSymbolLayerName,
-                            imageSettings = dict(
-                                name="oval",
-                                size=(self.instanceMarkerSize, self.instanceMarkerSize),
-                                fillColor=self.instanceStrokeColor
-                            ),
-                        )
-                    offCurveSymbolLayer.setPosition(m)
+                # 03, 04 on curve and off curve markers on instance outline
+                self.updateInstanceMarkers(previewOutline)
                 # 05 draw small lines for the left and right margins of the instance outline
                 # show the margin lines at the expected angle
                 italicSlantOffset = editorGlyph.font.lib.get(self.italicSlantOffsetKey, 0)
@@ -2049,7 +2780,7 @@ class LongboardEditorView(Subscriber):
                 dx = math.cos(angle) * self.marginLineHeight
                 a = (shift-dx+italicSlantOffset, -self.marginLineHeight)
                 b = (shift+italicSlantOffset, 0)
-                shiftRight = .5*editorGlyph.width +.5*previewGlyph.width
+                shiftRight = .5*editorGlyph.width +.5*previewOutline.width
                 c = (shiftRight-dx+italicSlantOffset, -self.marginLineHeight)
                 d = (shiftRight+italicSlantOffset, 0)
                 marginLayerName = f'instance_{editorGlyph.name}_margins'
@@ -2061,11 +2792,24 @@ class LongboardEditorView(Subscriber):
                 marginLinePath.lineTo(d)
                 marginLinePath.endPath()
                 self.marginsPathLayer.setPath(marginLinePath.path)
+            self.frameTimer.stop()
 
-    def updateSourceVectors(self, previewGlyph):
+    def updateInstanceMarkers(self, previewOutline):
+        # LongboardEditorView
+        # draw a dot for each point of the preview, straight from the point array.
+        # a dot is a line of zero length with a round cap,
+        # so all of them fit in a single path and a single layer.
+        markerPen = merz.MerzPen()
+        for point in previewOutline.points[~previewOutline.removed].tolist():
+            point = tuple(point)
+            markerPen.moveTo(point)
+            markerPen.lineTo(point)
+            markerPen.endPath()
+        self.instanceMarkerLayer.setPath(markerPen.path)
+
+    def updateSourceVectors(self, collectorPen):
+        # collectorPen: the preview outline drawn in a CollectorPen
         if self.showVectors:
-            collectorPen = CollectorPen({})
-            previewGlyph.draw(collectorPen)
             vectorPath = merz.MerzPen()
             for sourcePenIndex, s in enumerate(self.sourcePens) :
                 for vectorIndex, vector in enumerate(zip(collectorPen.onCurves, s.onCurves)):
@@ -2075,6 +2819,7 @@ class LongboardEditorView(Subscriber):
                     vectorPath.endPath()
             self.pointsPathLayer.setPath(vectorPath.path)
                 
+    @traced("showSettingsChanged", "editor")
     def showSettingsChanged(self, info):
         # LongboardEditorView
         # subscriber callback
@@ -2110,41 +2855,79 @@ class LongboardEditorView(Subscriber):
         self.discreteAxisNames = settings.get("_discreteAxisNames", [])
         self.continuousAxisNames = settings.get("_continuousAxisNames", [])
         self.dragDirections = settings.get('_dragDirections', {})
-        self.setPreferences()
-        self.updateSourcesOutlines(rebuild=True)
-        self.updateInstanceOutline(rebuild=True)        
-
-registerSubscriberEvent(
-    subscriberEventName=settingsChangedEventKey,
-    methodName="showSettingsChanged",
-    lowLevelEventNames=[settingsChangedEventKey],
-    dispatcher="roboFont",
-    delay=0,
-    debug=True
-)
-
-# The concept of "relevant" operator:
-# it is the operator that belongs to the font that belongs to the glyph that is in the editor.
-# yes, that means trouble if there are multiple designspaces open in which the current font is active.
-registerSubscriberEvent(
-    subscriberEventName=operatorChangedEventKey,
-    methodName="relevantOperatorChanged",
-    lowLevelEventNames=[operatorChangedEventKey],
-    dispatcher="roboFont",
-    delay=.25,
-    documentation="This is sent when the glyph editor subscriber finds there is a new relevant designspace.",
-    debug=True
-)
-
-registerSubscriberEvent(
-    subscriberEventName=navigatorLocationChangedEventKey,
-    methodName="navigatorLocationChanged",
-    lowLevelEventNames=[navigatorLocationChangedEventKey],
-    dispatcher="roboFont",
-    delay=0,
-    documentation="Posted by the Longboard Navigator Tool to the LongBoardUIController",
-    debug=True
-)
+        parts = self.getChangedParts(settings)
+        if "prefetch" in parts:
+            self.prefetcher.clear()
+        if "all" in parts:
+            self.setPreferences()
+            self.updateSourcesOutlines(rebuild=True)
+            self.updateInstanceOutline(rebuild=True)
+            return
+        if "colors" in parts:
+            self.setColors(active=self.dragging)
+            self.recolorLayers()
+        if "sources" in parts:
+            self.updateSourcesOutlines(rebuild=True)
+        if "instance" in parts:
+            self.updateInstanceOutline(rebuild=True)
+        elif "kinks" in parts:
+            self.updateKinks()
+
+    def getChangedParts(self, settings):
+        # LongboardEditorView
+        # the parts of the drawing that depend on the settings that changed,
+        # "all" for the first settings, or when the dark mode changed.
+        previous = self._lastSettings
+        previousDarkMode = self._lastSettingsDarkMode
+        self._lastSettings = copy.deepcopy(settings)
+        self._lastSettingsDarkMode = inDarkMode()
+        if previous is None or previousDarkMode != self._lastSettingsDarkMode:
+            return {"all", "prefetch"}
+        changed = {name for name in set(settings) | set(previous) if settings.get(name) != previous.get(name)}
+        return {part for part, names in self.settingsDependencies.items() if changed.intersection(names)}
+
+    def recolorLayers(self):
+        # LongboardEditorView
+        # give the layers that are there the current colors,
+        # for a change of the haze. Nothing is drawn again.
+        self.previewPathLayer.setStrokeColor(self.previewStrokeColor)
+        self.selectionLayer.setStrokeColor(self.vectorStrokeColor)
+        self.instancePathLayer.setStrokeColor(self.instanceStrokeColor)
+        self.sourcesPathLayer.setStrokeColor(self.sourceStrokeColor)
+        self.kinkPathLayer.setStrokeColor(self.kinkStrokeColor)
+        self.pointsPathLayer.setStrokeColor(self.vectorStrokeColor)
+        self.marginsPathLayer.setStrokeColor(self.vectorStrokeColor)
+        self.instanceMarkerLayer.setStrokeColor(self.instanceStrokeColor)
+        editorGlyph = self.getGlyphEditor().getGlyph()
+        if editorGlyph is not None:
+            instanceLayer = self.instancePathLayer.getSublayer(f'instance_outline_{editorGlyph.name}')
+            if instanceLayer is not None:
+                instanceLayer.setStrokeColor(self.instanceStrokeColor)
+            previewLayer = self.previewPathLayer.getSublayer(f'instance_preview_{editorGlyph.name}')
+            if previewLayer is not None:
+                previewLayer.setStrokeColor(self.previewStrokeColor)
+                previewLayer.setFillColor(self.previewFillColor)
+        # the measurements keep their color, only the selection is hazed
+        for layer in self.selectionMarkerPool.layers.values():
+            layer.setImageSettings(dict(
+                name="oval",
+                size=(self.selectionMarkerSize, self.selectionMarkerSize),
+                fillColor=self.selectionFillColor
+                ))
+        for layer in self.selectionTextPool.layers.values():
+            layer.setFillColor(self.selectionFillColor)
+
+    def updateKinks(self):
+        # LongboardEditorView
+        # draw or remove the kinks of the preview outline we have,
+        # for a change of showKinks. Nothing is interpolated.
+        self.kinkPathLayer.setPath(None)
+        if not self.showKinks or self.currentPreviewOutline is None:
+            return
+        editorGlyph = self.getGlyphEditor().getGlyph()
+        if editorGlyph is None:
+            return
+        self.findKinks(editorGlyph, 0, self.currentPreviewOutline)
 
 def launcher():
     OpenWindow(LongBoardUIController) 
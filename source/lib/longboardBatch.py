@@ -0,0 +1,265 @@
+"""
+    Longboard batch previews.
+
+    Makes the Longboard previews for many locations without RoboFont:
+    a preview UFO, a JSON file with outlines and stats, or only the stats,
+    on a pool of processes. The output goes in a "previews" folder next
+    to the designspace.
+
+        python longboardBatch.py MyFamily.designspace
+        python longboardBatch.py MyFamily.designspace --mode stats --glyphs a b c
+        python longboardBatch.py MyFamily.designspace --locations review.json --workers 8
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from fontTools.designspaceLib import InstanceDescriptor
+from fontTools.ufoLib.glifLib import writeGlyphToString
+from ufoProcessor.ufoOperator import UFOOperator
+
+from longboardInstance import getInstanceGlyphNames, addMathGlyph
+from longboardKernel import makeInstanceOutline, calcOutlineArea, findKinks
+from longboardRecorder import packLocation, unpackLocation
+
+batchModes = ("ufo", "outlines", "stats")
+
+
+def collectInterestingLocations(operator):
+    # The locations of the sources and the instances.
+    # returns [(location, kind, label), ...], kind is "source" or "instance"
+    locations = []
+    for src in operator.sources:
+        if src.location is not None:
+            label = os.path.basename(src.path) if src.path is not None else src.name
+            if src.layerName is not None:
+                label = f"{label}, layer {src.layerName}"
+            locations.append((src.location, "source", label))
+    for instance in operator.instances:
+        dsloc = instance.getFullDesignLocation(operator.doc)
+        if dsloc is not None:
+            locations.append((dsloc, "instance", f"Instance {instance.familyName} {instance.styleName}"))
+    return locations
+
+
+def readLocations(path):
+    # returns [(location, label), ...] from a locations file
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    locations = []
+    for index, item in enumerate(data):
+        if "location" in item:
+            locations.append((unpackLocation(item["location"]), item.get("name", f"location {index}")))
+        else:
+            locations.append((unpackLocation(item), f"location {index}"))
+    return locations
+
+
+def makeBatchFileName(index, label):
+    safeLabel = re.sub(r"[^\w\-]+", "_", label).strip("_")
+    return f"{index:04d}_{safeLabel}"
+
+
+def getOutlineStats(outline, withKinks=True):
+    # the stats Longboard shows with the preview, and the kinks
+    bounds = outline.bounds
+    if bounds is None:
+        xMin = xMax = 0
+    else:
+        xMin, yMin, xMax, yMax = bounds
+    stats = dict(
+        width=outline.width,
+        leftMargin=xMin,
+        rightMargin=outline.width - xMax,
+        area=abs(calcOutlineArea(outline)),
+        bounds=bounds,
+        )
+    if withKinks:
+        kinks = findKinks(outline)
+        stats["kinks"] = len(kinks)
+        stats["worstKink"] = max((kink[-1] for kink in kinks), default=0)
+    return stats
+
+
+# the operator of this worker process
+_worker = {}
+
+
+def initWorker(designspacePath, useVarlib, extrapolate):
+    operator = UFOOperator(designspacePath, useVarlib=useVarlib, extrapolate=extrapolate)
+    operator.loadFonts()
+    _worker["operator"] = operator
+
+
+def getWorkerOperator():
+    return _worker["operator"]
+
+
+def renderLocation(task):
+    # Make the preview for one location, in a worker process.
+    # returns a summary for summary.json
+    operator = getWorkerOperator()
+    startTime = time.perf_counter()
+    location = unpackLocation(task["location"])
+    baseName = makeBatchFileName(task["index"], task["label"])
+    summary = dict(index=task["index"], label=task["label"], location=task["location"], path=None, glyphs=0, failed=[], kinks=0, error=None)
+    try:
+        if task["mode"] == "ufo":
+            continuousLocation, discreteLocation = operator.splitLocation(location)
+            defaultFont = operator.findDefaultFont(discreteLocation=discreteLocation)
+            instanceDescriptor = InstanceDescriptor()
+            instanceDescriptor.familyName = defaultFont.info.familyName if defaultFont is not None else "Preview"
+            instanceDescriptor.styleName = operator.locationToDescriptiveString(location)
+            instanceDescriptor.location = location
+            font = operator.makeInstance(instanceDescriptor, glyphNames=task["glyphNames"], decomposeComponents=bool(task["glyphNames"]))
+            font.info.note = f"Preview UFO generated by LongBoard, from designspace {os.path.basename(operator.path)} at coordinates {operator.locationToDescriptiveString(location)}, on date {task['date']}."
+            path = os.path.join(task["outputFolder"], baseName + ".ufo")
+            font.save(path)
+            summary["glyphs"] = len(font.keys())
+        else:
+            glyphs = {}
+            for glyphName in task["glyphNames"] or getInstanceGlyphNames(operator):
+                outline = makeInstanceOutline(operator, glyphName, location, useVarlib=operator.useVarlib)
+                if outline is None:
+                    summary["failed"].append(glyphName)
+                    continue
+                glyphData = getOutlineStats(outline)
+                summary["kinks"] += glyphData["kinks"]
+                if task["mode"] == "outlines":
+                    glyphData["glif"] = writeGlyphToString(glyphName, glyphObject=outline, drawPointsFunc=outline.drawPoints)
+                glyphs[glyphName] = glyphData
+            path = os.path.join(task["outputFolder"], baseName + ".json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(dict(label=task["label"], location=task["location"], glyphs=glyphs), f, indent=1)
+            summary["glyphs"] = len(glyphs)
+        summary["path"] = os.path.basename(path)
+    except Exception:
+        summary["error"] = traceback.format_exc()
+    summary["seconds"] = round(time.perf_counter() - startTime, 3)
+    return summary
+
+
+def renderInstancePart(task):
+    # A part of a preview UFO, in a worker process, for the PreviewInstanceJob.
+    # "font": the UFO with the info, kerning, groups, lib and the first glyph, saved to path.
+    # "glyphs": the glyphs as GLIF strings, None for the glyphs that fail.
+    operator = getWorkerOperator()
+    operator.roundGeometry = task["roundGeometry"]
+    location = unpackLocation(task["location"])
+    if task["mode"] == "font":
+        instanceDescriptor = InstanceDescriptor()
+        instanceDescriptor.familyName = task["familyName"]
+        instanceDescriptor.styleName = task["styleName"]
+        instanceDescriptor.location = location
+        font = operator.makeInstance(instanceDescriptor, glyphNames=task["glyphNames"], decomposeComponents=False)
+        font.save(task["path"])
+        return dict(path=task["path"])
+    glyphs = {}
+    font = operator.fontClass()
+    for glyphName in task["glyphNames"]:
+        try:
+            mathGlyph = operator.makeOneGlyph(glyphName, location=location, decomposeComponents=False, useVarlib=operator.useVarlib, roundGeometry=operator.roundGeometry)
+        except Exception:
+            mathGlyph = None
+        if mathGlyph is None:
+            glyphs[glyphName] = None
+            continue
+        addMathGlyph(font, glyphName, mathGlyph)
+        glyph = font[glyphName]
+        glyphs[glyphName] = writeGlyphToString(glyphName, glyphObject=glyph, drawPointsFunc=glyph.drawPoints)
+    return dict(glyphs=glyphs)
+
+
+def iterTasks(tasks, function, designspacePath, useVarlib=False, extrapolate=True, workers=None):
+    # Run function(task) for all tasks on a pool of processes that
+    # each opened the designspace. With workers=1 it runs here.
+    # Yields the results in the order of the tasks, as they come in.
+    if workers == 1:
+        initWorker(designspacePath, useVarlib, extrapolate)
+        for task in tasks:
+            yield function(task)
+        return
+    # a few tasks per process at a time, so the results that wait
+    # for an earlier task do not pile up
+    maxPending = 4 * (workers or os.cpu_count() or 1)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=initWorker, initargs=(designspacePath, useVarlib, extrapolate)) as executor:
+        try:
+            for task in tasks:
+                pending.append(executor.submit(function, task))
+                if len(pending) >= maxPending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        except GeneratorExit:
+            # the caller stopped early, drop the tasks that did not start
+            for future in pending:
+                future.cancel()
+            raise
+
+
+def runTasks(tasks, function, designspacePath, useVarlib=False, extrapolate=True, workers=None, report=None):
+    # iterTasks, as a list. report(result) is called with each result.
+    results = []
+    for result in iterTasks(tasks, function, designspacePath, useVarlib=useVarlib, extrapolate=extrapolate, workers=workers):
+        if report is not None:
+            report(result)
+        results.append(result)
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Make Longboard previews for the interesting locations of a designspace.")
+    parser.add_argument("designspace", help="the .designspace file")
+    parser.add_argument("--locations", help="a JSON file with the locations, instead of the interesting locations")
+    parser.add_argument("--mode", choices=batchModes, default="ufo", help="preview UFOs, glyph outlines and stats as JSON, or only the stats")
+    parser.add_argument("--glyphs", nargs="*", help="only these glyphs")
+    parser.add_argument("--varlib", action="store_true", help="interpolate with VarLib instead of MutatorMath")
+    parser.add_argument("--output", help="the output folder, the default is a new folder in previews next to the designspace")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes, the default is one per core")
+    args = parser.parse_args(args)
+
+    designspacePath = os.path.abspath(args.designspace)
+    date = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    if args.locations:
+        locations = readLocations(args.locations)
+    else:
+        operator = UFOOperator(designspacePath)
+        locations = [(location, f"{kind} {label}") for location, kind, label in collectInterestingLocations(operator)]
+    outputFolder = args.output
+    if outputFolder is None:
+        designspaceName = os.path.splitext(os.path.basename(designspacePath))[0]
+        outputFolder = os.path.join(os.path.dirname(designspacePath), "previews", f"Batch_{designspaceName}_{args.mode}_{date}")
+    if not os.path.exists(outputFolder):
+        os.makedirs(outputFolder)
+
+    tasks = [
+        dict(index=index, label=label, location=packLocation(location), mode=args.mode, glyphNames=args.glyphs or [], outputFolder=outputFolder, date=date)
+        for index, (location, label) in enumerate(locations)
+        ]
+
+    def report(result):
+        if result["error"] is not None:
+            print(f"LongBoard reports: {result['label']} failed\n{result['error']}", file=sys.stderr)
+        else:
+            print(f"{result['index']:4d} {result['label']}: {result['glyphs']} glyphs, {result['kinks']} kinks, {result['seconds']} s")
+
+    startTime = time.perf_counter()
+    results = runTasks(tasks, renderLocation, designspacePath, useVarlib=args.varlib, workers=args.workers, report=report)
+    with open(os.path.join(outputFolder, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(dict(designspace=designspacePath, mode=args.mode, date=date, locations=results), f, indent=1)
+    errors = [result for result in results if result["error"] is not None]
+    print(f"LongBoard reports: {len(results) - len(errors)} of {len(results)} locations in {round(time.perf_counter() - startTime, 1)} s, in {outputFolder}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+    Longboard events.
+
+    The keys of the events Longboard publishes, and the registration
+    of the subscriber events. This is all the extension does when
+    RoboFont starts. longboard.py, with the editor, the window and the
+    interpolation, loads when Longboard is opened from the menu.
+
+    Python imports a module once, so the events are registered once,
+    also when longboard.py runs again from the menu.
+"""
+
+from mojo.subscriber import registerSubscriberEvent
+
+eventID = "com.letterror.longboardNavigator"
+navigatorLocationChangedEventKey = eventID + "navigatorLocationChanged.event"
+navigatorUnitChangedEventKey = eventID + "navigatorUnitChanged.event"
+navigatorActiveEventKey = eventID + "navigatorActive.event"
+navigatorInactiveEventKey = eventID + "navigatorInctive.event"
+
+toolID = "com.letterror.longboard"
+settingsChangedEventKey = toolID + ".settingsChanged.event"
+operatorChangedEventKey = toolID + ".operatorChanged.event"
+previewChangedEventKey = toolID + ".previewChanged.event"
+
+registerSubscriberEvent(
+    subscriberEventName=settingsChangedEventKey,
+    methodName="showSettingsChanged",
+    lowLevelEventNames=[settingsChangedEventKey],
+    dispatcher="roboFont",
+    delay=0,
+    debug=True
+)
+
+# The concept of "relevant" operator:
+# it is the operator that belongs to the font that belongs to the glyph that is in the editor.
+# yes, that means trouble if there are multiple designspaces open in which the current font is active.
+registerSubscriberEvent(
+    subscriberEventName=operatorChangedEventKey,
+    methodName="relevantOperatorChanged",
+    lowLevelEventNames=[operatorChangedEventKey],
+    dispatcher="roboFont",
+    delay=.25,
+    documentation="This is sent when the glyph editor subscriber finds there is a new relevant designspace.",
+    debug=True
+)
+
+registerSubscriberEvent(
+    subscriberEventName=previewChangedEventKey,
+    methodName="relevantPreviewChanged",
+    lowLevelEventNames=[previewChangedEventKey],
+    dispatcher="roboFont",
+    delay=.25,
+    documentation="This is sent when the glyph editor subscriber has a new preview location or glyph, for the values in the axes table.",
+    debug=True
+)
+
+registerSubscriberEvent(
+    subscriberEventName=navigatorLocationChangedEventKey,
+    methodName="navigatorLocationChanged",
+    lowLevelEventNames=[navigatorLocationChangedEventKey],
+    dispatcher="roboFont",
+    delay=0,
+    documentation="Posted by the Longboard Navigator Tool to the LongBoardUIController",
+    debug=True
+)
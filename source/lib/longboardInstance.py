@@ -0,0 +1,228 @@
+"""
+    Longboard preview instances.
+
+    Make Preview UFO makes an instance of the whole font at the preview
+    location, in the background, with MutatorMath and extrapolation:
+
+        job = PreviewInstanceJob(operator, instanceDescriptor, ufoPath, progress=progress, done=done)
+        job.start()
+        ...
+        job.cancel()
+
+    When the designspace and the sources are saved, the glyphs are made
+    on the process pool of longboardBatch, on all cores. With unsaved
+    edits the job makes them on its own thread, from a snapshot of the
+    sources taken when the job is made.
+
+    progress(count, total) and done(path, report) are called on the job
+    thread. When the job fails, the path is None and report["error"]
+    has the traceback.
+"""
+
+import copy
+import os
+import shutil
+import threading
+import time
+import traceback
+
+from fontTools.designspaceLib import DesignSpaceDocument
+from fontTools.ufoLib.glifLib import readGlyphFromString
+
+
+def makeJobOperator(operator, useVarlib=False, extrapolate=True):
+    # A copy of the operator for a background job.
+    # It shares the document and the source fonts, but has its own
+    # math model, extrapolation and ufoProcessor caches.
+    jobOperator = copy.copy(operator)
+    jobOperator.tempLib = dict(operator.tempLib)
+    jobOperator.useVarlib = useVarlib
+    jobOperator.extrapolate = extrapolate
+    return jobOperator
+
+
+def snapshotFont(font):
+    # a copy of the font that the designer can not change while a job reads it
+    if font is None:
+        return None
+    snapshot = font.__class__()
+    snapshot.setDataFromSerialization(font.getDataForSerialization())
+    return snapshot
+
+
+def snapshotSourceFonts(operator):
+    # the source fonts of the operator, as they are now
+    operator.loadFonts()
+    return {name: snapshotFont(font) for name, font in operator.fonts.items()}
+
+
+def sourcesAreSaved(operator):
+    # can worker processes open the designspace and the sources from disk
+    if operator.path is None or not os.path.exists(operator.path):
+        return False
+    operator.loadFonts()
+    for font in operator.fonts.values():
+        if font is None:
+            continue
+        if font.path is None or getattr(font, "dirty", True):
+            return False
+    # the designspace itself may have changed since it was saved
+    return operator.doc.tostring() == DesignSpaceDocument.fromfile(operator.path).tostring()
+
+
+def getInstanceGlyphNames(operator):
+    # the glyphs an instance has, without the excluded glyphs
+    # loadFonts lists operator.glyphNames before it loads the fonts
+    operator.loadFonts()
+    glyphNames = {name for font in operator.fonts.values() if font is not None for name in font.keys()}
+    excluded = set(operator.collectExcludedGlyphs())
+    return sorted(name for name in glyphNames if name not in excluded)
+
+
+def addMathGlyph(font, glyphName, mathGlyph):
+    # like ufoProcessor makeInstance puts the glyphs in the font
+    glyph = font.newGlyph(glyphName)
+    glyph.clear()
+    glyph.unicodes = mathGlyph.unicodes
+    if hasattr(glyph, "fromMathGlyph"):
+        glyph.fromMathGlyph(mathGlyph)
+    else:
+        mathGlyph.extractGlyph(glyph, onlyGeometry=True)
+    glyph.width = mathGlyph.width
+
+
+class PreviewInstanceJob:
+
+    # worker processes, None is one per core
+    workers = None
+    # glyphs per task for a worker process
+    chunkSize = 40
+    # seconds between progress reports
+    progressInterval = 0.1
+
+    def __init__(self, operator, instanceDescriptor, path, note=None, progress=None, done=None):
+        # this runs on the main thread: decide how the glyphs are made,
+        # and take the snapshot of unsaved sources here
+        self.operator = makeJobOperator(operator)
+        self.useProcesses = sourcesAreSaved(operator)
+        if not self.useProcesses:
+            self.operator.fonts = snapshotSourceFonts(operator)
+        self.instanceDescriptor = instanceDescriptor
+        self.path = path
+        self.note = note
+        self.progress = progress
+        self.done = done
+        self.cancelled = False
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="LongboardPreviewInstance", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _reportProgress(self, count, total):
+        now = time.perf_counter()
+        if self.progress is not None and now - self._lastReport > self.progressInterval:
+            self._lastReport = now
+            self.progress(count, total)
+
+    def _makeGlyphs(self, font, glyphNames, location, report):
+        # one glyph at a time on this thread, with the snapshot of the sources
+        for count, glyphName in enumerate(glyphNames, 2):
+            if self.cancelled:
+                return
+            try:
+                mathGlyph = self.operator.makeOneGlyph(
+                    glyphName,
+                    location=location,
+                    decomposeComponents=False,
+                    useVarlib=self.operator.useVarlib,
+                    roundGeometry=self.operator.roundGeometry,
+                    )
+            except Exception:
+                mathGlyph = None
+            if mathGlyph is None:
+                report["failed"].append(glyphName)
+            else:
+                addMathGlyph(font, glyphName, mathGlyph)
+            self._reportProgress(count, len(glyphNames) + 1)
+
+    def _makeFontWithProcesses(self, glyphNames, location, report):
+        # the font and the glyphs on the longboardBatch process pool,
+        # each process opens the designspace from disk
+        from longboardBatch import iterTasks, renderInstancePart
+        from longboardRecorder import packLocation
+        common = dict(location=packLocation(location), roundGeometry=self.operator.roundGeometry)
+        fontTask = dict(common, mode="font", glyphNames=glyphNames[:1], path=self.path, familyName=self.instanceDescriptor.familyName, styleName=self.instanceDescriptor.styleName)
+        tasks = [fontTask] + [
+            dict(common, mode="glyphs", glyphNames=glyphNames[index:index + self.chunkSize])
+            for index in range(1, len(glyphNames), self.chunkSize)
+            ]
+        font = None
+        count = 1
+        results = iterTasks(tasks, renderInstancePart, self.operator.path, useVarlib=self.operator.useVarlib, extrapolate=self.operator.extrapolate, workers=self.workers)
+        try:
+            for result in results:
+                if self.cancelled:
+                    break
+                if font is None:
+                    font = self.operator.fontClass(result["path"])
+                    continue
+                for glyphName, glif in result["glyphs"].items():
+                    count += 1
+                    if glif is None:
+                        report["failed"].append(glyphName)
+                        continue
+                    glyph = font.newGlyph(glyphName)
+                    readGlyphFromString(glif, glyph, glyph.getPointPen())
+                self._reportProgress(count, len(glyphNames))
+        finally:
+            results.close()
+        return font
+
+    def run(self):
+        startTime = time.perf_counter()
+        report = dict(glyphs=0, failed=[], cancelled=False, error=None, seconds=0)
+        path = None
+        self._lastReport = 0
+        try:
+            glyphNames = getInstanceGlyphNames(self.operator)
+            if not glyphNames:
+                # makeInstance would make every glyph for an empty list
+                raise ValueError("The designspace has no glyphs to make an instance with.")
+            location = self.instanceDescriptor.getFullDesignLocation(self.operator.doc)
+            if self.useProcesses:
+                font = self._makeFontWithProcesses(glyphNames, location, report)
+            else:
+                # the font, with the first glyph, the rest one at a time
+                font = self.operator.makeInstance(self.instanceDescriptor, glyphNames=glyphNames[:1], decomposeComponents=False)
+                self._makeGlyphs(font, glyphNames[1:], location, report)
+            if font is not None and font.lib.get("public.glyphOrder") == glyphNames[:1]:
+                font.lib["public.glyphOrder"] = glyphNames
+            if self.cancelled:
+                report["cancelled"] = True
+                if self.useProcesses and os.path.exists(self.path):
+                    # the font the first process saved
+                    shutil.rmtree(self.path)
+            else:
+                report["glyphs"] = len(font.keys())
+                if self.note is not None:
+                    font.info.note = self.note
+                font.save(self.path)
+                path = self.path
+            if font is not None and hasattr(font, "close"):
+                font.close()
+        except Exception:
+            report["error"] = traceback.format_exc()
+        finally:
+            # the copy has its own entries in the ufoProcessor cache
+            self.operator.changed()
+        report["seconds"] = round(time.perf_counter() - startTime, 3)
+        if self.done is not None:
+            self.done(path, report)
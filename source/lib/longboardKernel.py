@@ -0,0 +1,970 @@
+"""
+    Longboard interpolation kernels.
+
+    A kernel is the interpolation of one glyph at one discrete location,
+    compiled: the coordinates of the sources in one matrix, and the
+    math model as arrays that give the weight of each source.
+    An InstanceOutline is the result, it draws straight into a pen.
+"""
+
+import bisect
+import copy
+import math
+import threading
+import weakref
+from collections import OrderedDict
+import numpy
+
+from fontMath import MathGlyph
+from fontTools.pens.areaPen import AreaPen
+from mutatorMath.objects.location import Location
+from mutatorMath.objects.mutator import buildMutator, _EPSILON
+from ufoProcessor.varModels import VariationModelMutator
+
+
+def discreteLocationKey(discreteLocation):
+    # hashable version of a discrete location
+    if not discreteLocation:
+        return None
+    return tuple(sorted(discreteLocation.items()))
+
+
+def flattenMathGlyph(mathGlyph):
+    # return the point structure and the coordinates of a mathglyph
+    # structure: [(contourIdentifier, [(segmentType, smooth, name, identifier), ...]), ...]
+    # coordinates: [x0, y0, x1, y1, ..., width, height]
+    structure = []
+    coordinates = []
+    for contour in mathGlyph.contours:
+        contourStructure = []
+        for segmentType, pt, smooth, name, identifier in contour["points"]:
+            contourStructure.append((segmentType, smooth, name, identifier))
+            coordinates.append(pt[0])
+            coordinates.append(pt[1])
+        structure.append((contour["identifier"], contourStructure))
+    coordinates.append(mathGlyph.width or 0)
+    coordinates.append(mathGlyph.height or 0)
+    return structure, coordinates
+
+
+def segmentTypes(structure):
+    # only the segment types matter for compatibility
+    # smooth flags and names can differ between sources
+    return [[p[0] for p in contourStructure] for identifier, contourStructure in structure]
+
+
+class OutlineStructure:
+
+    # The contours and segments of a flattened mathglyph, prepared once.
+    # Point indices refer to the rows of the (n, 2) points array.
+    # Lines in mathglyphs are curves with the off curves on top of the
+    # on curves. Those are filtered like MathGlyph.extractGlyph does,
+    # so for each curve segment we keep the 4 indices to check.
+
+    def __init__(self, structure):
+        self.structure = structure
+        self.contours = []    # (closed, moveIndex, [(segmentType, [indices], curveIndex), ...])
+        self.contourRanges = []
+        pointTypes = []
+        smooth = []
+        contourIds = []
+        curveSegments = []
+        closedCurves = []
+        lineSegments = []
+        self.areaNeedsPen = False    # segments the area arrays can not handle
+        index = 0
+        for contourIndex, (contourIdentifier, contourStructure) in enumerate(structure):
+            count = len(contourStructure)
+            types = [p[0] for p in contourStructure]
+            for segmentType, pointSmooth, name, identifier in contourStructure:
+                pointTypes.append(segmentType)
+                smooth.append(bool(pointSmooth))
+                contourIds.append(contourIndex)
+            segments = []
+            onCurves = [i for i, t in enumerate(types) if t is not None]
+            if not onCurves:
+                # a quadratic contour without on curves
+                closed = True
+                moveIndex = None
+                segments.append(("qcurve", [index + i for i in range(count)], -1))
+                self.areaNeedsPen = True
+            else:
+                closed = types[0] != "move"
+                first = onCurves[0] if closed else 0
+                moveIndex = index + first
+                if closed:
+                    order = list(range(first + 1, count)) + list(range(0, first + 1))
+                else:
+                    order = range(1, count)
+                offCurves = []
+                previousOnCurve = moveIndex
+                for i in order:
+                    if types[i] is None:
+                        offCurves.append(index + i)
+                        continue
+                    curveIndex = -1
+                    if types[i] == "curve" and len(offCurves) == 2:
+                        curveIndex = len(curveSegments)
+                        curveSegments.append((previousOnCurve, offCurves[0], offCurves[1], index + i))
+                        closedCurves.append(closed)
+                    elif types[i] == "qcurve" or offCurves:
+                        self.areaNeedsPen = True
+                    elif closed and not offCurves:
+                        lineSegments.append((previousOnCurve, index + i))
+                    segments.append((types[i], offCurves + [index + i], curveIndex))
+                    offCurves = []
+                    previousOnCurve = index + i
+            self.contours.append((closed, moveIndex, segments))
+            self.contourRanges.append((index, index + count))
+            index += count
+        self.pointCount = index
+        self.offCurve = numpy.array([t is None for t in pointTypes], dtype=bool)
+        self.qcurve = numpy.array([t == "qcurve" for t in pointTypes], dtype=bool)
+        self.smooth = numpy.array(smooth, dtype=bool)
+        self.contourIds = numpy.array(contourIds, dtype=int)
+        self.pointTypes = pointTypes
+        self.curveSegments = numpy.array(curveSegments, dtype=int).reshape(-1, 4)
+        # for the area: the segments of the closed contours
+        self.closedCurves = numpy.array(closedCurves, dtype=bool)
+        self.lineSegments = numpy.array(lineSegments, dtype=int).reshape(-1, 2)
+        # for each on curve point, the curve segment it ends, or -1
+        self.curveOfPoint = numpy.full(self.pointCount, -1, dtype=int)
+        if len(curveSegments):
+            self.curveOfPoint[self.curveSegments[:, 3]] = numpy.arange(len(curveSegments))
+
+
+class InstanceOutline:
+
+    # An interpolated outline as arrays.
+    # points: (n, 2) array with all the mathglyph points,
+    #    redundant off curves included, but flagged.
+    # Make it with the raw coordinates, then round and move as needed.
+
+    redundantTolerance = 1e-9
+
+    def __init__(self, outlineStructure, coordinates, name=None, unicodes=None):
+        self.structure = outlineStructure
+        self.points = numpy.array(coordinates[:-2], dtype=float).reshape(-1, 2)
+        self.width = float(coordinates[-2])
+        self.height = float(coordinates[-1])
+        self.name = name
+        self.unicodes = unicodes or []
+        # redundant curves become lines, check before rounding, like extractGlyph
+        curves = self.structure.curveSegments
+        if len(curves):
+            p = self.points
+            self.redundant = (
+                (numpy.abs(p[curves[:, 0]] - p[curves[:, 1]]).max(axis=1) < self.redundantTolerance) &
+                (numpy.abs(p[curves[:, 2]] - p[curves[:, 3]]).max(axis=1) < self.redundantTolerance)
+                )
+        else:
+            self.redundant = numpy.zeros(0, dtype=bool)
+        self.removed = numpy.zeros(self.structure.pointCount, dtype=bool)
+        self.removed[curves[self.redundant, 1]] = True
+        self.removed[curves[self.redundant, 2]] = True
+        self._bounds = None
+        self._filteredContours = None
+
+    @classmethod
+    def fromMathGlyph(cls, mathGlyph):
+        # for results that did not come from a kernel
+        structure, coordinates = flattenMathGlyph(mathGlyph)
+        return cls(OutlineStructure(structure), coordinates, name=mathGlyph.name, unicodes=mathGlyph.unicodes)
+
+    def copy(self):
+        # round and moveBy make new arrays, the structure is shared
+        outline = copy.copy(self)
+        outline.points = self.points.copy()
+        return outline
+
+    def round(self):
+        # same rounding as fontParts: round half up
+        self.points = numpy.floor(self.points + 0.5)
+        self.width = math.floor(self.width + 0.5)
+        self.height = math.floor(self.height + 0.5)
+        self._bounds = None
+
+    def moveBy(self, offset):
+        dx, dy = offset
+        self.points = self.points + (dx, dy)
+        self._bounds = None
+
+    def draw(self, pen):
+        # draw with the segment pen protocol, the way extractGlyph and
+        # PointToSegmentPen would, without making the glyph first.
+        points = [tuple(p) for p in self.points.tolist()]
+        redundant = self.redundant.tolist()
+        for closed, moveIndex, segments in self.structure.contours:
+            lastPoint = None
+            if moveIndex is not None:
+                pen.moveTo(points[moveIndex])
+                lastPoint = points[moveIndex]
+            lastSegment = len(segments) - 1
+            for segmentIndex, (segmentType, indices, curveIndex) in enumerate(segments):
+                point = points[indices[-1]]
+                if segmentType == "curve" and not (curveIndex != -1 and redundant[curveIndex]):
+                    pen.curveTo(*[points[i] for i in indices])
+                elif segmentType == "qcurve":
+                    if moveIndex is None:
+                        pen.qCurveTo(*[points[i] for i in indices], None)
+                    else:
+                        pen.qCurveTo(*[points[i] for i in indices])
+                else:
+                    # a line, or a curve that is a line.
+                    # the closing line of a closed contour is implied
+                    if segmentIndex == lastSegment and closed and point != lastPoint:
+                        continue
+                    pen.lineTo(point)
+                lastPoint = point
+            if closed:
+                pen.closePath()
+            else:
+                pen.endPath()
+
+    def drawPoints(self, pointPen):
+        # draw the filtered points, the same points extractGlyph would draw.
+        points = [tuple(p) for p in self.points.tolist()]
+        removed = self.removed.tolist()
+        redundant = self.redundant.tolist()
+        curveOfPoint = self.structure.curveOfPoint.tolist()
+        index = 0
+        for contourIdentifier, contourStructure in self.structure.structure:
+            pointPen.beginPath(identifier=contourIdentifier)
+            for segmentType, smooth, name, identifier in contourStructure:
+                if not removed[index]:
+                    if curveOfPoint[index] != -1 and redundant[curveOfPoint[index]]:
+                        segmentType = "line"
+                    pointPen.addPoint(points[index], segmentType=segmentType, smooth=smooth, name=name, identifier=identifier)
+                index += 1
+            pointPen.endPath()
+
+    def extractGlyph(self, glyph):
+        # for when we really need a glyph: a defcon or fontParts glyph.
+        glyph.clearContours()
+        self.drawPoints(glyph.getPointPen())
+        glyph.width = self.width
+        glyph.height = self.height
+        return glyph
+
+    def getFilteredContours(self):
+        # for each contour, the indices of the points that are not removed
+        # so we can find points by the index they would have in a glyph.
+        if self._filteredContours is None:
+            kept = numpy.flatnonzero(~self.removed)
+            self._filteredContours = [kept[(kept >= start) & (kept < end)] for start, end in self.structure.contourRanges]
+        return self._filteredContours
+
+    def getPoint(self, contourIndex, pointIndex):
+        # the point at these indices, as they would be in the extracted glyph
+        index = self.getFilteredContours()[contourIndex][pointIndex]
+        x, y = self.points[index].tolist()
+        return x, y
+
+    @property
+    def bounds(self):
+        # xMin, yMin, xMax, yMax of the outline, including curve extremes
+        # or None if there are no points.
+        if self._bounds is None:
+            self._bounds = calcOutlineBounds(self)
+        return self._bounds
+
+
+def calcOutlineBounds(outline):
+    # Find the bounds with the on curves, and the extremes of the cubic segments.
+    # The derivative of a cubic is a quadratic, solve it for all segments at once.
+    # Quadratic segments use their control points.
+    structure = outline.structure
+    points = outline.points
+    if not len(points):
+        return None
+    candidates = [points[~structure.offCurve]]
+    qcurveOffCurves = numpy.zeros(len(points), dtype=bool)
+    for closed, moveIndex, segments in structure.contours:
+        for segmentType, indices, curveIndex in segments:
+            if segmentType == "qcurve":
+                qcurveOffCurves[indices] = True
+    candidates.append(points[qcurveOffCurves])
+    curves = structure.curveSegments[~outline.redundant]
+    if len(curves):
+        p0 = points[curves[:, 0]]
+        p1 = points[curves[:, 1]]
+        p2 = points[curves[:, 2]]
+        p3 = points[curves[:, 3]]
+        a = -p0 + 3 * p1 - 3 * p2 + p3
+        b = 2 * (p0 - 2 * p1 + p2)
+        c = p1 - p0
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            linear = numpy.abs(a) < 1e-12
+            root = numpy.sqrt(b * b - 4 * a * c)
+            t1 = numpy.where(linear, -c / b, (-b + root) / (2 * a))
+            t2 = numpy.where(linear, numpy.nan, (-b - root) / (2 * a))
+        for t in (t1, t2):
+            # t per segment, per axis. only the extremes inside the segment count
+            valid = numpy.isfinite(t) & (t > 0) & (t < 1)
+            t = numpy.where(valid, t, 0)
+            mt = 1 - t
+            values = mt**3 * p0 + 3 * mt**2 * t * p1 + 3 * mt * t**2 * p2 + t**3 * p3
+            values = numpy.where(valid, values, p0)
+            candidates.append(values)
+    allPoints = numpy.concatenate(candidates)
+    if not len(allPoints):
+        return None
+    xMin, yMin = allPoints.min(axis=0).tolist()
+    xMax, yMax = allPoints.max(axis=0).tolist()
+    return xMin, yMin, xMax, yMax
+
+
+def calcOutlineArea(outline):
+    # The signed area of the closed contours, the same value AreaPen finds,
+    # but with Green's theorem on all segments at once.
+    # Overlaps are not removed. Open contours have no area.
+    structure = outline.structure
+    if structure.areaNeedsPen:
+        pen = AreaPen()
+        outline.draw(pen)
+        return pen.value
+    points = outline.points
+    area = 0
+    lines = structure.lineSegments
+    if len(lines):
+        p0 = points[lines[:, 0]]
+        p1 = points[lines[:, 1]]
+        area -= ((p1[:, 0] - p0[:, 0]) * (p1[:, 1] + p0[:, 1])).sum() * 0.5
+    curves = structure.curveSegments[structure.closedCurves]
+    if len(curves):
+        p0 = points[curves[:, 0]]
+        x1, y1 = (points[curves[:, 1]] - p0).T
+        x2, y2 = (points[curves[:, 2]] - p0).T
+        x3, y3 = (points[curves[:, 3]] - p0).T
+        area -= ((x1 * (-y2 - y3) + x2 * (y1 - 2 * y3) + x3 * (y1 + 2 * y2)) * 0.15).sum()
+        # and the chord of each curve
+        p3 = points[curves[:, 3]]
+        area -= ((p3[:, 0] - p0[:, 0]) * (p3[:, 1] + p0[:, 1])).sum() * 0.5
+    return float(area)
+
+
+def findKinks(outline, res=3):
+    # Kink analysis.
+    # Smooth points with an off curve on either side, where the incoming and
+    # outgoing directions are not the same. The points are as they would be
+    # in the extracted glyph: redundant off curves removed.
+    # returns [(contourIndex, p1, p2, p3, severity), ...]
+    results = []
+    structure = outline.structure
+    kept = numpy.flatnonzero(~outline.removed)
+    if not len(kept):
+        return results
+    contourIds = structure.contourIds[kept]
+    position = numpy.arange(len(kept))
+    starts = numpy.searchsorted(contourIds, contourIds, side="left")
+    ends = numpy.searchsorted(contourIds, contourIds, side="right") - 1
+    previous = numpy.where(position == starts, ends, position - 1)
+    following = numpy.where(position == ends, starts, position + 1)
+    offCurve = structure.offCurve[kept]
+    candidates = structure.smooth[kept] & (offCurve[previous] | offCurve[following])
+    if not candidates.any():
+        return results
+    points = outline.points[kept]
+    p1 = points[previous[candidates]]
+    p2 = points[candidates]
+    p3 = points[following[candidates]]
+    v1 = p2 - p1
+    v2 = p3 - p2
+    l1 = numpy.hypot(v1[:, 0], v1[:, 1])
+    l2 = numpy.hypot(v2[:, 0], v2[:, 1])
+    # handles that sit on their point have no direction
+    valid = (l1 > 0) & (l2 > 0)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        dp = numpy.round(((v1 * v2).sum(axis=1)) / (l1 * l2), res)
+    kinks = valid & (dp < 1)
+    for contourIndex, a, b, c, d in zip(contourIds[candidates][kinks].tolist(), p1[kinks].tolist(), p2[kinks].tolist(), p3[kinks].tolist(), dp[kinks].tolist()):
+        results.append((contourIndex, tuple(a), tuple(b), tuple(c), (1 - d) * 100))
+    return results
+
+
+class VarLibWeights:
+
+    # The varLib model of a kernel as arrays.
+    # lower, peak, upper: one row per support, one column per axis.
+    # Every support is then one row of the same supportScalar expression.
+    # The delta weights in getMasterScalars are linear, so they are
+    # one matrix that turns the support scalars into the master weights.
+
+    def __init__(self, weightModel):
+        model = weightModel.model
+        self.normalize = weightModel._normalize
+        self.extrapolate = model.extrapolate
+        self.axisNames = sorted({axis for support in model.supports for axis in support})
+        axisIndex = {axis: index for index, axis in enumerate(self.axisNames)}
+        shape = (len(model.supports), len(self.axisNames))
+        self.lower = numpy.zeros(shape)
+        self.peak = numpy.zeros(shape)
+        self.upper = numpy.zeros(shape)
+        for supportIndex, support in enumerate(model.supports):
+            for axis, (lower, peak, upper) in support.items():
+                self.lower[supportIndex, axisIndex[axis]] = lower
+                self.peak[supportIndex, axisIndex[axis]] = peak
+                self.upper[supportIndex, axisIndex[axis]] = upper
+        # the supports that do not take part for an axis, like supportScalar skips them
+        self.skip = (self.peak == 0) | (self.lower > self.peak) | (self.peak > self.upper) | ((self.lower < 0) & (self.upper > 0))
+        # the slopes on both sides of the peak, zero where the side has no width
+        belowWidth = self.peak - self.lower
+        aboveWidth = self.peak - self.upper
+        self.belowSlope = numpy.divide(1, belowWidth, out=numpy.zeros(shape), where=belowWidth != 0)
+        self.aboveSlope = numpy.divide(1, aboveWidth, out=numpy.zeros(shape), where=aboveWidth != 0)
+        axisRanges = [model.axisRanges.get(axis, (-1, 1)) for axis in self.axisNames]
+        self.axisMinimum = numpy.array([axisMinimum for axisMinimum, axisMaximum in axisRanges], dtype=float)
+        self.axisMaximum = numpy.array([axisMaximum for axisMinimum, axisMaximum in axisRanges], dtype=float)
+        masterScalars = numpy.eye(len(model.supports))
+        for index, deltaWeights in reversed(list(enumerate(model.deltaWeights))):
+            for otherIndex, weight in deltaWeights.items():
+                masterScalars[otherIndex] -= masterScalars[index] * weight
+        self.scalarMatrix = masterScalars[model.mapping]
+
+    def getWeights(self, continuousLocation):
+        normalized = self.normalize(continuousLocation)
+        v = numpy.array([normalized.get(axis, 0.0) for axis in self.axisNames])
+        lower, peak, upper = self.lower, self.peak, self.upper
+        below = (v - lower) * self.belowSlope
+        above = (v - upper) * self.aboveSlope
+        scalars = numpy.where(v < peak, below, above)
+        scalars = numpy.where((v <= lower) | (upper <= v), 0.0, scalars)
+        if self.extrapolate:
+            axisMinimum, axisMaximum = self.axisMinimum, self.axisMaximum
+            beforeMinimum = (v < axisMinimum) & (lower <= axisMinimum)
+            afterMaximum = ~beforeMinimum & (axisMaximum < v) & (axisMaximum <= upper)
+            scalars = numpy.where(beforeMinimum & (peak <= axisMinimum) & (peak < upper), above, scalars)
+            scalars = numpy.where(beforeMinimum & (axisMinimum < peak), below, scalars)
+            scalars = numpy.where(afterMaximum & (axisMaximum <= peak) & (lower < peak), below, scalars)
+            scalars = numpy.where(afterMaximum & (peak < axisMaximum), above, scalars)
+        scalars = numpy.where(self.skip | (v == peak), 1.0, scalars)
+        return self.scalarMatrix @ scalars.prod(axis=1)
+
+
+class MutatorWeights:
+
+    # The mutatorMath model of a kernel as arrays.
+    # The deltas of the mutator are stacked in one matrix, the on-axis
+    # deltas first, then the off-axis deltas. A location only has to find
+    # the factor of each delta: the on-axis factors are a piecewise linear
+    # function of the axis values, the off-axis factors depend on the
+    # limits of the location on each axis. Both are the same as
+    # Mutator.getFactors, but for all deltas at once.
+
+    def __init__(self, weightModel):
+        self.bias = dict(weightModel._bias)
+        self.neutral = numpy.array(weightModel.getNeutral(), dtype=float)
+        self.axisNames = sorted(weightModel.getAxisNames())
+        axisIndex = {axis: index for index, axis in enumerate(self.axisNames)}
+        onAxis = []
+        offAxis = []
+        # the values of the deltas on each axis, for the limits
+        limitValues = [set() for axis in self.axisNames]
+        for locationTuple, (delta, deltaName) in weightModel.items():
+            location = Location(locationTuple)
+            for axis, value in locationTuple:
+                limitValues[axisIndex[axis]].add(value)
+            deltaAxis = location.isOnAxis()
+            if deltaAxis is None:
+                # the origin, the delta is zero
+                continue
+            if deltaAxis:
+                onAxis.append((axisIndex[deltaAxis], location[deltaAxis], delta))
+            else:
+                offAxis.append(([location.get(axis, 0) for axis in self.axisNames], delta))
+        self.limitValues = [sorted(values) for values in limitValues]
+        # the on-axis values for each axis, with the origin
+        axisValues = {}
+        for index, value, delta in onAxis:
+            axisValues.setdefault(index, {0}).add(value)
+        self.onAxisTables = [(index, sorted(values)) for index, values in sorted(axisValues.items())]
+        tableIndex = {index: tableNumber for tableNumber, (index, values) in enumerate(self.onAxisTables)}
+        self.onAxisTable = numpy.array([tableIndex[index] for index, value, delta in onAxis], dtype=int)
+        self.onAxisValues = numpy.array([value for index, value, delta in onAxis], dtype=float)
+        self.offAxisValues = numpy.array([values for values, delta in offAxis], dtype=float).reshape(len(offAxis), len(self.axisNames))
+        self.deltas = numpy.array([delta for index, value, delta in onAxis] + [delta for values, delta in offAxis], dtype=float).reshape(-1, len(self.neutral))
+
+    def getOnAxisFactors(self, current):
+        # Mutator._calcOnAxisFactor: between the two neighbouring values
+        # on the axis, or past the last two values when extrapolating.
+        tableCount = len(self.onAxisTables)
+        f = numpy.empty(tableCount)
+        low = numpy.empty(tableCount)
+        high = numpy.empty(tableCount)
+        exact = numpy.zeros(tableCount, dtype=bool)
+        for tableNumber, (index, values) in enumerate(self.onAxisTables):
+            value = current[index]
+            position = bisect.bisect_left(values, value)
+            if position < len(values) and values[position] == value:
+                exact[tableNumber] = True
+            position = min(max(position, 1), len(values) - 1)
+            f[tableNumber] = value
+            low[tableNumber] = values[position - 1]
+            high[tableNumber] = values[position]
+        f, low, high, exact = f[self.onAxisTable], low[self.onAxisTable], high[self.onAxisTable], exact[self.onAxisTable]
+        v = self.onAxisValues
+        factors = numpy.where(v == high, (f - low) / (high - low), numpy.where(v == low, (f - high) / (low - high), 0.0))
+        matched = ((f - _EPSILON < v) & (f + _EPSILON > v)) | (f == v)
+        return numpy.where(exact, matched.astype(float), factors)
+
+    def getLimits(self, current):
+        # mutatorMath getLimits for each axis, with nan for None:
+        #   limits: below, at and above the location
+        #   factors: the factor of a delta before the location when it is at the
+        #   at value, and when it is not, then the same for a delta after the location.
+        axisCount = len(self.axisNames)
+        limits = numpy.full((3, axisCount), numpy.nan)
+        factors = numpy.ones((4, axisCount))
+        for index, values in enumerate(self.limitValues):
+            f = current[index]
+            if -_EPSILON < f < _EPSILON:
+                values = [value for value in values if not (-_EPSILON < value < _EPSILON)]
+            if not values:
+                continue
+            less = set()
+            more = set()
+            equal = f == 0
+            if f > 0:
+                less.add(0)
+            elif f < 0:
+                more.add(0)
+            for value in values:
+                if f < value - _EPSILON:
+                    more.add(value)
+                elif f > value + _EPSILON:
+                    less.add(value)
+                else:
+                    equal = True
+            if equal:
+                factors[:, index] = 0
+            elif less and more:
+                below = max(less)
+                above = min(more)
+                limits[0, index] = below
+                limits[2, index] = above
+                factors[:2, index] = (f - below) / (above - below)
+                factors[2:, index] = (above - f) / (above - below)
+            elif len(more) > 1:
+                # extrapolating below the values
+                at, above = sorted(more)[:2]
+                limits[1:, index] = at, above
+                t = abs(f - above) / abs(at - above)
+                factors[:, index] = t, 1 - t, 0, 0
+            elif len(less) > 1:
+                # extrapolating above the values
+                below, at = sorted(less)[-2:]
+                limits[:2, index] = below, at
+                t = abs(f - below) / abs(below - at)
+                factors[:, index] = 0, 0, t, 1 - t
+        return limits, factors
+
+    def getOffAxisFactors(self, current):
+        # Mutator._calcOffAxisFactor for all off-axis deltas and axes at once
+        (below, at, above), (beforeAt, beforeOther, afterAt, afterOther) = self.getLimits(current)
+        v = self.offAxisValues
+        isAt = v == at
+        factors = numpy.where(
+            current < v - _EPSILON,
+            numpy.where(isAt, beforeAt, beforeOther),
+            numpy.where(current > v + _EPSILON, numpy.where(isAt, afterAt, afterOther), 1.0))
+        factors[(v > above) | (v < below)] = 0
+        return factors.prod(axis=1)
+
+    def getWeights(self, continuousLocation):
+        current = numpy.array([continuousLocation.get(axis, 0) - self.bias.get(axis, 0) for axis in self.axisNames], dtype=float)
+        factors = []
+        if self.onAxisTables:
+            factors.append(self.getOnAxisFactors(current))
+        if len(self.offAxisValues):
+            factors.append(self.getOffAxisFactors(current))
+        if not factors:
+            return self.neutral.copy()
+        factors = numpy.concatenate(factors)
+        # getFactors leaves out the deltas with a factor of zero
+        factors[(-_EPSILON < factors) & (factors < _EPSILON)] = 0
+        return self.neutral + factors @ self.deltas
+
+
+class InterpolationKernel:
+
+    # A compiled model for one glyph, one discrete location and one math model.
+    # matrix: one row per source, one column per coordinate
+    # weightModel: mutatorMath or varLib model that has the unit vectors
+    #   of the sources as masters, so an instance of the model is the list
+    #   of weights for each source.
+    # weights: the same model as arrays, so the weights of a new location
+    #   are a few vectorized expressions instead of a walk through the model.
+
+    def __init__(self, glyphName, discreteLocation, useVarlib, structure, matrix, weightModel, template):
+        self.glyphName = glyphName
+        self.discreteLocation = discreteLocation
+        self.useVarlib = useVarlib
+        self.structure = structure
+        self.matrix = matrix
+        self.weightModel = weightModel
+        if useVarlib:
+            self.weights = VarLibWeights(weightModel)
+        else:
+            self.weights = MutatorWeights(weightModel)
+        self.template = template
+        self.sourceCount = matrix.shape[0]
+        self.pointCount = (matrix.shape[1] - 2) // 2
+        self.outlineStructure = OutlineStructure(structure)
+        # the columns that follow the horizontal location: the x coordinates and the width
+        self.horizontalColumns = numpy.zeros(matrix.shape[1], dtype=bool)
+        self.horizontalColumns[0:-2:2] = True
+        self.horizontalColumns[-2] = True
+
+    def getWeights(self, continuousLocation):
+        # the scalar evaluation: the weight of each source at this location
+        return self.weights.getWeights(continuousLocation)
+
+    def interpolate(self, continuousLocation):
+        # return the interpolated coordinates: [x0, y0, ..., width, height]
+        return self.getWeights(continuousLocation) @ self.matrix
+
+    def interpolateAnisotropic(self, horizontalLocation, verticalLocation):
+        # both weight sets in one product with the matrix,
+        # then the x columns from the first row, the y columns from the second.
+        weights = numpy.vstack((self.getWeights(horizontalLocation), self.getWeights(verticalLocation)))
+        horizontal, vertical = weights @ self.matrix
+        return numpy.where(self.horizontalColumns, horizontal, vertical)
+
+    def makeOutline(self, coordinates):
+        # the interpolated coordinates as an outline, ready to draw
+        return InstanceOutline(self.outlineStructure, coordinates, name=self.glyphName, unicodes=self.template.unicodes)
+
+    def makeMathGlyph(self, coordinates):
+        # put the interpolated coordinates back in a mathglyph
+        # so it can be extracted like any other result from the operator.
+        mathGlyph = MathGlyph(None, strict=self.template.strict)
+        mathGlyph.name = self.template.name
+        mathGlyph.unicodes = list(self.template.unicodes or [])
+        mathGlyph.lib = {}
+        points = coordinates[:-2].reshape(-1, 2).tolist()
+        index = 0
+        for contourIdentifier, contourStructure in self.structure:
+            contourPoints = []
+            for segmentType, smooth, name, identifier in contourStructure:
+                contourPoints.append((segmentType, tuple(points[index]), smooth, name, identifier))
+                index += 1
+            mathGlyph.contours.append(dict(identifier=contourIdentifier, points=contourPoints))
+        mathGlyph.width = float(coordinates[-2])
+        mathGlyph.height = float(coordinates[-1])
+        return mathGlyph
+
+
+def compileGlyphKernel(operator, glyphName, discreteLocation=None, useVarlib=False):
+    # Collect the sources the same way the operator does for makeOneGlyph
+    # and compile them into a kernel. Return None if the sources
+    # are not point compatible, then the operator needs to do the work.
+    items, unicodes = operator.collectSourcesForGlyph(glyphName=glyphName, decomposeComponents=True, discreteLocation=discreteLocation)
+    if not items:
+        return None
+    defaultContinuous, _ = operator.splitLocation(operator.newDefaultLocation(bend=True, discreteLocation=discreteLocation))
+    structure = None
+    template = None
+    rows = []
+    locations = []
+    for continuousLocation, sourceMath, sourceInfo in items:
+        sourceStructure, row = flattenMathGlyph(sourceMath)
+        if structure is None:
+            structure = sourceStructure
+        elif segmentTypes(sourceStructure) != segmentTypes(structure):
+            return None
+        if template is None or all(continuousLocation.get(name, value) == value for name, value in defaultContinuous.items()):
+            # prefer the default source for the smooth flags and names
+            template = sourceMath
+            structure = sourceStructure
+        rows.append(row)
+        locations.append(continuousLocation)
+    matrix = numpy.array(rows, dtype=float)
+    basis = numpy.eye(len(rows))
+    try:
+        if useVarlib:
+            weightModel = VariationModelMutator([(loc, i) for i, loc in enumerate(locations)], axes=operator.axes, extrapolate=True)
+        else:
+            bias, weightModel = buildMutator([(loc, basis[i]) for i, loc in enumerate(locations)], axes=operator.getContinuousAxesForMutator(), bias=defaultContinuous)
+    except Exception:
+        # no neutral, double locations, or anything else the models do not like.
+        return None
+    return InterpolationKernel(glyphName, discreteLocation, useVarlib, structure, matrix, weightModel, template)
+
+
+class KernelCache:
+
+    # Kernels per operator, per glyph, per discrete location, per math model.
+    # Incompatible glyphs are stored as None so we don't try again every frame.
+    # Like the SourceOutlineCache, an entry keeps the revision of every
+    # glyph it was made from, the glyph and its components. glyphChanged
+    # bumps a revision and removes the kernels that used the glyph.
+    # The warm-up thread compiles kernels too, with a copy of the operator.
+    # A kernel is compiled outside the lock, the lock is only held to
+    # store it. A kernel whose glyphs changed during the compile, or
+    # whose operator changed, is not stored.
+
+    def __init__(self):
+        self._kernels = weakref.WeakKeyDictionary()
+        self._revisions = weakref.WeakKeyDictionary()
+        self._generations = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+
+    def getRevision(self, operator, glyphName):
+        return self._revisions.get(operator, {}).get(glyphName, 0)
+
+    def _getCurrentEntry(self, operator, key):
+        # the (revisions, kernel) entry, if none of its glyphs changed since
+        operatorKernels = self._kernels.get(operator)
+        if operatorKernels is None:
+            return None
+        entry = operatorKernels.get(key)
+        if entry is None:
+            return None
+        revisions, kernel = entry
+        if any(self.getRevision(operator, name) != revision for name, revision in revisions.items()):
+            return None
+        return entry
+
+    def getKernel(self, operator, glyphName, discreteLocation=None, useVarlib=False, compileOperator=None):
+        # compileOperator: the operator to compile with, other threads pass
+        # a copy of the operator. The kernel is stored for operator.
+        key = glyphName, discreteLocationKey(discreteLocation), useVarlib
+        entry = self._getCurrentEntry(operator, key)
+        if entry is not None:
+            return entry[1]
+        if compileOperator is None:
+            compileOperator = operator
+        # the revisions before the compile, a change during the compile makes it stale
+        with self._lock:
+            generation = self._generations.get(operator, 0)
+            revisions = {name: self.getRevision(operator, name) for name in collectComponentNames(compileOperator, glyphName)}
+        kernel = compileGlyphKernel(compileOperator, glyphName, discreteLocation=discreteLocation, useVarlib=useVarlib)
+        with self._lock:
+            if generation != self._generations.get(operator, 0):
+                return kernel
+            if any(self.getRevision(operator, name) != revision for name, revision in revisions.items()):
+                return kernel
+            entry = self._getCurrentEntry(operator, key)
+            if entry is None:
+                entry = revisions, kernel
+                self._kernels.setdefault(operator, {})[key] = entry
+            return entry[1]
+
+    def hasKernel(self, operator, glyphName, discreteLocation=None, useVarlib=False):
+        # is this kernel compiled already, or known to be impossible
+        return self._getCurrentEntry(operator, (glyphName, discreteLocationKey(discreteLocation), useVarlib)) is not None
+
+    def getKernelForLocation(self, operator, glyphName, location, useVarlib=False):
+        # The kernel for this location and the continuous part of the location.
+        # Returns None, None if the kernel can't handle this glyph or location.
+        continuousLocation, discreteLocation = operator.splitLocation(location)
+        if discreteLocation is not None and not operator.checkDiscreteAxisValues(discreteLocation):
+            return None, None
+        kernel = self.getKernel(operator, glyphName, discreteLocation=discreteLocation, useVarlib=useVarlib)
+        if kernel is None:
+            return None, None
+        return kernel, continuousLocation
+
+    def makeOutline(self, operator, glyphName, location, useVarlib=False):
+        # The kernel version of operator.makeOneGlyph, as an InstanceOutline
+        # Returns None if the kernel can't handle this glyph or location.
+        kernel, continuousLocation = self.getKernelForLocation(operator, glyphName, location, useVarlib=useVarlib)
+        if kernel is None:
+            return None
+        if operator.isAnisotropic(continuousLocation):
+            horizontalLocation, verticalLocation = [dict(part) for part in operator.splitAnisotropic(continuousLocation)]
+            if not operator.extrapolate:
+                horizontalLocation = operator.clipDesignLocation(horizontalLocation)
+                verticalLocation = operator.clipDesignLocation(verticalLocation)
+            return kernel.makeOutline(kernel.interpolateAnisotropic(horizontalLocation, verticalLocation))
+        if not operator.extrapolate:
+            continuousLocation = operator.clipDesignLocation(continuousLocation)
+        return kernel.makeOutline(kernel.interpolate(continuousLocation))
+
+    def glyphChanged(self, operator, glyphName):
+        # a source glyph has changed, remove the kernels of all
+        # the glyphs that use it, itself or as a component.
+        with self._lock:
+            operatorRevisions = self._revisions.setdefault(operator, {})
+            operatorRevisions[glyphName] = operatorRevisions.get(glyphName, 0) + 1
+            operatorKernels = self._kernels.get(operator)
+            if not operatorKernels:
+                return
+            for key, (revisions, kernel) in list(operatorKernels.items()):
+                if glyphName in revisions:
+                    del operatorKernels[key]
+
+    def operatorChanged(self, operator):
+        # sources or axes have changed, remove everything for this operator
+        with self._lock:
+            self._generations[operator] = self._generations.get(operator, 0) + 1
+            self._kernels.pop(operator, None)
+
+
+def makeInstanceOutline(operator, glyphName, location, useVarlib=False, cache=True):
+    # The preview outline for this glyph and location.
+    # A location that was visited before comes from the preview cache.
+    # Use the compiled kernel for this glyph if the sources allow it,
+    # otherwise the operator does the whole calculation.
+    # Scans that visit each location once can leave the cache out.
+    if cache:
+        key = previewOutlines.makeKey(operator, glyphName, location, useVarlib)
+        outline = previewOutlines.get(operator, key)
+        if outline is not None:
+            return outline
+    outline = interpolationKernels.makeOutline(operator, glyphName, location, useVarlib=useVarlib)
+    if outline is None:
+        mathGlyph = operator.makeOneGlyph(glyphName, location=location, useVarlib=useVarlib)
+        if mathGlyph is None:
+            return None
+        outline = InstanceOutline.fromMathGlyph(mathGlyph)
+    if cache:
+        previewOutlines.set(operator, key, outline)
+    return outline
+
+
+def collectComponentNames(operator, glyphName):
+    # the names of all the glyphs this glyph is made of, in any of the sources
+    names = set()
+    todo = [glyphName]
+    while todo:
+        name = todo.pop()
+        if name in names:
+            continue
+        names.add(name)
+        for font in operator.fonts.values():
+            if font is None or name not in font:
+                continue
+            for component in font[name].components:
+                todo.append(component.baseGlyph)
+    return names
+
+
+class SourceOutlineCache:
+
+    # The decomposed source glyphs of a glyph at a discrete location,
+    # as InstanceOutlines without an alignment shift.
+    # Per operator, keyed by glyph name and discrete location.
+    # An entry keeps the revision of every glyph it was made from,
+    # the glyph and its components. glyphChanged bumps a revision
+    # and the entries that used the glyph are made again when asked.
+
+    def __init__(self):
+        self._outlines = weakref.WeakKeyDictionary()
+        self._revisions = weakref.WeakKeyDictionary()
+
+    def getRevision(self, operator, glyphName):
+        return self._revisions.get(operator, {}).get(glyphName, 0)
+
+    def getSourceOutlines(self, operator, glyphName, discreteLocation=None):
+        # returns [(continuousLocation, outline, sourceInfo), ...]
+        operatorOutlines = self._outlines.setdefault(operator, {})
+        key = glyphName, discreteLocationKey(discreteLocation)
+        entry = operatorOutlines.get(key)
+        if entry is not None:
+            revisions, sourceOutlines = entry
+            if all(self.getRevision(operator, name) == revision for name, revision in revisions.items()):
+                return sourceOutlines
+        items, unicodes = operator.collectSourcesForGlyph(glyphName=glyphName, decomposeComponents=True, discreteLocation=discreteLocation)
+        sourceOutlines = [(continuousLocation, InstanceOutline.fromMathGlyph(mathGlyph), sourceInfo) for continuousLocation, mathGlyph, sourceInfo in items]
+        revisions = {name: self.getRevision(operator, name) for name in collectComponentNames(operator, glyphName)}
+        operatorOutlines[key] = revisions, sourceOutlines
+        return sourceOutlines
+
+    def glyphChanged(self, operator, glyphName):
+        operatorRevisions = self._revisions.setdefault(operator, {})
+        operatorRevisions[glyphName] = operatorRevisions.get(glyphName, 0) + 1
+
+    def operatorChanged(self, operator):
+        self._outlines.pop(operator, None)
+
+
+def quantizeValue(value, precision):
+    # anisotropic values are (x, y) tuples
+    if isinstance(value, tuple):
+        return tuple(round(v / precision) for v in value)
+    return round(value / precision)
+
+
+class PreviewOutlineCache:
+
+    # The preview outlines of the locations that were visited recently.
+    # Designers scrub back and forth over the same part of the designspace,
+    # a revisit does not need to interpolate again.
+    # Per operator, a bounded LRU keyed by glyph name, the location
+    # quantized to precision axis units, the math model, anisotropy,
+    # extrapolation and the revision of the sources.
+    # glyphChanged and operatorChanged bump the revision, the old
+    # entries are removed. get returns a copy, the caller can change it.
+
+    maxSize = 512
+    precision = 0.01
+
+    def __init__(self, maxSize=None, precision=None):
+        if maxSize is not None:
+            self.maxSize = maxSize
+        if precision is not None:
+            self.precision = precision
+        self._outlines = weakref.WeakKeyDictionary()
+        self._revisions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.counters = dict(hits=0, misses=0, evictions=0, invalidations=0)
+
+    def getRevision(self, operator):
+        return self._revisions.get(operator, 0)
+
+    def makeKey(self, operator, glyphName, location, useVarlib):
+        quantized = tuple(sorted((name, quantizeValue(value, self.precision)) for name, value in location.items()))
+        anisotropic = any(isinstance(value, tuple) for value in location.values())
+        return glyphName, quantized, bool(useVarlib), anisotropic, bool(operator.extrapolate), self.getRevision(operator)
+
+    def get(self, operator, key):
+        with self._lock:
+            operatorOutlines = self._outlines.get(operator)
+            outline = None
+            if operatorOutlines is not None:
+                outline = operatorOutlines.get(key)
+            if outline is None:
+                self.counters["misses"] += 1
+                return None
+            operatorOutlines.move_to_end(key)
+            self.counters["hits"] += 1
+        return outline.copy()
+
+    def set(self, operator, key, outline):
+        with self._lock:
+            operatorOutlines = self._outlines.get(operator)
+            if operatorOutlines is None:
+                operatorOutlines = self._outlines[operator] = OrderedDict()
+            if key[-1] != self.getRevision(operator):
+                # the sources changed while this outline was made
+                return
+            operatorOutlines[key] = outline.copy()
+            operatorOutlines.move_to_end(key)
+            while len(operatorOutlines) > self.maxSize:
+                operatorOutlines.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def glyphChanged(self, operator, glyphName):
+        # A source glyph changed. It can be a component of other glyphs,
+        # so nothing in the cache can be trusted for this operator.
+        self.operatorChanged(operator)
+
+    def operatorChanged(self, operator):
+        with self._lock:
+            self._revisions[operator] = self._revisions.get(operator, 0) + 1
+            self._outlines.pop(operator, None)
+            self.counters["invalidations"] += 1
+
+    def getCounters(self):
+        counters = dict(self.counters)
+        asked = counters["hits"] + counters["misses"]
+        counters["hitRate"] = round(counters["hits"] / asked, 3) if asked else 0
+        counters["size"] = sum(len(operatorOutlines) for operatorOutlines in list(self._outlines.values()))
+        return counters
+
+
+# shared by all glyph editors
+interpolationKernels = KernelCache()
+sourceOutlines = SourceOutlineCache()
+previewOutlines = PreviewOutlineCache()
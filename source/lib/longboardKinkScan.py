@@ -0,0 +1,168 @@
+"""
+    Longboard kink scan.
+
+    Looks for kinks in all the glyphs of a designspace at sampled
+    locations, on a pool of processes. The report, JSON and CSV, goes in
+    a "kinks" folder next to the designspace, worst kink first.
+
+        python longboardKinkScan.py MyFamily.designspace
+        python longboardKinkScan.py MyFamily.designspace --method sobol --count 512
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from ufoProcessor.ufoOperator import UFOOperator
+
+from longboardBatch import runTasks, getWorkerOperator
+from longboardInstance import getInstanceGlyphNames
+from longboardKernel import makeInstanceOutline, findKinks
+from longboardRecorder import makeOutputPath, packLocation, unpackLocation
+from longboardSampling import samplingMethods, sampleLocations
+
+kinkReportVersion = 1
+kinkReportFileExtension = ".json"
+kinksFolderName = "kinks"
+
+
+def scanGlyphs(task):
+    # Find the worst kink of each contour of these glyphs, in a worker process.
+    # returns (rows, failedGlyphNames)
+    operator = getWorkerOperator()
+    locations = [unpackLocation(location) for location in task["locations"]]
+    rows = []
+    failed = []
+    for glyphName in task["glyphNames"]:
+        worst = {}
+        for location in locations:
+            outline = makeInstanceOutline(operator, glyphName, location, useVarlib=operator.useVarlib, cache=False)
+            if outline is None:
+                failed.append(glyphName)
+                break
+            for contourIndex, p1, p2, p3, severity in findKinks(outline):
+                if severity < task["threshold"]:
+                    continue
+                row = worst.get(contourIndex)
+                if row is None:
+                    row = worst[contourIndex] = dict(glyph=glyphName, contour=contourIndex, severity=0, point=None, location=None, count=0)
+                row["count"] += 1
+                if severity > row["severity"]:
+                    row["severity"] = round(severity, 3)
+                    row["point"] = [round(p2[0], 2), round(p2[1], 2)]
+                    row["location"] = packLocation(location)
+        rows.extend(worst[contourIndex] for contourIndex in sorted(worst))
+    return rows, failed
+
+
+def sortKinkRows(rows):
+    return sorted(rows, key=lambda row: (-row["severity"], row["glyph"], row["contour"]))
+
+
+def writeKinkReport(basePath, report):
+    # writes basePath.json and basePath.csv, returns the paths
+    jsonPath = basePath + kinkReportFileExtension
+    csvPath = basePath + ".csv"
+    with open(jsonPath, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    axisNames = report["axes"]
+    with open(csvPath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["severity", "glyph", "contour", "x", "y", "locations with kinks"] + axisNames)
+        for row in report["kinks"]:
+            location = row["location"]
+            writer.writerow([row["severity"], row["glyph"], row["contour"], row["point"][0], row["point"][1], row["count"]] + [location.get(name) for name in axisNames])
+    return jsonPath, csvPath
+
+
+def readKinkReport(path):
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("version") != kinkReportVersion:
+        raise ValueError(f"Unknown kink report version {report.get('version')}: {path}")
+    return report
+
+
+def findKinkReports(folder):
+    # the kink reports in this folder, the newest last
+    if folder is None or not os.path.exists(folder):
+        return []
+    paths = [os.path.join(folder, fileName) for fileName in os.listdir(folder) if fileName.startswith("Kinks_") and fileName.endswith(kinkReportFileExtension)]
+    return sorted(paths, key=os.path.getmtime)
+
+
+def getGlyphKinks(report, glyphName):
+    # the rows for this glyph, worst first, with the locations as Longboard uses them
+    rows = [dict(row) for row in report["kinks"] if row["glyph"] == glyphName]
+    for row in rows:
+        row["location"] = unpackLocation(row["location"])
+    return sortKinkRows(rows)
+
+
+def makeKinkReportPath(designspacePath, folderName=kinksFolderName):
+    # the path without the extension, writeKinkReport adds them
+    return makeOutputPath(designspacePath, folderName, "Kinks", "")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Scan all glyphs of a designspace for kinks.")
+    parser.add_argument("designspace", help="the .designspace file")
+    parser.add_argument("--method", choices=samplingMethods, default="halton", help="how the locations are sampled")
+    parser.add_argument("--count", type=int, default=256, help="number of sampled locations, for each discrete location")
+    parser.add_argument("--steps", type=int, default=5, help="values on each axis, for the grid")
+    parser.add_argument("--threshold", type=float, default=0, help="ignore kinks with a smaller severity")
+    parser.add_argument("--glyphs", nargs="*", help="only these glyphs")
+    parser.add_argument("--varlib", action="store_true", help="interpolate with VarLib instead of MutatorMath")
+    parser.add_argument("--output", help="the output folder, the default is the kinks folder next to the designspace")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes, the default is one per core")
+    args = parser.parse_args(args)
+
+    designspacePath = os.path.abspath(args.designspace)
+    operator = UFOOperator(designspacePath)
+    glyphNames = args.glyphs or getInstanceGlyphNames(operator)
+    locations = [packLocation(location) for location in sampleLocations(operator, args.method, count=args.count, steps=args.steps)]
+    axisNames = [axis.name for axis in operator.doc.axes]
+    # small tasks, so the slow glyphs are spread over the processes
+    chunkSize = max(1, min(20, len(glyphNames) // (4 * (args.workers or os.cpu_count() or 1))))
+    tasks = [
+        dict(glyphNames=glyphNames[index:index + chunkSize], locations=locations, threshold=args.threshold)
+        for index in range(0, len(glyphNames), chunkSize)
+        ]
+    print(f"LongBoard reports: {len(glyphNames)} glyphs at {len(locations)} locations")
+    startTime = time.perf_counter()
+    done = [0]
+
+    def report(result):
+        done[0] += 1
+        print(f"\r{done[0]} of {len(tasks)}", end="", file=sys.stderr)
+
+    results = runTasks(tasks, scanGlyphs, designspacePath, useVarlib=args.varlib, extrapolate=False, workers=args.workers, report=report)
+    print(file=sys.stderr)
+    rows = []
+    failed = []
+    for taskRows, taskFailed in results:
+        rows.extend(taskRows)
+        failed.extend(taskFailed)
+    kinkReport = dict(
+        version=kinkReportVersion,
+        designspace=designspacePath,
+        method=args.method,
+        locations=len(locations),
+        glyphs=len(glyphNames),
+        axes=axisNames,
+        failed=failed,
+        kinks=sortKinkRows(rows),
+        )
+    folder = os.path.abspath(args.output) if args.output else kinksFolderName
+    jsonPath, csvPath = writeKinkReport(makeKinkReportPath(designspacePath, folder), kinkReport)
+    kinkedGlyphs = len({row["glyph"] for row in rows})
+    print(f"LongBoard reports: {len(rows)} contours with kinks in {kinkedGlyphs} glyphs, {len(failed)} glyphs failed, in {round(time.perf_counter() - startTime, 1)} s")
+    print(f"LongBoard reports: {csvPath}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
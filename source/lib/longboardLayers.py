@@ -0,0 +1,116 @@
+"""
+    Longboard layer pools.
+
+    Markers and labels in the glyph editor come and go with the
+    selection and the measurements, but most of them survive from
+    one frame to the next. A SublayerPool keeps the sublayers of a
+    merz container by key, and each frame only the differences get
+    through to merz: new keys get a new layer, known keys are moved,
+    keys that are not wanted this frame are hidden, not removed.
+    A layer that stays hidden for more than keepFrames frames is
+    removed, so the pool does not grow with every key it ever saw.
+
+    Usage, for every frame:
+        pool.begin()
+        layer = pool.get(key)
+        pool.setPosition(key, (x, y))
+        pool.setText(key, "...")
+        pool.end()
+
+    The pool does not import merz, it works with the container it gets.
+"""
+
+
+class SublayerPool:
+
+    # frames a hidden layer is kept, in case its key comes back
+    keepFrames = 2
+
+    def __init__(self, container, factory):
+        # container: the merz layer that holds the sublayers
+        # factory: f(container, key) that appends and returns a new sublayer
+        self.container = container
+        self.factory = factory
+        self.layers = {}
+        self.visible = set()
+        self.wanted = set()
+        self.positions = {}
+        self.texts = {}
+        self.unusedFrames = {}
+        # counters, to see what a frame actually changed
+        self.added = 0
+        self.shown = 0
+        self.hidden = 0
+        self.removed = 0
+
+    def clear(self):
+        # forget everything, the layers are made again when asked.
+        # for when the style of the layers changes.
+        self.container.clearSublayers()
+        self.layers = {}
+        self.visible = set()
+        self.wanted = set()
+        self.positions = {}
+        self.texts = {}
+        self.unusedFrames = {}
+
+    def begin(self):
+        self.wanted = set()
+
+    def get(self, key):
+        # the layer for this key, made or shown if necessary
+        self.wanted.add(key)
+        layer = self.layers.get(key)
+        if layer is None:
+            layer = self.factory(self.container, key)
+            self.layers[key] = layer
+            self.visible.add(key)
+            self.added += 1
+        elif key not in self.visible:
+            layer.setVisible(True)
+            self.visible.add(key)
+            self.shown += 1
+        return layer
+
+    def setPosition(self, key, position):
+        layer = self.get(key)
+        position = tuple(position)
+        if self.positions.get(key) != position:
+            layer.setPosition(position)
+            self.positions[key] = position
+        return layer
+
+    def setText(self, key, text):
+        layer = self.get(key)
+        if self.texts.get(key) != text:
+            layer.setText(text)
+            self.texts[key] = text
+        return layer
+
+    def end(self):
+        # hide the layers that were not asked for since begin
+        for key in self.visible - self.wanted:
+            self.layers[key].setVisible(False)
+            self.hidden += 1
+        self.visible &= self.wanted
+        # remove the layers that were hidden for too long
+        for key in self.layers.keys() - self.wanted:
+            frames = self.unusedFrames.get(key, 0) + 1
+            if frames > self.keepFrames:
+                self.remove(key)
+            else:
+                self.unusedFrames[key] = frames
+        for key in self.wanted:
+            self.unusedFrames.pop(key, None)
+
+    def remove(self, key):
+        layer = self.layers.pop(key)
+        self.container.removeSublayer(layer)
+        self.visible.discard(key)
+        self.positions.pop(key, None)
+        self.texts.pop(key, None)
+        self.unusedFrames.pop(key, None)
+        self.removed += 1
+
+    def __len__(self):
+        return len(self.layers)
@@ -0,0 +1,169 @@
+"""
+    Longboard prefetch.
+
+    The PreviewPrefetcher computes the outlines for the predicted next
+    drag locations on a worker thread. Longboard only uses it for glyphs
+    without a kernel. compute should work on a copy of the operator.
+
+        prefetcher.schedule(glyphName, useVarlib, locations, compute)
+        ...
+        outline = prefetcher.take(glyphName, useVarlib, location, axisScales)
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _extrapolateOffset(value, previous, steps):
+    # value + steps * (value - previous), for numbers and (x, y) tuples
+    if previous is None:
+        return value
+    if isinstance(value, tuple) or isinstance(previous, tuple):
+        if not isinstance(value, tuple):
+            value = value, value
+        if not isinstance(previous, tuple):
+            previous = previous, previous
+        return tuple(v + steps * (v - p) for v, p in zip(value, previous))
+    return value + steps * (value - previous)
+
+
+def predictDragOffsets(velocity, previousVelocity, count):
+    # The offsets of the next count mouse drags, (horizontal, vertical).
+    # The drags keep the change in velocity of the last two drags.
+    offsets = []
+    for step in range(1, count + 1):
+        if previousVelocity is None:
+            offsets.append(velocity)
+        else:
+            offsets.append((
+                _extrapolateOffset(velocity[0], previousVelocity[0], step),
+                _extrapolateOffset(velocity[1], previousVelocity[1], step),
+                ))
+    return offsets
+
+
+def locationDistance(a, b, axisScales):
+    # the largest difference on any axis, as a fraction of the axis span.
+    # anisotropic values are (x, y) tuples.
+    distance = 0
+    for name in set(a) | set(b):
+        if name not in a or name not in b:
+            return None
+        valueA = a[name]
+        valueB = b[name]
+        if isinstance(valueA, tuple) or isinstance(valueB, tuple):
+            if not isinstance(valueA, tuple):
+                valueA = valueA, valueA
+            if not isinstance(valueB, tuple):
+                valueB = valueB, valueB
+            difference = max(abs(valueA[0] - valueB[0]), abs(valueA[1] - valueB[1]))
+        else:
+            difference = abs(valueA - valueB)
+        if difference == 0:
+            continue
+        scale = axisScales.get(name) if isinstance(axisScales, dict) else None
+        if not scale:
+            # discrete axes, or an axis without a span: only exact matches
+            return None
+        distance = max(distance, difference / scale)
+    return distance
+
+
+class PreviewPrefetcher:
+
+    # how far a prefetched location can be from the one asked for,
+    # as a fraction of the axis span
+    tolerance = 0.002
+    # how many locations ahead
+    depth = 3
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._results = []    # [(glyphName, useVarlib, location, outline)]
+        self.counters = dict(scheduled=0, computed=0, dropped=0, hits=0, misses=0, failed=0)
+
+    def _getExecutor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LongboardPrefetch")
+        return self._executor
+
+    def schedule(self, glyphName, useVarlib, locations, compute):
+        # compute the outlines for these locations, in this order
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            # keep the recent results, the next frame may still want them
+            self._results = self._results[-self.depth:]
+        executor = self._getExecutor()
+        for location in locations:
+            self.counters["scheduled"] += 1
+            executor.submit(self._compute, generation, glyphName, useVarlib, dict(location), compute)
+
+    def _compute(self, generation, glyphName, useVarlib, location, compute):
+        with self._lock:
+            if generation != self._generation:
+                # there are newer predictions
+                self.counters["dropped"] += 1
+                return
+        try:
+            outline = compute(location)
+        except Exception:
+            self.counters["failed"] += 1
+            return
+        if outline is None:
+            return
+        with self._lock:
+            self.counters["computed"] += 1
+            self._results.append((glyphName, useVarlib, location, outline))
+
+    def take(self, glyphName, useVarlib, location, axisScales):
+        # the prefetched outline nearest to location, or None
+        best = None
+        bestDistance = None
+        with self._lock:
+            for index, (resultGlyphName, resultUseVarlib, resultLocation, outline) in enumerate(self._results):
+                if resultGlyphName != glyphName or resultUseVarlib != useVarlib:
+                    continue
+                distance = locationDistance(resultLocation, location, axisScales)
+                if distance is None or distance > self.tolerance:
+                    continue
+                if bestDistance is None or distance < bestDistance:
+                    best = index
+                    bestDistance = distance
+            if best is None:
+                self.counters["misses"] += 1
+                return None
+            self.counters["hits"] += 1
+            return self._results.pop(best)[3]
+
+    def release(self, function):
+        # call function on the worker thread, after the work that was
+        # scheduled, to clean up what the computations used.
+        if self._executor is None:
+            function()
+            return
+        self._executor.submit(function)
+
+    def clear(self):
+        # forget everything, after a change in the sources or the settings
+        with self._lock:
+            self._generation += 1
+            self._results = []
+
+    def resetCounters(self):
+        for key in self.counters:
+            self.counters[key] = 0
+
+    def getCounters(self):
+        counters = dict(self.counters)
+        asked = counters["hits"] + counters["misses"]
+        counters["hitRate"] = round(counters["hits"] / asked, 3) if asked else 0
+        return counters
+
+    def shutdown(self):
+        self.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
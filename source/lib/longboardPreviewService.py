@@ -0,0 +1,122 @@
+"""
+    Longboard preview service.
+
+    A memo of preview results per operator and location. Glyph editors
+    that preview the same designspace get the same location from the
+    designspace editor. The first editor that asks for a result at that
+    location makes it, the other editors get the same result back.
+    Nothing is pushed to the editors, each one still asks.
+    The results of the last location are the frame of the operator.
+    It is only kept when more than one editor is subscribed to the
+    operator. Outlines are handed out as copies.
+"""
+
+import threading
+import weakref
+
+from longboardKernel import makeInstanceOutline
+
+
+def makeFrameKey(operator, location, useVarlib):
+    # the exact location, anisotropic values are (x, y) tuples
+    return tuple(sorted(location.items())), bool(useVarlib), bool(operator.extrapolate)
+
+
+class PreviewService:
+
+    def __init__(self):
+        # operator: set of editors
+        self._subscribers = weakref.WeakKeyDictionary()
+        # editor: operator
+        self._operators = weakref.WeakKeyDictionary()
+        # operator: (frame key, {result key: result})
+        self._frames = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+        self.counters = dict(requests=0, made=0, shared=0, frames=0)
+
+    def subscribe(self, operator, editor):
+        # the editor draws previews for this operator, and no other
+        with self._lock:
+            previous = self._operators.get(editor)
+            if previous is operator:
+                return
+            if previous is not None:
+                self.unsubscribe(editor)
+            self._operators[editor] = operator
+            editors = self._subscribers.get(operator)
+            if editors is None:
+                editors = self._subscribers[operator] = weakref.WeakSet()
+            editors.add(editor)
+
+    def unsubscribe(self, editor):
+        with self._lock:
+            operator = self._operators.pop(editor, None)
+            if operator is None:
+                return
+            editors = self._subscribers.get(operator)
+            if editors is not None:
+                editors.discard(editor)
+                if len(editors) < 2:
+                    self._frames.pop(operator, None)
+
+    def getSubscriberCount(self, operator):
+        with self._lock:
+            editors = self._subscribers.get(operator)
+            if editors is None:
+                return 0
+            return len(editors)
+
+    def _getResult(self, operator, location, useVarlib, key, make):
+        # The result for this key in the frame of this location,
+        # and if the result is shared with the other editors.
+        # make() is only called by the first editor that asks.
+        with self._lock:
+            self.counters["requests"] += 1
+            if self.getSubscriberCount(operator) > 1:
+                frameKey = makeFrameKey(operator, location, useVarlib)
+                frame = self._frames.get(operator)
+                if frame is None or frame[0] != frameKey:
+                    frame = self._frames[operator] = (frameKey, {})
+                    self.counters["frames"] += 1
+                results = frame[1]
+                if key in results:
+                    self.counters["shared"] += 1
+                    return results[key], True
+                result = make()
+                self.counters["made"] += 1
+                results[key] = result
+                return result, True
+            self.counters["made"] += 1
+        # nobody to share with
+        return make(), False
+
+    def getResult(self, operator, location, useVarlib, key, make):
+        # The result for this key in the frame of this location.
+        # Shared results should not be changed.
+        return self._getResult(operator, location, useVarlib, key, make)[0]
+
+    def getOutline(self, operator, glyphName, location, useVarlib=False):
+        # the preview outline, a copy for each editor when it is shared
+        def make():
+            return makeInstanceOutline(operator, glyphName, location, useVarlib=useVarlib)
+        outline, shared = self._getResult(operator, location, useVarlib, ("outline", glyphName), make)
+        if outline is None or not shared:
+            return outline
+        return outline.copy()
+
+    def operatorChanged(self, operator):
+        # the sources changed, the frame is out of date
+        with self._lock:
+            self._frames.pop(operator, None)
+
+    def getCounters(self):
+        with self._lock:
+            counters = dict(self.counters)
+            counters["editors"] = sum(len(editors) for editors in list(self._subscribers.values()))
+        asked = counters["requests"]
+        counters["shareRate"] = round(counters["shared"] / asked, 3) if asked else 0
+        return counters
+
+
+# shared by all glyph editors
+previewService = PreviewService()
@@ -0,0 +1,85 @@
+"""
+    Longboard drag profiles.
+
+    A DragProfiler armed from the contextual menu runs cProfile from
+    the next mouse down to the mouse up, and saves a pstats file and
+    a text file with the functions that took the most time.
+
+        profiler.arm()
+        profiler.begin()    # mouse down, only does something when armed
+        profiler.end()      # mouse up, returns the profile
+"""
+
+import cProfile
+import io
+
+from longboardRecorder import makeOutputPath
+
+
+class DragProfiler:
+
+    def __init__(self):
+        self.armed = False
+        self.profile = None
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def arm(self):
+        self.armed = True
+
+    def disarm(self):
+        self.armed = False
+
+    def begin(self):
+        # start profiling if armed. Returns True if it started.
+        if not self.armed or self.active:
+            return False
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is running
+            print(f"LongBoard reports: can not profile the drag, another profiler is active.")
+            self.armed = False
+            return False
+        self.profile = profile
+        self.armed = False
+        return True
+
+    def end(self):
+        # stop profiling, returns the profile or None
+        if not self.active:
+            return None
+        profile = self.profile
+        profile.disable()
+        self.profile = None
+        return profile
+
+
+def formatProfile(profile, top=40):
+    # the top functions, by cumulative and by own time
+    import pstats
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.strip_dirs()
+    for sortKey in ("cumulative", "tottime"):
+        stream.write(f"Longboard drag profile, top {top} by {sortKey}\n")
+        stats.sort_stats(sortKey).print_stats(top)
+    return stream.getvalue()
+
+
+def writeProfile(profile, basePath, top=40):
+    # writes basePath.pstats and basePath.txt, returns the paths
+    statsPath = basePath + ".pstats"
+    textPath = basePath + ".txt"
+    profile.dump_stats(statsPath)
+    with open(textPath, "w", encoding="utf-8") as f:
+        f.write(formatProfile(profile, top=top))
+    return statsPath, textPath
+
+
+def makeProfilePath(designspacePath, folderName, glyphName):
+    # the path without the extension, writeProfile adds them
+    return makeOutputPath(designspacePath, folderName, f"Profile_{glyphName}", "")
@@ -0,0 +1,212 @@
+"""
+    Longboard drag recordings.
+
+    A DragRecorder keeps the mouse and key events of a navigator drag,
+    and the frames they were merged into, in a gzipped file of JSON
+    lines: a header, then one list per event.
+
+        [t, "down", designspacePath, glyphName, location]
+        [t, "drag", eventTimestamp, dx, dy, viewScale, modifiers, horizontal, vertical]
+        [t, "frame", horizontal, vertical]
+        [t, "nudge", dx, dy]
+        [t, "up", location]
+
+    A replay sends the "frame" and "nudge" events as location changes.
+"""
+
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+
+recordingVersion = 1
+recordingFileExtension = ".longboardDrag"
+
+# NSEvent modifier flags, as they come in the deviceState
+modifierFlags = dict(
+    shiftDown=131072,
+    controlDown=262144,
+    optionDown=524288,
+    commandDown=1048576,
+    )
+
+
+def packModifiers(deviceState):
+    # the modifier keys in one number
+    modifiers = 0
+    if deviceState is None:
+        return modifiers
+    for name, flag in modifierFlags.items():
+        if deviceState.get(name):
+            modifiers |= flag
+    return modifiers
+
+
+def unpackModifiers(modifiers):
+    return {name: (flag if modifiers & flag else 0) for name, flag in modifierFlags.items()}
+
+
+def _packValue(value):
+    # anisotropic values are tuples, json makes them lists
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def _unpackValue(value):
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def packLocation(location):
+    if location is None:
+        return None
+    return {name: _packValue(value) for name, value in location.items()}
+
+
+def unpackLocation(location):
+    if location is None:
+        return None
+    return {name: _unpackValue(value) for name, value in location.items()}
+
+
+class DragRecorder:
+
+    def __init__(self, clock=None):
+        if clock is None:
+            clock = time.perf_counter
+        self.clock = clock
+        self.recording = False
+        self.header = None
+        self.events = []
+        self._startTime = None
+
+    def start(self, settings=None):
+        # settings: the editor settings that change what a drag does
+        self.header = dict(
+            version=recordingVersion,
+            date=datetime.now().isoformat(timespec="seconds"),
+            settings=settings or {},
+            )
+        self.events = []
+        self._startTime = self.clock()
+        self.recording = True
+
+    def stop(self):
+        # returns the recording, or None if there was nothing to record
+        if not self.recording:
+            return None
+        self.recording = False
+        if not self.events:
+            return None
+        return dict(header=self.header, events=self.events)
+
+    def _add(self, kind, *values):
+        if not self.recording:
+            return
+        t = round(self.clock() - self._startTime, 6)
+        self.events.append([t, kind] + list(values))
+
+    def mouseDown(self, designspacePath, glyphName, location):
+        self._add("down", designspacePath, glyphName, packLocation(location))
+
+    def drag(self, timestamp, delta, viewScale, deviceState, horizontal, vertical):
+        self._add("drag", timestamp, delta[0], delta[1], viewScale, packModifiers(deviceState), _packValue(horizontal), _packValue(vertical))
+
+    def frame(self, horizontal, vertical):
+        self._add("frame", _packValue(horizontal), _packValue(vertical))
+
+    def nudge(self, dx, dy):
+        self._add("nudge", dx, dy)
+
+    def mouseUp(self, location):
+        self._add("up", packLocation(location))
+
+
+def writeRecording(path, recording):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(recording["header"]) + "\n")
+        for event in recording["events"]:
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+    return path
+
+
+def readRecording(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty drag recording: {path}")
+    header = json.loads(lines[0])
+    if header.get("version") != recordingVersion:
+        raise ValueError(f"Unknown drag recording version {header.get('version')}: {path}")
+    events = [json.loads(line) for line in lines[1:]]
+    return dict(header=header, events=events)
+
+
+def makeOutputPath(designspacePath, folderName, stem, extension):
+    # A new file in a folder next to the designspace, like the preview UFOs:
+    # folderName/stem_designspaceName_date.extension
+    # The folder is made when it is not there. folderName can also be a path.
+    date = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    designspaceName = os.path.splitext(os.path.basename(designspacePath))[0]
+    folder = os.path.join(os.path.dirname(designspacePath), folderName)
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    return os.path.join(folder, f"{stem}_{designspaceName}_{date}{extension}")
+
+
+def makeRecordingPath(designspacePath, folderName, glyphName):
+    return makeOutputPath(designspacePath, folderName, f"Drag_{glyphName}", recordingFileExtension)
+
+
+def findRecordings(folder):
+    # the recordings in this folder, the newest last
+    if folder is None or not os.path.exists(folder):
+        return []
+    paths = [os.path.join(folder, fileName) for fileName in os.listdir(folder) if fileName.endswith(recordingFileExtension)]
+    return sorted(paths, key=os.path.getmtime)
+
+
+def findRecordingMismatches(recording, designspacePath, glyphName):
+    # The ways this recording does not fit the designspace and the glyph
+    # it is replayed with, as messages. The designspaces are compared by
+    # file name: the recordings folder moves with the designspace.
+    mismatches = []
+    for event in recording["events"]:
+        if event[1] != "down":
+            continue
+        recordedPath, recordedGlyphName = event[2:4]
+        if recordedPath is not None and designspacePath is not None:
+            if os.path.basename(recordedPath) != os.path.basename(designspacePath):
+                mismatches.append(f"recorded with {os.path.basename(recordedPath)}, not {os.path.basename(designspacePath)}")
+        elif recordedPath != designspacePath:
+            mismatches.append("recorded with another designspace")
+        if recordedGlyphName != glyphName:
+            mismatches.append(f"recorded with glyph {recordedGlyphName}, not {glyphName}")
+        if mismatches:
+            break
+    return mismatches
+
+
+def iterReplaySteps(recording):
+    # The steps a replay takes, with the values as Longboard uses them:
+    #     ("down", designspacePath, glyphName, location)
+    #     ("drag", horizontal, vertical)
+    #     ("frame", horizontal, vertical)
+    #     ("nudge", dx, dy)
+    #     ("up", location)
+    for event in recording["events"]:
+        kind = event[1]
+        if kind == "down":
+            designspacePath, glyphName, location = event[2:5]
+            yield kind, designspacePath, glyphName, unpackLocation(location)
+        elif kind == "drag":
+            yield kind, _unpackValue(event[7]), _unpackValue(event[8])
+        elif kind == "frame":
+            yield kind, _unpackValue(event[2]), _unpackValue(event[3])
+        elif kind == "nudge":
+            yield kind, event[2], event[3]
+        elif kind == "up":
+            yield kind, unpackLocation(event[2])
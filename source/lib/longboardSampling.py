@@ -0,0 +1,169 @@
+"""
+    Longboard designspace samples.
+
+    Locations that cover the continuous axes, repeated for every
+    discrete location.
+
+        gridLocations(operator, steps=5)
+        haltonLocations(operator, count=256)
+        sobolLocations(operator, count=256)
+        randomLocations(operator, count=256, seed=0)
+"""
+
+import itertools
+import random
+
+samplingMethods = ("grid", "halton", "sobol", "random")
+
+firstPrimes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+
+
+def getAxisRanges(operator):
+    # [(axisName, minimum, maximum), ...] for the continuous axes, design coordinates
+    ranges = []
+    for axis in operator.getOrderedContinuousAxes():
+        ranges.append((axis.name, axis.map_forward(axis.minimum), axis.map_forward(axis.maximum)))
+    return ranges
+
+
+def scaleSamples(operator, samples):
+    # samples: sequences of factors between 0 and 1, one per continuous axis.
+    # returns the locations, for every discrete location.
+    # the samples are used once for each discrete location, so not a generator
+    samples = list(samples)
+    ranges = getAxisRanges(operator)
+    discreteLocations = operator.getDiscreteLocations() or [{}]
+    locations = []
+    for discreteLocation in discreteLocations:
+        for factors in samples:
+            location = {name: minimum + factor * (maximum - minimum) for (name, minimum, maximum), factor in zip(ranges, factors)}
+            location.update(discreteLocation)
+            locations.append(location)
+    return locations
+
+
+def gridLocations(operator, steps=5):
+    # steps values on each continuous axis, the extremes included
+    axisCount = len(getAxisRanges(operator))
+    if steps < 2:
+        factors = [0.5]
+    else:
+        factors = [i / (steps - 1) for i in range(steps)]
+    return scaleSamples(operator, list(itertools.product(factors, repeat=axisCount)))
+
+
+def radicalInverse(index, base):
+    # the digits of index in base, mirrored around the decimal point
+    result = 0
+    fraction = 1 / base
+    while index:
+        index, digit = divmod(index, base)
+        result += digit * fraction
+        fraction /= base
+    return result
+
+
+def haltonSamples(count, dimensions, skip=1):
+    # skip the first sample: it is 0 on all axes
+    if dimensions > len(firstPrimes):
+        raise ValueError(f"Halton samples for at most {len(firstPrimes)} axes")
+    bases = firstPrimes[:dimensions]
+    return [[radicalInverse(index, base) for base in bases] for index in range(skip, skip + count)]
+
+
+def haltonLocations(operator, count=256):
+    # count locations per discrete location, the extremes are added
+    axisCount = len(getAxisRanges(operator))
+    samples = haltonSamples(count, axisCount)
+    samples.extend(itertools.product((0, 1), repeat=axisCount))
+    return scaleSamples(operator, samples)
+
+
+# Sobol direction numbers, from new-joe-kuo-6.21201: (s, a, m) for the
+# dimensions after the first. s: degree of the primitive polynomial,
+# a: its coefficients, m: the initial direction numbers.
+sobolDirections = [
+    (1, 0, [1]),
+    (2, 1, [1, 3]),
+    (3, 1, [1, 3, 1]),
+    (3, 2, [1, 1, 1]),
+    (4, 1, [1, 1, 3, 3]),
+    (4, 4, [1, 3, 5, 13]),
+    (5, 2, [1, 1, 5, 5, 17]),
+    (5, 4, [1, 1, 5, 5, 5]),
+    (5, 7, [1, 1, 7, 11, 19]),
+    (5, 11, [1, 1, 5, 1, 1]),
+    (5, 13, [1, 1, 1, 3, 11]),
+    (5, 14, [1, 3, 5, 5, 31]),
+    (6, 1, [1, 3, 3, 9, 7, 49]),
+    (6, 13, [1, 1, 1, 15, 21, 21]),
+    (6, 16, [1, 3, 1, 13, 27, 49]),
+    ]
+
+sobolBits = 32
+
+
+def makeSobolVectors(dimension):
+    # the direction vectors for this dimension, as integers
+    if dimension == 0:
+        return [1 << (sobolBits - i) for i in range(1, sobolBits + 1)]
+    s, a, m = sobolDirections[dimension - 1]
+    vectors = [0] * (sobolBits + 1)
+    for i in range(1, sobolBits + 1):
+        if i <= s:
+            vectors[i] = m[i - 1] << (sobolBits - i)
+        else:
+            value = vectors[i - s] ^ (vectors[i - s] >> s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    value ^= vectors[i - k]
+            vectors[i] = value
+    return vectors[1:]
+
+
+def sobolSamples(count, dimensions, skip=1):
+    # Gray code order, skip the first sample: it is 0 on all axes
+    if dimensions > len(sobolDirections) + 1:
+        raise ValueError(f"Sobol samples for at most {len(sobolDirections) + 1} axes")
+    vectors = [makeSobolVectors(dimension) for dimension in range(dimensions)]
+    values = [0] * dimensions
+    samples = []
+    scale = 1 / (1 << sobolBits)
+    for index in range(skip + count):
+        if index >= skip:
+            samples.append([value * scale for value in values])
+        # the lowest zero bit of index
+        bit = 0
+        while (index >> bit) & 1:
+            bit += 1
+        for dimension in range(dimensions):
+            values[dimension] ^= vectors[dimension][bit]
+    return samples
+
+
+def sobolLocations(operator, count=256):
+    # count locations per discrete location, the extremes are added
+    axisCount = len(getAxisRanges(operator))
+    samples = sobolSamples(count, axisCount)
+    samples.extend(itertools.product((0, 1), repeat=axisCount))
+    return scaleSamples(operator, samples)
+
+
+def randomLocations(operator, count=256, seed=None):
+    # count locations per discrete location, the same ones for the same seed
+    axisCount = len(getAxisRanges(operator))
+    randomizer = random.Random(seed)
+    samples = [[randomizer.random() for axis in range(axisCount)] for index in range(count)]
+    return scaleSamples(operator, samples)
+
+
+def sampleLocations(operator, method="grid", count=256, steps=5, seed=None):
+    if method == "grid":
+        return gridLocations(operator, steps=steps)
+    if method == "halton":
+        return haltonLocations(operator, count=count)
+    if method == "sobol":
+        return sobolLocations(operator, count=count)
+    if method == "random":
+        return randomLocations(operator, count=count, seed=seed)
+    raise ValueError(f"Unknown sampling method: {method}")
@@ -0,0 +1,121 @@
+"""
+    Longboard drag scheduling.
+
+    The DragScheduler merges the navigator drags into at most one
+    location update per display frame, the latest location wins.
+    Held back drags wait for the next frame: the caller sets a timer
+    for getFrameDelay() seconds in case the mouse stops.
+"""
+
+import time
+
+
+def addDragOffsets(a, b):
+    # Add two drag offsets.
+    # An offset is a number, or a (x, y) tuple for an anisotropic drag.
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if isinstance(a, tuple) or isinstance(b, tuple):
+        if not isinstance(a, tuple):
+            a = (a, a)
+        if not isinstance(b, tuple):
+            b = (b, b)
+        return a[0] + b[0], a[1] + b[1]
+    return a + b
+
+
+class DragScheduler:
+    # one display frame, in seconds
+    frameInterval = 1 / 60
+
+    def __init__(self, frameInterval=None, clock=None):
+        if frameInterval is not None:
+            self.frameInterval = frameInterval
+        if clock is None:
+            clock = time.perf_counter
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        # start of a new drag
+        self.pendingHorizontal = None
+        self.pendingVertical = None
+        self.pendingEvents = 0
+        self.frameStart = None
+        self.lastFrameStart = None
+        self.inFlight = False
+        # counters
+        self.events = 0
+        self.frames = 0
+        self.coalescedEvents = 0
+        self.droppedFrames = 0
+        self.slowestFrame = 0
+
+    def hasPending(self):
+        return self.pendingEvents > 0
+
+    def addDrag(self, horizontal, vertical):
+        # Add a drag to the pending offsets.
+        # Return True when the caller can send a location update now.
+        self.events += 1
+        self.pendingEvents += 1
+        self.pendingHorizontal = addDragOffsets(self.pendingHorizontal, horizontal)
+        self.pendingVertical = addDragOffsets(self.pendingVertical, vertical)
+        return self.isReady()
+
+    def isReady(self):
+        # Return True when a new frame can start now.
+        if self.inFlight:
+            # the previous frame is still being drawn
+            return False
+        if self.lastFrameStart is not None:
+            if self.clock() - self.lastFrameStart < self.frameInterval:
+                # too soon, wait for the next frame
+                return False
+        return True
+
+    def getFrameDelay(self):
+        # Seconds until the next frame can start.
+        if self.inFlight:
+            # check again after a frame
+            return self.frameInterval
+        if self.lastFrameStart is None:
+            return 0
+        return max(0, self.frameInterval - (self.clock() - self.lastFrameStart))
+
+    def take(self):
+        # Return the merged offsets and start a frame.
+        horizontal = self.pendingHorizontal
+        vertical = self.pendingVertical
+        if self.pendingEvents > 1:
+            self.coalescedEvents += self.pendingEvents - 1
+        self.pendingHorizontal = None
+        self.pendingVertical = None
+        self.pendingEvents = 0
+        self.frameStart = self.clock()
+        self.lastFrameStart = self.frameStart
+        self.inFlight = True
+        return horizontal, vertical
+
+    def frameDone(self):
+        # The location update has been drawn.
+        if not self.inFlight:
+            return
+        self.inFlight = False
+        self.frames += 1
+        duration = self.clock() - self.frameStart
+        self.slowestFrame = max(self.slowestFrame, duration)
+        if duration > self.frameInterval:
+            # the display frames we could not keep up with
+            self.droppedFrames += int(duration / self.frameInterval)
+
+    def getCounters(self):
+        return dict(
+            dragEvents=self.events,
+            dragFrames=self.frames,
+            coalescedEvents=self.coalescedEvents,
+            droppedFrames=self.droppedFrames,
+            slowestFrame=round(self.slowestFrame * 1000, 2),     # ms
+            )
@@ -0,0 +1,143 @@
+"""
+    Longboard stats sweep.
+
+    Writes the width, margins, area and bounds of every glyph at sampled
+    locations, one CSV or JSON lines row each, on a pool of processes.
+    The output goes in a "sweeps" folder next to the designspace.
+
+        python longboardSweep.py MyFamily.designspace
+        python longboardSweep.py MyFamily.designspace --method sobol --count 4096 --format jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from ufoProcessor.ufoOperator import UFOOperator
+
+from longboardBatch import iterTasks, getWorkerOperator, getOutlineStats
+from longboardInstance import getInstanceGlyphNames
+from longboardKernel import makeInstanceOutline
+from longboardRecorder import makeOutputPath, packLocation, unpackLocation
+from longboardSampling import samplingMethods, sampleLocations
+
+sweepFormats = ("csv", "jsonl")
+sweepsFolderName = "sweeps"
+statNames = ["width", "leftMargin", "rightMargin", "area", "xMin", "yMin", "xMax", "yMax"]
+
+# rows per task, small enough to keep the memory flat
+taskSize = 20000
+
+
+def sweepGlyphs(task):
+    # The stats of these glyphs at these locations, in a worker process.
+    # returns [[glyphName, locationIndex, stat values...], ...]
+    operator = getWorkerOperator()
+    locations = [unpackLocation(location) for location in task["locations"]]
+    digits = task["digits"]
+    rows = []
+    for glyphName in task["glyphNames"]:
+        for locationIndex, location in enumerate(locations, task["locationOffset"]):
+            outline = makeInstanceOutline(operator, glyphName, location, useVarlib=operator.useVarlib, cache=False)
+            if outline is None:
+                rows.append([glyphName, locationIndex] + [None] * len(statNames))
+                continue
+            stats = getOutlineStats(outline, withKinks=False)
+            bounds = stats.pop("bounds") or (None, None, None, None)
+            values = [stats["width"], stats["leftMargin"], stats["rightMargin"], stats["area"]] + list(bounds)
+            rows.append([glyphName, locationIndex] + [None if value is None else round(value, digits) for value in values])
+    return rows
+
+
+def makeSweepTasks(glyphNames, locations, digits):
+    # blocks of glyphs and locations, with about taskSize rows each
+    locationsPerTask = max(1, min(len(locations), taskSize))
+    glyphsPerTask = max(1, taskSize // locationsPerTask)
+    for locationOffset in range(0, len(locations), locationsPerTask):
+        taskLocations = locations[locationOffset:locationOffset + locationsPerTask]
+        for glyphIndex in range(0, len(glyphNames), glyphsPerTask):
+            yield dict(
+                glyphNames=glyphNames[glyphIndex:glyphIndex + glyphsPerTask],
+                locations=taskLocations,
+                locationOffset=locationOffset,
+                digits=digits,
+                )
+
+
+class SweepWriter:
+
+    # writes the rows as they come, in CSV or JSON lines
+
+    def __init__(self, path, format, axisNames, locations):
+        self.format = format
+        self.axisNames = axisNames
+        self.locations = locations
+        self.rowCount = 0
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        if format == "csv":
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["glyph", "location"] + axisNames + statNames)
+
+    def writeRows(self, rows):
+        for glyphName, locationIndex, *values in rows:
+            location = self.locations[locationIndex]
+            if self.format == "csv":
+                self._writer.writerow([glyphName, locationIndex] + [location.get(name) for name in self.axisNames] + values)
+            else:
+                row = dict(glyph=glyphName, location=locationIndex)
+                row.update(location)
+                row.update(zip(statNames, values))
+                self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+        self.rowCount += len(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def makeSweepPath(designspacePath, format, folderName=sweepsFolderName):
+    return makeOutputPath(designspacePath, folderName, "Sweep", f".{format}")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Write the glyph stats of a designspace at sampled locations.")
+    parser.add_argument("designspace", help="the .designspace file")
+    parser.add_argument("--method", choices=samplingMethods, default="sobol", help="how the locations are sampled")
+    parser.add_argument("--count", type=int, default=1024, help="number of sampled locations, for each discrete location")
+    parser.add_argument("--steps", type=int, default=5, help="values on each axis, for the grid")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the random locations")
+    parser.add_argument("--format", choices=sweepFormats, default="csv", help="CSV or JSON lines")
+    parser.add_argument("--digits", type=int, default=3, help="round the values to this many digits")
+    parser.add_argument("--glyphs", nargs="*", help="only these glyphs")
+    parser.add_argument("--varlib", action="store_true", help="interpolate with VarLib instead of MutatorMath")
+    parser.add_argument("--output", help="the output file, the default is in the sweeps folder next to the designspace")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes, the default is one per core")
+    args = parser.parse_args(args)
+
+    designspacePath = os.path.abspath(args.designspace)
+    operator = UFOOperator(designspacePath)
+    glyphNames = args.glyphs or getInstanceGlyphNames(operator)
+    locations = sampleLocations(operator, args.method, count=args.count, steps=args.steps, seed=args.seed)
+    axisNames = [axis.name for axis in operator.doc.axes]
+    path = args.output or makeSweepPath(designspacePath, args.format)
+    tasks = list(makeSweepTasks(glyphNames, [packLocation(location) for location in locations], args.digits))
+    print(f"LongBoard reports: {len(glyphNames)} glyphs at {len(locations)} locations, {len(glyphNames) * len(locations)} rows")
+    startTime = time.perf_counter()
+    writer = SweepWriter(path, args.format, axisNames, locations)
+    try:
+        for taskIndex, rows in enumerate(iterTasks(tasks, sweepGlyphs, designspacePath, useVarlib=args.varlib, extrapolate=False, workers=args.workers)):
+            writer.writeRows(rows)
+            print(f"\r{taskIndex + 1} of {len(tasks)}", end="", file=sys.stderr)
+    finally:
+        writer.close()
+    print(file=sys.stderr)
+    print(f"LongBoard reports: {writer.rowCount} rows in {round(time.perf_counter() - startTime, 1)} s")
+    print(f"LongBoard reports: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+    Longboard frame timing.
+
+    The FrameTimer measures the stages of a preview update, a stage
+    inside another stage is not counted twice. It keeps the last
+    frames for the rolling p50, p95 and max per stage.
+
+        timer.beginFrame()
+        timer.start("interpolation")
+        ...
+        timer.stop()
+        timer.endFrame()
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def percentile(values, fraction):
+    # values sorted, fraction 0..1, nearest rank
+    if not values:
+        return 0
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+class FrameTimer:
+
+    stageNames = (
+        "interpolation",
+        "extraction",
+        "stats",
+        "kinks",
+        "measurements",
+        "selection",
+        "layers",
+        )
+
+    historySize = 120
+
+    def __init__(self, clock=None, historySize=None):
+        if clock is None:
+            clock = time.perf_counter
+        if historySize is not None:
+            self.historySize = historySize
+        self.clock = clock
+        self.current = None
+        self.lastFrame = None
+        self.history = deque(maxlen=self.historySize)
+        self.trace = None
+        self._stack = []
+        self._frameStart = None
+
+    def beginFrame(self):
+        self.current = dict.fromkeys(self.stageNames, 0.0)
+        self._stack = []
+        self._frameStart = self.clock()
+
+    def start(self, stageName):
+        if self.current is None:
+            return
+        # [name, start time, time spent in stages inside this one]
+        self._stack.append([stageName, self.clock(), 0.0])
+
+    def stop(self):
+        if self.current is None or not self._stack:
+            return
+        stageName, startTime, innerTime = self._stack.pop()
+        endTime = self.clock()
+        duration = endTime - startTime
+        if self.trace is not None and self.trace.enabled:
+            self.trace.complete(stageName, "stage", startTime, endTime)
+        self.current[stageName] = self.current.get(stageName, 0.0) + duration - innerTime
+        if self._stack:
+            self._stack[-1][2] += duration
+
+    @contextmanager
+    def stage(self, stageName):
+        self.start(stageName)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def endFrame(self):
+        if self.current is None:
+            return None
+        # stages that were not stopped, after an exception
+        while self._stack:
+            self.stop()
+        self.current["frame"] = self.clock() - self._frameStart
+        self.lastFrame = self.current
+        self.history.append(self.lastFrame)
+        self.current = None
+        return self.lastFrame
+
+    def reset(self):
+        self.history.clear()
+        self.lastFrame = None
+
+    def getRollingStats(self):
+        # {stageName: dict(p50, p95, max)} in milliseconds,
+        # over the frames in the history. Empty without frames.
+        stats = {}
+        if not self.history:
+            return stats
+        for stageName in self.stageNames + ("frame",):
+            values = sorted(frame.get(stageName, 0.0) * 1000 for frame in self.history)
+            stats[stageName] = dict(
+                p50=percentile(values, 0.5),
+                p95=percentile(values, 0.95),
+                max=values[-1],
+                )
+        return stats
+
+    def formatRollingStats(self, separator="\t"):
+        # lines of text with the rolling stats, for the clipboard
+        stats = self.getRollingStats()
+        if not stats:
+            return []
+        lines = [separator.join(["stage", "p50 ms", "p95 ms", "max ms", f"{len(self.history)} frames"])]
+        for stageName, values in stats.items():
+            lines.append(separator.join([stageName, f"{values['p50']:.3f}", f"{values['p95']:.3f}", f"{values['max']:.3f}"]))
+        return lines
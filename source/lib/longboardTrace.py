@@ -0,0 +1,151 @@
+"""
+    Longboard traces.
+
+    When the TraceRecorder is on, the traced subscriber callbacks and
+    the stages of the preview update are kept as trace events, for
+    chrome://tracing or https://ui.perfetto.dev. Events published by one
+    subscriber and handled by another are linked with flow arrows.
+
+        @traced("updateInstanceOutline", "editor")
+        def updateInstanceOutline(self, rebuild=True):
+            ...
+
+    A traced object can have getTraceArgs() for the arguments of the event.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+from longboardRecorder import makeOutputPath
+
+traceFileExtension = ".json"
+
+
+def _jsonValue(value):
+    # locations can have tuples, operators and glyphs are not json
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonValue(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonValue(v) for k, v in value.items()}
+    return repr(value)
+
+
+class TraceRecorder:
+
+    def __init__(self, clock=None):
+        if clock is None:
+            clock = time.perf_counter
+        self.clock = clock
+        self.enabled = False
+        self.events = []
+        self._startTime = None
+        self._flowID = 0
+        self._threadIDs = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.events = []
+        self._flowID = 0
+        self._startTime = self.clock()
+        self.enabled = True
+
+    def stop(self):
+        # returns the trace, or None if nothing happened
+        if not self.enabled:
+            return None
+        self.enabled = False
+        if not self.events:
+            return None
+        return dict(traceEvents=self.events, displayTimeUnit="ms")
+
+    def now(self):
+        return self.clock()
+
+    def _microseconds(self, t):
+        return round((t - self._startTime) * 1e6, 3)
+
+    def _threadID(self):
+        # short thread numbers, the main thread is 0
+        ident = threading.get_ident()
+        threadID = self._threadIDs.get(ident)
+        if threadID is None:
+            threadID = self._threadIDs[ident] = len(self._threadIDs)
+        return threadID
+
+    def _add(self, event):
+        event["pid"] = os.getpid()
+        event["tid"] = self._threadID()
+        with self._lock:
+            self.events.append(event)
+
+    def complete(self, name, category, startTime, endTime=None, args=None):
+        # an event with a duration, from startTime to endTime, clock seconds
+        if not self.enabled:
+            return
+        if endTime is None:
+            endTime = self.clock()
+        event = dict(name=name, cat=category, ph="X", ts=self._microseconds(startTime), dur=round((endTime - startTime) * 1e6, 3))
+        if args:
+            event["args"] = _jsonValue(args)
+        self._add(event)
+
+    def instant(self, name, category, args=None):
+        if not self.enabled:
+            return
+        event = dict(name=name, cat=category, ph="i", s="t", ts=self._microseconds(self.clock()))
+        if args:
+            event["args"] = _jsonValue(args)
+        self._add(event)
+
+    def flowStart(self, name, category="event"):
+        # Call where an event is published. Returns an id for flowEnd,
+        # or None when the recorder is off.
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._flowID += 1
+            flowID = self._flowID
+        self._add(dict(name=name, cat=category, ph="s", id=flowID, ts=self._microseconds(self.clock())))
+        return flowID
+
+    def flowEnd(self, name, flowID, category="event"):
+        # Call where the event arrives.
+        if not self.enabled or flowID is None:
+            return
+        self._add(dict(name=name, cat=category, ph="f", bp="e", id=flowID, ts=self._microseconds(self.clock())))
+
+
+traceRecorder = TraceRecorder()
+
+
+def traced(name, category):
+    # decorator for methods, see the module docstring
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            if not traceRecorder.enabled:
+                return function(self, *args, **kwargs)
+            startTime = traceRecorder.now()
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                getTraceArgs = getattr(self, "getTraceArgs", None)
+                traceArgs = getTraceArgs() if getTraceArgs is not None else None
+                traceRecorder.complete(name, category, startTime, args=traceArgs)
+        return wrapper
+    return decorator
+
+
+def writeTrace(path, trace):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(trace, f, separators=(",", ":"))
+    return path
+
+
+def makeTracePath(designspacePath, folderName):
+    return makeOutputPath(designspacePath, folderName, "Trace", traceFileExtension)
@@ -0,0 +1,97 @@
+"""
+    Longboard kernel warm-up.
+
+    The KernelWarmup compiles the kernels of a glyph at every discrete
+    location on a worker thread, with a copy of the operator, so the
+    preview does not have to wait for them after a switch.
+
+        kernelWarmup.warm(operator, glyphName, useVarlib)
+        ...
+        kernelWarmup.shutdown()
+"""
+
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from longboardKernel import interpolationKernels
+from longboardInstance import makeJobOperator
+
+
+class KernelWarmup:
+
+    # seconds between two kernels, to leave the main thread room
+    pause = 0.005
+
+    def __init__(self, kernels):
+        # kernels: the KernelCache to warm
+        self.kernels = kernels
+        self._executor = None
+        self._lock = threading.Lock()
+        self._generations = weakref.WeakKeyDictionary()
+        self.counters = dict(scheduled=0, compiled=0, cached=0, dropped=0, failed=0)
+
+    def _getExecutor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LongboardWarmup")
+        return self._executor
+
+    def warm(self, operator, glyphName, useVarlib=False):
+        # compile the kernels for this glyph at every discrete location
+        if operator is None or glyphName is None:
+            return
+        with self._lock:
+            generation = self._generations.get(operator, 0) + 1
+            self._generations[operator] = generation
+        if not operator.getOrderedDiscreteAxes():
+            # one discrete location, the preview compiles that kernel itself
+            return
+        discreteLocations = []
+        for discreteLocation in operator.getDiscreteLocations():
+            if self.kernels.hasKernel(operator, glyphName, discreteLocation=discreteLocation, useVarlib=useVarlib):
+                self.counters["cached"] += 1
+            else:
+                discreteLocations.append(discreteLocation)
+        if not discreteLocations:
+            # nothing to do, no need for a copy of the operator
+            return
+        executor = self._getExecutor()
+        compileOperator = makeJobOperator(operator, useVarlib=useVarlib, extrapolate=operator.extrapolate)
+        for discreteLocation in discreteLocations:
+            self.counters["scheduled"] += 1
+            executor.submit(self._compile, generation, operator, compileOperator, glyphName, discreteLocation, useVarlib)
+        # one worker, so this runs after the compiles
+        executor.submit(compileOperator.changed)
+
+    def _compile(self, generation, operator, compileOperator, glyphName, discreteLocation, useVarlib):
+        with self._lock:
+            if generation != self._generations.get(operator):
+                # a newer glyph was asked for
+                self.counters["dropped"] += 1
+                return
+        if self.kernels.hasKernel(operator, glyphName, discreteLocation=discreteLocation, useVarlib=useVarlib):
+            self.counters["cached"] += 1
+            return
+        try:
+            self.kernels.getKernel(operator, glyphName, discreteLocation=discreteLocation, useVarlib=useVarlib, compileOperator=compileOperator)
+        except Exception:
+            self.counters["failed"] += 1
+            return
+        self.counters["compiled"] += 1
+        time.sleep(self.pause)
+
+    def shutdown(self):
+        with self._lock:
+            for operator in list(self._generations.keys()):
+                self._generations[operator] += 1
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def getCounters(self):
+        return dict(self.counters)
+
+
+# shared by all glyph editors
+kernelWarmup = KernelWarmup(interpolationKernels)
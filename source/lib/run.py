@@ -1,3 +1,3 @@
-import longboard
-import importlib
-importlib.reload(longboard)
\ No newline at end of file
+# at startup only the events are registered,
+# longboard.py loads when it is opened from the menu
+import longboardEvents
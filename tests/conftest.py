@@ -0,0 +1,28 @@
+"""
+    The tests import the modules from source/lib, like RoboFont does,
+    and make their designspaces with benchmark/syntheticDesignspace.py.
+    Only the modules that do not depend on mojo, merz or ezui are tested.
+"""
+
+import os
+import sys
+
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in (os.path.join(root, "source", "lib"), os.path.join(root, "benchmark")):
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+
+
+@pytest.fixture
+def makeOperator(tmp_path):
+    # a UFOOperator for a synthetic designspace
+    from ufoProcessor.ufoOperator import UFOOperator
+    from syntheticDesignspace import makeDesignspace
+
+    def make(**kwargs):
+        operator = UFOOperator(makeDesignspace(str(tmp_path / "designspace"), **kwargs))
+        operator.loadFonts()
+        return operator
+    return make
@@ -0,0 +1,68 @@
+from fontTools.pens.recordingPen import RecordingPointPen
+
+from longboardInstance import PreviewInstanceJob
+from syntheticDesignspace import glyphName
+
+
+def makeInstanceDescriptor(operator, location):
+    from fontTools.designspaceLib import InstanceDescriptor
+    instanceDescriptor = InstanceDescriptor()
+    instanceDescriptor.familyName = "Test"
+    instanceDescriptor.styleName = "Preview"
+    instanceDescriptor.location = location
+    return instanceDescriptor
+
+
+def runJob(operator, location, path, edit=None):
+    results = []
+    job = PreviewInstanceJob(operator, makeInstanceDescriptor(operator, location), path, done=lambda path, report: results.append((path, report)))
+    if edit is not None:
+        edit()
+    job.run()
+    return job, results[0]
+
+
+def getPoints(glyph):
+    pen = RecordingPointPen()
+    glyph.drawPoints(pen)
+    return [value[1][0] for value in pen.value if value[0] == "addPoint"]
+
+
+def getLocation(operator):
+    location = operator.newDefaultLocation()
+    for axis in operator.getOrderedContinuousAxes():
+        location[axis.name] = axis.minimum + 0.3 * (axis.maximum - axis.minimum)
+    return location
+
+
+def test_saved_sources_use_the_process_pool(makeOperator, tmp_path):
+    import defcon
+    operator = makeOperator(axes=2)
+    location = getLocation(operator)
+    job, (path, report) = runJob(operator, location, str(tmp_path / "preview.ufo"))
+    assert job.useProcesses
+    assert report["error"] is None and path is not None
+    font = defcon.Font(path)
+    assert sorted(font.keys()) == sorted(operator.glyphNames)
+    expected = operator.makeOneGlyph(glyphName, location=location, decomposeComponents=False)
+    assert font[glyphName].width == expected.width
+    assert getPoints(font[glyphName]) == getPoints(expected)
+
+
+def test_unsaved_sources_use_a_snapshot(makeOperator, tmp_path):
+    import defcon
+    operator = makeOperator(axes=2)
+    location = getLocation(operator)
+    expected = operator.makeOneGlyph(glyphName, location=location, decomposeComponents=False)
+    for font in operator.fonts.values():
+        font.info.note = "an edit that is not saved"
+
+    def edit():
+        # an edit after the job was made does not reach the job
+        for font in operator.fonts.values():
+            font[glyphName].move((100, 0))
+
+    job, (path, report) = runJob(operator, location, str(tmp_path / "preview.ufo"), edit=edit)
+    assert not job.useProcesses
+    assert report["error"] is None
+    assert getPoints(defcon.Font(path)[glyphName]) == getPoints(expected)
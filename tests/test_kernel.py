@@ -0,0 +1,148 @@
+import random
+
+import numpy
+import pytest
+
+from longboardKernel import KernelCache, InstanceOutline, calcOutlineArea, calcOutlineBounds, compileGlyphKernel, flattenMathGlyph
+from syntheticDesignspace import drawRing, glyphName, compositeName
+
+
+def getFirstX(outline):
+    return outline.points[0][0]
+
+
+def test_area_and_bounds_match_the_pens():
+    import defcon
+    from fontMath import MathGlyph
+    from fontTools.pens.areaPen import AreaPen
+    from fontTools.pens.boundsPen import BoundsPen
+    glyph = defcon.Glyph()
+    pen = glyph.getPen()
+    drawRing(pen, 300, 200, 220, 140, 5, 0.2, 0.4)
+    # a counter with lines, and a curve that is a line
+    pen.moveTo((200, 150))
+    pen.lineTo((200, 250))
+    pen.curveTo((200, 250), (400, 250), (400, 250))
+    pen.curveTo((450, 200), (450, 180), (400, 150))
+    pen.closePath()
+    outline = InstanceOutline.fromMathGlyph(MathGlyph(glyph))
+    areaPen = AreaPen()
+    glyph.draw(areaPen)
+    boundsPen = BoundsPen(None)
+    glyph.draw(boundsPen)
+    assert calcOutlineArea(outline) == pytest.approx(areaPen.value, abs=1e-6)
+    assert calcOutlineBounds(outline) == pytest.approx(boundsPen.bounds, abs=1e-6)
+
+
+def test_composite_kernel_follows_component(makeOperator):
+    operator = makeOperator()
+    kernels = KernelCache()
+    location = operator.newDefaultLocation()
+    before = kernels.makeOutline(operator, compositeName, location)
+    assert before is not None
+    # move the component glyph in all the sources
+    for font in operator.fonts.values():
+        font[glyphName].move((100, 0))
+    kernels.glyphChanged(operator, glyphName)
+    operator.changed()
+    after = kernels.makeOutline(operator, compositeName, location)
+    expected = InstanceOutline.fromMathGlyph(operator.makeOneGlyph(compositeName, location=location))
+    assert getFirstX(after) == getFirstX(expected)
+    assert getFirstX(after) == getFirstX(before) + 100
+
+
+def test_unrelated_kernel_is_kept(makeOperator):
+    operator = makeOperator()
+    kernels = KernelCache()
+    kernels.getKernel(operator, glyphName)
+    kernels.getKernel(operator, compositeName)
+    kernels.glyphChanged(operator, compositeName)
+    assert kernels.hasKernel(operator, glyphName)
+    assert not kernels.hasKernel(operator, compositeName)
+
+
+def test_compile_outside_the_lock_with_a_copy(makeOperator, monkeypatch):
+    import threading
+    import longboardKernel
+    from longboardInstance import makeJobOperator
+    operator = makeOperator()
+    kernels = KernelCache()
+    compileOperator = makeJobOperator(operator)
+    compile = longboardKernel.compileGlyphKernel
+    seen = []
+
+    def takeLock():
+        if kernels._lock.acquire(timeout=1):
+            kernels._lock.release()
+            seen.append("lock")
+
+    def compileGlyphKernel(compiledWith, *args, **kwargs):
+        # another thread can take the lock during the compile
+        other = threading.Thread(target=takeLock)
+        other.start()
+        other.join()
+        seen.append(compiledWith)
+        return compile(compiledWith, *args, **kwargs)
+
+    monkeypatch.setattr(longboardKernel, "compileGlyphKernel", compileGlyphKernel)
+    assert kernels.getKernel(operator, glyphName, compileOperator=compileOperator) is not None
+    assert seen == ["lock", compileOperator]
+    assert kernels.hasKernel(operator, glyphName)
+
+
+def test_kernel_changed_during_compile_is_not_stored(makeOperator, monkeypatch):
+    import longboardKernel
+    operator = makeOperator()
+    kernels = KernelCache()
+    compile = longboardKernel.compileGlyphKernel
+
+    def compileGlyphKernel(*args, **kwargs):
+        kernel = compile(*args, **kwargs)
+        kernels.glyphChanged(operator, glyphName)
+        return kernel
+
+    monkeypatch.setattr(longboardKernel, "compileGlyphKernel", compileGlyphKernel)
+    assert kernels.getKernel(operator, glyphName) is not None
+    assert not kernels.hasKernel(operator, glyphName)
+
+
+def makeOffSourceLocations(operator, count, seed=0):
+    # random locations inside the axes that are not a source or the default
+    randomizer = random.Random(seed)
+    sourceLocations = [operator.splitLocation(source.location)[0] for source in operator.doc.sources]
+    locations = []
+    while len(locations) < count:
+        location = {axis.name: randomizer.uniform(axis.minimum, axis.maximum) for axis in operator.getOrderedContinuousAxes()}
+        if location not in sourceLocations:
+            locations.append(location)
+    return locations
+
+
+@pytest.mark.parametrize("useVarlib", [False, True])
+def test_kernel_matches_operator(makeOperator, useVarlib):
+    # a fresh operator for each model: makeOneGlyph is memoized without useVarlib
+    operator = makeOperator(axes=3, sources=8)
+    kernel = compileGlyphKernel(operator, glyphName, useVarlib=useVarlib)
+    assert kernel is not None
+    for location in makeOffSourceLocations(operator, 20):
+        expected = flattenMathGlyph(operator.makeOneGlyph(glyphName, location=location, useVarlib=useVarlib))[1]
+        assert numpy.allclose(kernel.interpolate(location), expected, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("extrapolate", [False, True])
+@pytest.mark.parametrize("useVarlib", [False, True])
+def test_anisotropic_kernel_matches_operator(makeOperator, useVarlib, extrapolate):
+    # the horizontal and vertical values are apart, and past the axes,
+    # so the operator clips them, or extrapolates.
+    operator = makeOperator(axes=3, sources=8)
+    operator.extrapolate = extrapolate
+    kernels = KernelCache()
+    axes = operator.getOrderedContinuousAxes()
+    for horizontal, vertical in zip(makeOffSourceLocations(operator, 10, seed=1), makeOffSourceLocations(operator, 10, seed=2)):
+        location = {axis.name: (horizontal[axis.name], vertical[axis.name]) for axis in axes}
+        location[axes[0].name] = (axes[0].minimum - 100, axes[0].maximum + 100)
+        outline = kernels.makeOutline(operator, glyphName, location, useVarlib=useVarlib)
+        expected = InstanceOutline.fromMathGlyph(operator.makeOneGlyph(glyphName, location=location, useVarlib=useVarlib))
+        assert numpy.abs(outline.points - expected.points).max() < 1e-12
+        assert abs(outline.width - expected.width) < 1e-12
+        assert abs(outline.height - expected.height) < 1e-12
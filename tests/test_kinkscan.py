@@ -0,0 +1,37 @@
+import os
+
+import defcon
+
+from longboardKinkScan import main, findKinkReports, readKinkReport, getGlyphKinks
+from syntheticDesignspace import makeDesignspace, glyphName
+
+
+def addKink(ufoPath):
+    # Turn the handles of the first point, and make the incoming one short.
+    # The point stays smooth in this source, but not between the sources.
+    font = defcon.Font(ufoPath)
+    glyph = font[glyphName]
+    points = glyph[0]
+    x, y = points[0].x, points[0].y
+    dx, dy = points[1].x - x, points[1].y - y
+    points[1].x, points[1].y = x - dy, y + dx
+    points[-1].x, points[-1].y = x + 0.2 * dy, y - 0.2 * dx
+    # moving the points does not tell the glyph
+    glyph.dirty = True
+    font.save()
+
+
+def test_kink_report_is_written_and_read_back(tmp_path):
+    folder = tmp_path / "designspace"
+    designspacePath = makeDesignspace(str(folder), axes=2)
+    addKink(str(folder / "source_3_None.ufo"))
+    assert main([designspacePath, "--method", "grid", "--steps", "5", "--glyphs", glyphName, "--workers", "1"]) == 0
+    [reportPath] = findKinkReports(str(folder / "kinks"))
+    assert os.path.exists(os.path.splitext(reportPath)[0] + ".csv")
+    report = readKinkReport(reportPath)
+    assert report["axes"] == ["axis0", "axis1"]
+    kinks = getGlyphKinks(report, glyphName)
+    assert [row["contour"] for row in kinks] == [0]
+    assert kinks[0]["severity"] > 0
+    assert 0 < kinks[0]["count"] < 25
+    assert set(kinks[0]["location"]) == {"axis0", "axis1"}
@@ -0,0 +1,61 @@
+from longboardLayers import SublayerPool
+
+
+class Container:
+
+    def __init__(self):
+        self.sublayers = []
+
+    def removeSublayer(self, layer):
+        self.sublayers.remove(layer)
+
+    def clearSublayers(self):
+        self.sublayers = []
+
+
+class Sublayer:
+
+    def __init__(self, key):
+        self.key = key
+        self.visible = True
+
+    def setVisible(self, value):
+        self.visible = value
+
+
+def makeSublayer(container, key):
+    layer = Sublayer(key)
+    container.sublayers.append(layer)
+    return layer
+
+
+def drawFrame(pool, keys):
+    pool.begin()
+    for key in keys:
+        pool.get(key)
+    pool.end()
+
+
+def test_hidden_layers_are_kept_for_a_few_frames():
+    container = Container()
+    pool = SublayerPool(container, makeSublayer)
+    drawFrame(pool, ["a", "b"])
+    for i in range(pool.keepFrames):
+        drawFrame(pool, ["a"])
+        assert len(pool) == 2
+        assert not pool.layers["b"].visible
+    # b comes back in time, the same layer is shown
+    layer = pool.layers["b"]
+    drawFrame(pool, ["a", "b"])
+    assert pool.layers["b"] is layer and layer.visible
+    assert pool.removed == 0
+
+
+def test_pool_does_not_grow():
+    container = Container()
+    pool = SublayerPool(container, makeSublayer)
+    for frame in range(100):
+        drawFrame(pool, [frame, frame + 1])
+    assert len(pool) <= 2 + pool.keepFrames
+    assert len(container.sublayers) == len(pool)
+    assert pool.removed > 0
@@ -0,0 +1,39 @@
+import os
+
+from longboardRecorder import DragRecorder, findRecordingMismatches, makeOutputPath
+
+
+def makeRecording(designspacePath, glyphName):
+    recorder = DragRecorder(clock=lambda: 0)
+    recorder.start()
+    recorder.mouseDown(designspacePath, glyphName, dict(weight=100))
+    recorder.frame(1, 0)
+    recorder.mouseUp(dict(weight=101))
+    return recorder.stop()
+
+
+def test_matching_recording():
+    recording = makeRecording("/fonts/MyFamily.designspace", "a")
+    assert findRecordingMismatches(recording, "/fonts/MyFamily.designspace", "a") == []
+    # the designspace moved, with its recordings folder
+    assert findRecordingMismatches(recording, "/moved/MyFamily.designspace", "a") == []
+
+
+def test_other_glyph_or_designspace():
+    recording = makeRecording("/fonts/MyFamily.designspace", "a")
+    assert findRecordingMismatches(recording, "/fonts/MyFamily.designspace", "b")
+    assert findRecordingMismatches(recording, "/fonts/Other.designspace", "a")
+    assert findRecordingMismatches(recording, None, "a")
+
+
+def test_output_path_next_to_the_designspace(tmp_path):
+    designspacePath = str(tmp_path / "MyFamily.designspace")
+    path = makeOutputPath(designspacePath, "recordings", "Drag_a", ".longboardDrag")
+    folder, fileName = os.path.split(path)
+    assert folder == str(tmp_path / "recordings")
+    assert os.path.isdir(folder)
+    assert fileName.startswith("Drag_a_MyFamily_")
+    assert fileName.endswith(".longboardDrag")
+    # or in another folder
+    otherFolder = str(tmp_path / "elsewhere")
+    assert os.path.dirname(makeOutputPath(designspacePath, otherFolder, "Drag_a", ".longboardDrag")) == otherFolder
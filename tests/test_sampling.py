@@ -0,0 +1,18 @@
+from longboardSampling import sampleLocations, samplingMethods
+
+
+def test_grid_covers_every_discrete_location(makeOperator):
+    operator = makeOperator(axes=2, discrete=2)
+    locations = sampleLocations(operator, "grid", steps=3)
+    assert len(locations) == 2 * 3 ** 2
+    assert sorted({location["slant"] for location in locations}) == [0, 1]
+    for slant in (0, 1):
+        assert len([location for location in locations if location["slant"] == slant]) == 9
+
+
+def test_all_methods_cover_every_discrete_location(makeOperator):
+    operator = makeOperator(axes=2, discrete=2)
+    for method in samplingMethods:
+        locations = sampleLocations(operator, method, count=16, steps=3, seed=1)
+        perSlant = [len([location for location in locations if location["slant"] == slant]) for slant in (0, 1)]
+        assert perSlant[0] == perSlant[1] > 0, method
@@ -0,0 +1,28 @@
+from longboardScheduler import DragScheduler
+
+
+def test_held_back_drag_waits_for_the_next_frame():
+    now = [0]
+    scheduler = DragScheduler(frameInterval=0.02, clock=lambda: now[0])
+    assert scheduler.addDrag(1, 0)
+    scheduler.take()
+    scheduler.frameDone()
+    now[0] = 0.005
+    # too soon after the last frame: held back
+    assert not scheduler.addDrag(2, 0)
+    assert scheduler.hasPending()
+    assert abs(scheduler.getFrameDelay() - 0.015) < 1e-9
+    # the timer fires at the next frame
+    now[0] = 0.02
+    assert scheduler.isReady()
+    assert scheduler.take() == (2, 0)
+    assert not scheduler.hasPending()
+
+
+def test_frame_delay_while_in_flight():
+    scheduler = DragScheduler(frameInterval=0.02, clock=lambda: 0)
+    assert scheduler.getFrameDelay() == 0
+    scheduler.addDrag(1, 1)
+    scheduler.take()
+    assert scheduler.getFrameDelay() == 0.02
+    assert not scheduler.isReady()
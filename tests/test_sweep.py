@@ -0,0 +1,30 @@
+import csv
+import json
+import os
+
+import pytest
+
+from longboardSweep import main, statNames
+from syntheticDesignspace import makeDesignspace, glyphName, compositeName
+
+
+@pytest.mark.parametrize("format", ["csv", "jsonl"])
+def test_sweep_has_a_row_for_every_glyph_and_location(tmp_path, format):
+    designspacePath = makeDesignspace(str(tmp_path / "designspace"), axes=2, discrete=2)
+    assert main([designspacePath, "--method", "grid", "--steps", "3", "--format", format, "--workers", "1"]) == 0
+    folder = tmp_path / "designspace" / "sweeps"
+    [fileName] = os.listdir(folder)
+    assert fileName.startswith("Sweep_bench_") and fileName.endswith("." + format)
+    axisNames = ["axis0", "axis1", "slant"]
+    with open(folder / fileName, encoding="utf-8") as f:
+        if format == "csv":
+            reader = csv.reader(f)
+            assert next(reader) == ["glyph", "location"] + axisNames + statNames
+            rows = [dict(zip(["glyph", "location"] + axisNames + statNames, row)) for row in reader]
+        else:
+            rows = [json.loads(line) for line in f]
+            assert all(list(row) == ["glyph", "location"] + axisNames + statNames for row in rows)
+    # 2 glyphs, 3 x 3 locations for each of the 2 slants
+    assert len(rows) == 2 * 2 * 3 ** 2
+    assert sorted({row["glyph"] for row in rows}) == sorted([glyphName, compositeName])
+    assert all(row["width"] not in (None, "") for row in rows)
@@ -0,0 +1,52 @@
+import pytest
+
+import longboardWarmup
+from longboardKernel import KernelCache
+from longboardWarmup import KernelWarmup
+from syntheticDesignspace import glyphName
+
+
+def waitForWarmup(warmup):
+    # one worker, so this runs after the work that was submitted
+    warmup._getExecutor().submit(lambda: None).result()
+
+
+@pytest.fixture
+def noJobOperator(monkeypatch):
+    def makeJobOperator(*args, **kwargs):
+        raise AssertionError("the warm-up made a copy of the operator")
+    monkeypatch.setattr(longboardWarmup, "makeJobOperator", makeJobOperator)
+
+
+def test_no_copy_without_discrete_axes(makeOperator, noJobOperator):
+    operator = makeOperator()
+    warmup = KernelWarmup(KernelCache())
+    warmup.warm(operator, glyphName)
+    assert warmup._executor is None
+
+
+def test_no_copy_when_every_kernel_is_there(makeOperator, noJobOperator):
+    operator = makeOperator(discrete=2)
+    kernels = KernelCache()
+    for discreteLocation in operator.getDiscreteLocations():
+        kernels.getKernel(operator, glyphName, discreteLocation=discreteLocation)
+    warmup = KernelWarmup(kernels)
+    warmup.warm(operator, glyphName)
+    assert warmup._executor is None
+    assert warmup.getCounters()["cached"] == 2
+
+
+def test_warm_compiles_the_missing_kernels(makeOperator):
+    operator = makeOperator(discrete=2)
+    kernels = KernelCache()
+    first, second = operator.getDiscreteLocations()
+    kernels.getKernel(operator, glyphName, discreteLocation=first)
+    warmup = KernelWarmup(kernels)
+    warmup.pause = 0
+    warmup.warm(operator, glyphName)
+    waitForWarmup(warmup)
+    warmup.shutdown()
+    assert kernels.hasKernel(operator, glyphName, discreteLocation=second)
+    counters = warmup.getCounters()
+    assert counters["scheduled"] == 1
+    assert counters["compiled"] == 1